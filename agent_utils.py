@@ -4,6 +4,7 @@ This module is separate to avoid circular imports.
 """
 
 import os
+import threading
 from dotenv import load_dotenv
 from agents import (
     get_spacex_agent,
@@ -49,42 +50,136 @@ def load_agent(name: str):
     return getter()
 
 
-def get_gemini_response(user_message: str, system_prompt: str, temperature: float = 0.7, max_tokens: int = 2000) -> str:
-    """Get a response from Gemini API with improved error handling."""
+ALL_KEYS = "*"
+
+
+def get_agent_io(name: str):
+    """
+    Return (reads, writes) key sets declared by an agent module.
+    Agents without declarations are treated as reading and writing everything.
+    """
+    agent = load_agent(name)
+    reads = set(getattr(agent, "READS", (ALL_KEYS,)))
+    writes = set(getattr(agent, "WRITES", (ALL_KEYS,)))
+    return reads, writes
+
+
+def get_agent_early_inputs(name: str) -> dict:
+    """
+    Return the agent's EARLY_INPUTS: keys it reads mapped to the blackboard
+    topic whose partial value is enough to start on. Empty if undeclared.
+    """
+    return dict(getattr(load_agent(name), "EARLY_INPUTS", {}))
+
+
+def _keys_overlap(left: set, right: set) -> bool:
+    return ALL_KEYS in left or ALL_KEYS in right or bool(left & right)
+
+
+def build_agent_dependencies(sequence: list) -> list:
+    """
+    Build the dependency DAG for an ordered agent sequence.
+
+    Returns one set per position holding the earlier positions it must wait
+    for: agents whose writes it reads, and agents writing the same keys (so the
+    later write still wins, as in a sequential run).
+    """
+    io = [get_agent_io(name) for name in sequence]
+    dependencies = []
+    for index, (reads, writes) in enumerate(io):
+        deps = set()
+        for earlier in range(index):
+            earlier_writes = io[earlier][1]
+            if _keys_overlap(reads, earlier_writes) or _keys_overlap(writes, earlier_writes):
+                deps.add(earlier)
+        dependencies.append(deps)
+    return dependencies
+
+
+DEFAULT_MODEL = "gemini-2.5-flash"
+MAX_MESSAGE_LENGTH = 15000  # Approximate character limit for a single prompt
+
+# Process-wide Gemini clients, keyed by (model, temperature, max_tokens).
+_llm_pool = {}
+_llm_pool_lock = threading.Lock()
+
+
+def get_llm(model: str = DEFAULT_MODEL, temperature: float = 0.7, max_tokens: int = 2000):
+    """
+    Return the shared ChatGoogleGenerativeAI client for this configuration,
+    creating it on first use. Returns None when LangChain or the API key is missing.
+    """
+    if not LANGCHAIN_AVAILABLE:
+        return None
+
+    key = (model, temperature, max_tokens)
+    llm = _llm_pool.get(key)
+    if llm is not None:
+        return llm
+
+    with _llm_pool_lock:
+        llm = _llm_pool.get(key)
+        if llm is None:
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                return None
+            llm = ChatGoogleGenerativeAI(
+                model=model,
+                google_api_key=api_key,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            _llm_pool[key] = llm
+    return llm
+
+
+def _build_messages(user_message: str, system_prompt: str) -> list:
+    # Truncate message if too long (Gemini has token limits)
+    if len(user_message) > MAX_MESSAGE_LENGTH:
+        user_message = user_message[:MAX_MESSAGE_LENGTH] + "\n\n[Content truncated due to length...]"
+    return [SystemMessage(content=system_prompt), HumanMessage(content=user_message)]
+
+
+def _get_llm_for_request(temperature: float, max_tokens: int):
     if not LANGCHAIN_AVAILABLE:
         print("Warning: langchain_google_genai not available. Cannot use Gemini API.")
         return None
-    
+    llm = get_llm(temperature=temperature, max_tokens=max_tokens)
+    if llm is None:
+        print("Warning: GOOGLE_API_KEY not found in environment variables.")
+    return llm
+
+
+def _response_content(response):
+    if response and hasattr(response, 'content'):
+        return response.content
+    print("Warning: Gemini API returned empty or invalid response.")
+    return None
+
+
+def get_gemini_response(user_message: str, system_prompt: str, temperature: float = 0.7, max_tokens: int = 2000) -> str:
+    """Get a response from Gemini API with improved error handling."""
+    llm = _get_llm_for_request(temperature, max_tokens)
+    if llm is None:
+        return None
+
     try:
-        api_key = os.getenv("GOOGLE_API_KEY")
-        if not api_key:
-            print("Warning: GOOGLE_API_KEY not found in environment variables.")
-            return None
-
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=api_key,
-            temperature=temperature,
-            max_tokens=max_tokens
-        )
-
-        system_message = SystemMessage(content=system_prompt)
-        human_message = HumanMessage(content=user_message)
-        
-        # Truncate message if too long (Gemini has token limits)
-        max_message_length = 15000  # Approximate character limit
-        if len(user_message) > max_message_length:
-            user_message = user_message[:max_message_length] + "\n\n[Content truncated due to length...]"
-            human_message = HumanMessage(content=user_message)
-        
-        response = llm.invoke([system_message, human_message])
-        
-        if response and hasattr(response, 'content'):
-            return response.content
-        else:
-            print("Warning: Gemini API returned empty or invalid response.")
-            return None
+        response = llm.invoke(_build_messages(user_message, system_prompt))
+        return _response_content(response)
     except Exception as e:
         print(f"Warning: Gemini API error: {e}")
         return None
 
+
+async def aget_gemini_response(user_message: str, system_prompt: str, temperature: float = 0.7, max_tokens: int = 2000) -> str:
+    """Async variant of get_gemini_response using the pooled client's ainvoke."""
+    llm = _get_llm_for_request(temperature, max_tokens)
+    if llm is None:
+        return None
+
+    try:
+        response = await llm.ainvoke(_build_messages(user_message, system_prompt))
+        return _response_content(response)
+    except Exception as e:
+        print(f"Warning: Gemini API error: {e}")
+        return None
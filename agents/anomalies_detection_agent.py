@@ -11,6 +11,32 @@ import os
 from datetime import datetime, timezone
 from typing import Dict, List, Any
 
+try:
+    import numpy as np
+    from .satellite_batch import SatelliteBatch
+    BATCH_CHECKS_AVAILABLE = True
+except ImportError:
+    BATCH_CHECKS_AVAILABLE = False
+
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("spacex", "weather", "satellite")
+WRITES = ("anomalies",)
+
+# A satellite's altitude is expected between its perigee and apogee; the margin
+# covers earth oblateness (geodetic vs. mean-element altitude) and short-period terms
+ALTITUDE_TOLERANCE_KM = 50.0
+# Perigee below this: drag brings the object down within weeks
+LOW_PERIGEE_KM = 200.0
+# Bands used when only the current altitude is known
+NOMINAL_ALTITUDE_BANDS_KM = {25544: (350.0, 450.0)}
+DEFAULT_ALTITUDE_BAND_KM = (160.0, 42000.0)
+STALE_ELEMENTS_DAYS = 7
+# Batch anomalies name at most this many satellites each
+MAX_LISTED_SATELLITES = 10
+# Close approaches (km) reported as critical / warning; others found by screening are info
+CONJUNCTION_CRITICAL_KM = 1.0
+CONJUNCTION_WARNING_KM = 5.0
+
 def run(previous_data: dict) -> dict:
     """
     Analyzes data from previous agents to detect anomalies:
@@ -156,24 +182,55 @@ def _detect_satellite_anomalies(previous_data: dict) -> List[Dict[str, Any]]:
     
     if not satellite_data:
         return anomalies
-    
-    # Check satellite altitude
+
+    anomalies.extend(_detect_conjunctions(satellite_data))
+
+    if satellite_data.get("mode") == "batch":
+        if BATCH_CHECKS_AVAILABLE:
+            anomalies.extend(_detect_batch_anomalies(satellite_data))
+        return anomalies
+
+    # Check satellite altitude against the band its own orbit allows
     orbital_params = satellite_data.get("orbital_parameters", {})
     altitude = orbital_params.get("altitude_km")
-    
+    perigee = orbital_params.get("perigee_km")
+    low, high = _expected_altitude_band(satellite_data.get("norad_id"), perigee, orbital_params.get("apogee_km"))
+
     if isinstance(altitude, (int, float)):
-        # Normal ISS altitude range: 400-420 km
-        if altitude < 350 or altitude > 450:
+        if altitude < low or altitude > high:
             anomalies.append({
                 "type": "satellite",
                 "category": "orbital_altitude",
                 "severity": "warning",
                 "message": f"Unusual satellite altitude: {altitude} km. Outside normal range.",
                 "value": altitude,
-                "threshold": "350-450 km",
+                "threshold": f"{low:.0f}-{high:.0f} km",
                 "recommendation": "Verify satellite tracking data accuracy."
             })
-    
+
+    if isinstance(perigee, (int, float)) and perigee < LOW_PERIGEE_KM:
+        anomalies.append({
+            "type": "satellite",
+            "category": "low_perigee",
+            "severity": "warning",
+            "message": f"Low perigee: {perigee} km. The orbit is decaying.",
+            "value": perigee,
+            "threshold": f"{LOW_PERIGEE_KM:.0f} km",
+            "recommendation": "Expect re-entry soon; refresh element sets frequently."
+        })
+
+    tle_age = satellite_data.get("tle_age_days")
+    if isinstance(tle_age, (int, float)) and tle_age > STALE_ELEMENTS_DAYS:
+        anomalies.append({
+            "type": "satellite",
+            "category": "stale_elements",
+            "severity": "info",
+            "message": f"Element set is {tle_age:.1f} days old; predicted positions may be off.",
+            "value": tle_age,
+            "threshold": f"{STALE_ELEMENTS_DAYS} days",
+            "recommendation": "Refresh the satellite's element set."
+        })
+
     # Check for missing position data
     current_position = satellite_data.get("current_position")
     if not current_position:
@@ -188,6 +245,108 @@ def _detect_satellite_anomalies(previous_data: dict) -> List[Dict[str, Any]]:
     return anomalies
 
 
+def _expected_altitude_band(norad_id, perigee, apogee) -> tuple:
+    """(low, high) altitude in km: perigee to apogee with a margin, else a per-satellite or generic band."""
+    if isinstance(perigee, (int, float)) and isinstance(apogee, (int, float)):
+        return perigee - ALTITUDE_TOLERANCE_KM, apogee + ALTITUDE_TOLERANCE_KM
+    return NOMINAL_ALTITUDE_BANDS_KM.get(norad_id, DEFAULT_ALTITUDE_BAND_KM)
+
+
+def _detect_batch_anomalies(satellite_data: dict) -> List[Dict[str, Any]]:
+    """Column-wise checks over a batch of satellites; one anomaly per category, listing a few ids."""
+    anomalies = []
+    batch = SatelliteBatch.from_dict(satellite_data.get("satellites", {}))
+    valid = batch.valid
+    altitude = batch["altitude_km"]
+    perigee = batch["perigee_km"]
+    apogee = batch["apogee_km"]
+
+    with np.errstate(invalid="ignore"):
+        checks = (
+            (batch.decayed, "decayed", "warning",
+             "satellites have decayed according to their element sets and have no position",
+             "Drop these element sets if the objects have re-entered, or refresh them."),
+            (~valid & ~batch.decayed, "propagation_error", "warning",
+             "satellites could not be propagated (invalid element sets)",
+             "Refresh or drop these element sets."),
+            (valid & ((altitude < perigee - ALTITUDE_TOLERANCE_KM) | (altitude > apogee + ALTITUDE_TOLERANCE_KM)),
+             "orbital_altitude", "warning", "satellites are outside the altitude band of their orbit",
+             "Verify satellite tracking data accuracy."),
+            (valid & (perigee < LOW_PERIGEE_KM), "low_perigee", "warning",
+             f"satellites have a perigee below {LOW_PERIGEE_KM:.0f} km (decaying orbits)",
+             "Expect re-entries soon; refresh element sets frequently."),
+            (batch["tle_age_days"] > STALE_ELEMENTS_DAYS, "stale_elements", "info",
+             f"satellites have element sets older than {STALE_ELEMENTS_DAYS} days",
+             "Refresh the satellite catalog."),
+        )
+    for mask, category, severity, message, recommendation in checks:
+        count = int(np.count_nonzero(mask))
+        if not count:
+            continue
+        anomalies.append({
+            "type": "satellite",
+            "category": category,
+            "severity": severity,
+            "message": f"{count} of {len(batch)} {message}.",
+            "count": count,
+            "norad_ids": batch["norad_id"][mask][:MAX_LISTED_SATELLITES].tolist(),
+            "recommendation": recommendation
+        })
+
+    missing = satellite_data.get("missing_ids") or []
+    if missing:
+        anomalies.append({
+            "type": "satellite",
+            "category": "missing_elements",
+            "severity": "info",
+            "message": f"No element sets found for {len(missing)} requested satellites.",
+            "count": len(missing),
+            "norad_ids": missing[:MAX_LISTED_SATELLITES],
+            "recommendation": "Check the NORAD ids or refresh the satellite catalog."
+        })
+    return anomalies
+
+
+def _detect_conjunctions(satellite_data: dict) -> List[Dict[str, Any]]:
+    """Close approaches found by the satellite agent's conjunction screening, closest first."""
+    anomalies = []
+    screening = satellite_data.get("conjunctions") or {}
+    events = screening.get("events") or []
+    for event in events[:MAX_LISTED_SATELLITES]:
+        miss = event.get("miss_distance_km")
+        if not isinstance(miss, (int, float)):
+            continue
+        severity = "critical" if miss < CONJUNCTION_CRITICAL_KM else \
+                   "warning" if miss < CONJUNCTION_WARNING_KM else "info"
+        anomalies.append({
+            "type": "satellite",
+            "category": "conjunction",
+            "severity": severity,
+            "message": f"Close approach: {event.get('name') or event.get('norad_id')} and "
+                       f"{event.get('other_name') or event.get('other_norad_id')} pass {miss} km apart "
+                       f"at {event.get('tca')} ({event.get('relative_speed_km_s')} km/s).",
+            "value": miss,
+            "threshold": f"{CONJUNCTION_CRITICAL_KM:g}/{CONJUNCTION_WARNING_KM:g} km",
+            "norad_ids": [event.get("norad_id"), event.get("other_norad_id")],
+            "tca": event.get("tca"),
+            "recommendation": "Assess collision probability with covariance data and plan avoidance if needed."
+                              if severity != "info" else "Monitor the encounter as element sets update."
+        })
+
+    remaining = screening.get("count", len(events)) - len(anomalies)
+    if remaining > 0:
+        anomalies.append({
+            "type": "satellite",
+            "category": "conjunction",
+            "severity": "info",
+            "message": f"{remaining} more close approaches within {screening.get('distance_km')} km "
+                       f"in the next {screening.get('window_hours')} hours.",
+            "count": remaining,
+            "recommendation": "Review the full conjunction screening results."
+        })
+    return anomalies
+
+
 def _detect_data_consistency_issues(previous_data: dict) -> List[Dict[str, Any]]:
     """Detect data consistency issues across agents"""
     anomalies = []
@@ -0,0 +1,114 @@
+"""
+Blackboard
+Thread-safe publish/subscribe board for partial results shared between agents.
+
+Each real-time request gets its own board. Agents publish partial results
+under a topic as soon as they have them (the SpaceX agent publishes the
+launch site before fetching the rest of its snapshot). The coordinator
+subscribes to those topics so dependents that only need the partial result
+can start while the producer is still running.
+
+Like cancellation tokens, the current board is kept in a context variable;
+agents call the module-level `publish()`, which does nothing outside a
+coordinated run.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Topic published by spacex_agent once the primary launch and its launchpad resolve.
+LAUNCH_TOPIC = "spacex.launch"
+
+# Fields every value published on a known topic must carry.
+TOPIC_SCHEMAS = {
+    LAUNCH_TOPIC: ("mission", "date", "launchpad_id", "coordinates"),
+}
+
+# Subscribe to this to be notified of every topic.
+ALL_TOPICS = "*"
+
+Subscriber = Callable[[str, Any], None]
+
+
+class Blackboard:
+    """Latest value per topic, with blocking reads, subscriptions and a publish log."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._values: Dict[str, Any] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._subscribers: Dict[str, List[Subscriber]] = {}
+        self._created_at = time.perf_counter()
+
+    def publish(self, topic: str, value: Any, publisher: Optional[str] = None):
+        fields = TOPIC_SCHEMAS.get(topic)
+        if fields is not None and (not isinstance(value, dict) or any(field not in value for field in fields)):
+            raise ValueError(f"Value published on '{topic}' must be a dict with {', '.join(fields)}")
+
+        with self._cond:
+            self._values[topic] = value
+            self._events.append({
+                "topic": topic,
+                "publisher": publisher,
+                "elapsed_ms": round((time.perf_counter() - self._created_at) * 1000, 1),
+            })
+            callbacks = self._subscribers.get(topic, []) + self._subscribers.get(ALL_TOPICS, [])
+            self._cond.notify_all()
+
+        for callback in callbacks:
+            try:
+                callback(topic, value)
+            except Exception as exc:
+                print(f"⚠️ Blackboard: subscriber for '{topic}' failed: {exc}")
+
+    def subscribe(self, topic: str, callback: Subscriber):
+        """Call `callback(topic, value)` on every later publish to `topic` (or ALL_TOPICS)."""
+        with self._cond:
+            self._subscribers.setdefault(topic, []).append(callback)
+
+    def has(self, topic: str) -> bool:
+        with self._cond:
+            return topic in self._values
+
+    def get(self, topic: str, default: Any = None) -> Any:
+        with self._cond:
+            return self._values.get(topic, default)
+
+    def wait_for(self, topic: str, timeout: Optional[float] = None, default: Any = None) -> Any:
+        """Block until `topic` is published (or `timeout` passes) and return its value."""
+        with self._cond:
+            self._cond.wait_for(lambda: topic in self._values, timeout)
+            return self._values.get(topic, default)
+
+    def events(self) -> List[Dict[str, Any]]:
+        with self._cond:
+            return list(self._events)
+
+
+_current_board: contextvars.ContextVar = contextvars.ContextVar("blackboard", default=None)
+
+
+def current_blackboard() -> Optional[Blackboard]:
+    return _current_board.get()
+
+
+@contextmanager
+def use_blackboard(board: Optional[Blackboard]):
+    """Make `board` the current blackboard for the duration of the block."""
+    reset = _current_board.set(board)
+    try:
+        yield board
+    finally:
+        _current_board.reset(reset)
+
+
+def publish(topic: str, value: Any, publisher: Optional[str] = None) -> bool:
+    """Publish on the current board, if any. Returns True if it was published."""
+    board = current_blackboard()
+    if board is None:
+        return False
+    board.publish(topic, value, publisher)
+    return True
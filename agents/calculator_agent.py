@@ -4,6 +4,12 @@ import re
 import math
 import operator
 
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("goal",)
+WRITES = ("calculation",)
+# Cheap and side-effect free: may be started speculatively while the plan is being made.
+SPECULATIVE = True
+
 def run(previous_data: dict) -> dict:
     """
     Calculator agent that performs mathematical calculations.
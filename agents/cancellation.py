@@ -0,0 +1,117 @@
+"""
+Cancellation Tokens
+Cooperative cancellation and deadlines for agent work.
+
+A coordinator creates a `CancellationToken` per task (optionally with a
+deadline) and makes it current with `use_token()` around the agent call.
+Code running under it can call `check()` at convenient points, and
+`http_client` caps request timeouts to the time left and refuses to start
+new requests once the token is cancelled, so in-flight calls end by the
+deadline.
+
+The current token lives in a context variable. Threads started with a plain
+pool `submit` do not see it; wrap the job with `contextvars.copy_context().run`
+to carry it over.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple, Union
+
+Timeout = Union[float, Tuple[float, float]]
+
+# Smallest timeout handed to a socket call, so a nearly expired deadline
+# still fails fast instead of passing 0 (which would make the socket non-blocking).
+MIN_TIMEOUT_SECONDS = 0.05
+
+
+class OperationCancelled(Exception):
+    """Raised when work is attempted under a cancelled or expired token."""
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with an optional monotonic deadline."""
+
+    def __init__(self, timeout_seconds: Optional[float] = None, parent: "CancellationToken" = None):
+        self._event = threading.Event()
+        self._reason = None
+        self._parent = parent
+        deadline = time.monotonic() + timeout_seconds if timeout_seconds is not None else None
+        if parent is not None and parent.deadline is not None:
+            deadline = parent.deadline if deadline is None else min(deadline, parent.deadline)
+        self.deadline = deadline
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self._reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.cancel("deadline exceeded")
+            return True
+        if self._parent is not None and self._parent.cancelled:
+            self.cancel(self._parent.reason)
+            return True
+        return False
+
+    @property
+    def reason(self) -> Optional[str]:
+        return self._reason
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, or None if there is no deadline."""
+        if self.deadline is None:
+            return None
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise OperationCancelled(self._reason)
+
+    def wait(self, seconds: float) -> bool:
+        """Sleep up to `seconds`, waking early on cancellation. Returns True if cancelled."""
+        remaining = self.remaining()
+        if remaining is not None:
+            seconds = min(seconds, remaining)
+        self._event.wait(max(seconds, 0))
+        return self.cancelled
+
+    def cap_timeout(self, timeout: Timeout) -> Timeout:
+        """Shrink a requests-style timeout so it cannot outlive the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, MIN_TIMEOUT_SECONDS)
+        if isinstance(timeout, tuple):
+            return tuple(remaining if part is None else min(part, remaining) for part in timeout)
+        return remaining if timeout is None else min(timeout, remaining)
+
+
+_current_token: contextvars.ContextVar = contextvars.ContextVar("cancellation_token", default=None)
+
+
+def current_token() -> Optional[CancellationToken]:
+    return _current_token.get()
+
+
+@contextmanager
+def use_token(token: Optional[CancellationToken]):
+    """Make `token` the current token for the duration of the block."""
+    reset = _current_token.set(token)
+    try:
+        yield token
+    finally:
+        _current_token.reset(reset)
+
+
+def check():
+    """Raise OperationCancelled if the current token has been cancelled."""
+    token = current_token()
+    if token is not None:
+        token.raise_if_cancelled()
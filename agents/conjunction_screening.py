@@ -0,0 +1,272 @@
+"""
+Conjunction Screening
+Close approaches between catalogued objects over a time window.
+
+Screening runs in three stages, each pruning what the next one looks at:
+1. Orbit filter (sort and sweep): objects whose perigee-apogee shells,
+   widened by the screening distance, overlap no other shell can never come
+   close and are dropped; candidate pairs must overlap radially.
+2. Spatial hash: positions come from one SGP4 call per object every
+   COARSE_STEP_SECONDS, and are Hermite-interpolated (from positions and
+   velocities at both ends) to every SUB_STEP_SECONDS sub-step. At each
+   sub-step objects are binned into cubic cells large enough that any pair
+   able to close within the screening distance during the sub-step shares a
+   cell or neighbours one; only those pairs are compared, and only pairs whose
+   straight-line relative motion comes within the screening distance are kept.
+   Work per step is proportional to objects plus nearby pairs, not to all
+   pairs.
+3. Refinement: each candidate encounter is refined with SGP4 by Newton
+   iteration on the range rate, giving the time of closest approach (TCA)
+   and miss distance.
+
+Screening one or a few objects against the catalog (`primaries`) keeps only
+pairs involving them.
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .orbit_propagator import Propagator, to_unix_seconds
+
+SCREENING_DISTANCE_KM = 10.0
+DEFAULT_WINDOW_HOURS = 24.0
+COARSE_STEP_SECONDS = 120.0
+SUB_STEP_SECONDS = 10.0
+# Coarse steps propagated per chunk (bounds memory for large catalogs)
+CHUNK_STEPS = 30
+TCA_ITERATIONS = 5
+# With this few primaries, compare them with every object instead of hashing
+DIRECT_PRIMARIES = 16
+
+# Slack for positions that leave straight-line motion within a sub-step and
+# for Hermite interpolation error (both well under 1 km in LEO at these steps)
+INTERPOLATION_MARGIN_KM = 1.0
+
+_CELL_BITS = 21
+_CELL_OFFSET = 1 << (_CELL_BITS - 1)
+# Neighbouring (x, y) cell columns visited from each cell, so each pair of cells is visited once
+_FORWARD_COLUMNS = ((0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def radial_shells(propagator: Propagator, distance_km: float = SCREENING_DISTANCE_KM) -> Tuple[np.ndarray, np.ndarray]:
+    """Perigee and apogee radii (km) of every object, widened by `distance_km` / 2 each way."""
+    semi_major = propagator.semi_major_axis_km
+    # Short-period terms move the osculating radius by ~10 km around the mean orbit
+    pad = distance_km / 2.0 + 15.0
+    return semi_major * (1.0 - propagator.ecco) - pad, semi_major * (1.0 + propagator.ecco) + pad
+
+
+def _overlapping(low: np.ndarray, high: np.ndarray, primaries: Optional[np.ndarray]) -> np.ndarray:
+    """Mask of objects whose [low, high] shell overlaps another object's (or a primary's)."""
+    count = len(low)
+    if primaries is not None:
+        keep = np.zeros(count, dtype=bool)
+        for index in primaries:
+            keep |= (low <= high[index]) & (high >= low[index])
+        return keep
+    # Sort and sweep: sorted by low, an interval overlaps an earlier one when the
+    # running maximum of earlier highs reaches it, and a later one when the next
+    # low does
+    order = np.argsort(low, kind="stable")
+    sorted_low, sorted_high = low[order], high[order]
+    earlier_high = np.maximum.accumulate(np.concatenate([[-np.inf], sorted_high[:-1]]))
+    next_low = np.concatenate([sorted_low[1:], [np.inf]])
+    keep = np.empty(count, dtype=bool)
+    keep[order] = (earlier_high >= sorted_low) | (next_low <= sorted_high)
+    return keep
+
+
+def _hermite(r0, v0, r1, v1, h: float, s: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Position and velocity at fraction `s` of a step of `h` seconds between two states."""
+    s2, s3 = s * s, s * s * s
+    position = ((2 * s3 - 3 * s2 + 1) * r0 + (s3 - 2 * s2 + s) * h * v0
+                + (-2 * s3 + 3 * s2) * r1 + (s3 - s2) * h * v1)
+    velocity = ((6 * s2 - 6 * s) * r0 / h + (3 * s2 - 4 * s + 1) * v0
+                + (-6 * s2 + 6 * s) * r1 / h + (3 * s2 - 2 * s) * v1)
+    return position, velocity
+
+
+def _expand(starts: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """(owner, value) for every value in each range starts[k] .. starts[k] + counts[k] - 1."""
+    total = int(counts.sum())
+    owner = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owner, starts[owner] + offsets
+
+
+def _neighbour_pairs(positions: np.ndarray, cell_km: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Index pairs of points in the same or adjacent cells, each unordered pair once."""
+    cells = np.floor(positions / cell_km).astype(np.int64) + _CELL_OFFSET
+    keys = (cells[:, 0] << (2 * _CELL_BITS)) | (cells[:, 1] << _CELL_BITS) | cells[:, 2]
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    # Occupied cells, and the cell of each sorted point
+    boundary = np.flatnonzero(np.diff(sorted_keys)) + 1
+    cell_start = np.concatenate([[0], boundary])
+    cell_keys = sorted_keys[cell_start]
+    point_cell = np.repeat(np.arange(len(cell_keys)), np.diff(np.concatenate([cell_start, [len(keys)]])))
+
+    # Keys sort by (x, y, z) cell, so the three cells z-1 .. z+1 of a column are
+    # one contiguous range of sorted points: the 13 forward neighbours of a cell
+    # are the rest of its own column from z+1 (same-cell points after this one
+    # included) plus four full neighbouring columns.
+    starts = [np.arange(len(keys)) + 1]
+    ends = [np.searchsorted(sorted_keys, cell_keys + 1, side="right")[point_cell]]
+    for dx, dy in _FORWARD_COLUMNS:
+        column = cell_keys + ((dx << (2 * _CELL_BITS)) + (dy << _CELL_BITS))
+        starts.append(np.searchsorted(sorted_keys, column - 1, side="left")[point_cell])
+        ends.append(np.searchsorted(sorted_keys, column + 1, side="right")[point_cell])
+    start = np.concatenate(starts)
+    counts = np.maximum(np.concatenate(ends) - start, 0)
+    owner, other = _expand(start, counts)
+    return order[owner % len(keys)], order[other]
+
+
+def _primary_pairs(primaries: np.ndarray, count: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Every (primary, object) pair, each unordered pair once."""
+    first = np.repeat(primaries, count)
+    second = np.tile(np.arange(count), len(primaries))
+    # Pairs of two primaries come up twice; keep the ordered one
+    keep = (first != second) & ~(np.isin(second, primaries) & (second < first))
+    return first[keep], second[keep]
+
+
+def _refine(propagator: Propagator, first: np.ndarray, second: np.ndarray, guess: np.ndarray,
+            half_width: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(tca, miss distance, relative speed) per pair: Newton on the range rate from `guess`."""
+    objects = propagator.take(np.concatenate([first, second]))
+    count = len(first)
+    low, high = guess - half_width, guess + half_width
+    t = guess.copy()
+    for _ in range(TCA_ITERATIONS):
+        r, v, _ = objects.propagate_minutes(((np.concatenate([t, t]) - objects.epoch_unix) / 60.0)[:, None])
+        dr = r[count:, 0] - r[:count, 0]
+        dv = v[count:, 0] - v[:count, 0]
+        with np.errstate(all="ignore"):
+            t = np.clip(t - np.sum(dr * dv, axis=1) / np.sum(dv * dv, axis=1), low, high)
+    r, v, errors = objects.propagate_minutes(((np.concatenate([t, t]) - objects.epoch_unix) / 60.0)[:, None])
+    r[errors != 0] = np.nan  # no miss distance for a pair with a decayed or failed object
+    dr = r[count:, 0] - r[:count, 0]
+    dv = v[count:, 0] - v[:count, 0]
+    return t, np.linalg.norm(dr, axis=1), np.linalg.norm(dv, axis=1)
+
+
+def screen_conjunctions(propagator: Propagator, start=None, hours: float = DEFAULT_WINDOW_HOURS,
+                        distance_km: float = SCREENING_DISTANCE_KM, primaries=None,
+                        step_seconds: float = COARSE_STEP_SECONDS,
+                        sub_step_seconds: float = SUB_STEP_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Close approaches closer than `distance_km` during `hours` from `start`
+    (default now), closest first. `primaries` (indices into `propagator`)
+    limits screening to pairs involving those objects.
+    """
+    start_unix = float(np.atleast_1d(to_unix_seconds(start if start is not None else datetime.now(timezone.utc)))[0])
+    primary_index = None if primaries is None else np.unique(np.asarray(primaries, dtype=np.int64))
+
+    low, high = radial_shells(propagator, distance_km)
+    active = np.flatnonzero(_overlapping(low, high, primary_index))
+    if primary_index is not None:
+        active = np.union1d(active, primary_index)
+    if len(active) < 2:
+        return []
+    objects = propagator.take(active)
+    low, high = low[active], high[active]
+    is_primary = None if primary_index is None else np.isin(active, primary_index)
+
+    sub_steps = max(1, int(round(step_seconds / sub_step_seconds)))
+    sub_step = step_seconds / sub_steps
+    steps = max(1, math.ceil(hours * 3600.0 / step_seconds))
+
+    hits_first, hits_second, hits_time, hits_distance = [], [], [], []
+    for chunk_start in range(0, steps, CHUNK_STEPS):
+        chunk = min(CHUNK_STEPS, steps - chunk_start)
+        times = start_unix + (chunk_start + np.arange(chunk + 1)) * step_seconds
+        r, v, errors = objects.propagate(times)
+        for k in range(chunk):
+            r0, v0, r1, v1 = r[:, k], v[:, k], r[:, k + 1], v[:, k + 1]
+            # Decayed objects (error 6) still get a position, below the surface; skip them too
+            valid = np.flatnonzero((errors[:, k] == 0) & (errors[:, k + 1] == 0))
+            if len(valid) < 2:
+                continue
+            r0, v0, r1, v1 = r0[valid], v0[valid], r1[valid], v1[valid]
+            max_speed = float(np.max(np.linalg.norm(v0, axis=1)))
+            reach = distance_km + INTERPOLATION_MARGIN_KM + max_speed * sub_step
+            direct = None
+            if is_primary is not None and np.count_nonzero(is_primary[valid]) <= DIRECT_PRIMARIES:
+                # Only objects that can reach a primary within this step are interpolated
+                first, second = _primary_pairs(np.flatnonzero(is_primary[valid]), len(valid))
+                near = np.linalg.norm(r0[second] - r0[first], axis=1) < \
+                    distance_km + INTERPOLATION_MARGIN_KM + 2.0 * max_speed * step_seconds
+                if not near.any():
+                    continue
+                involved = np.unique(np.concatenate([first[near], second[near]]))
+                direct = (np.searchsorted(involved, first[near]), np.searchsorted(involved, second[near]))
+                valid = valid[involved]
+                r0, v0, r1, v1 = r0[involved], v0[involved], r1[involved], v1[involved]
+            for s in range(sub_steps):
+                position, velocity = _hermite(r0, v0, r1, v1, step_seconds, s / sub_steps)
+                first, second = direct if direct is not None else _neighbour_pairs(position, reach)
+                if not len(first):
+                    continue
+                a, b = valid[first], valid[second]
+                keep = (low[a] <= high[b]) & (high[a] >= low[b])
+                if is_primary is not None:
+                    keep &= is_primary[a] | is_primary[b]
+                first, second, a, b = first[keep], second[keep], a[keep], b[keep]
+                # Straight-line relative motion over the sub-step (centred on it)
+                dr = position[second] - position[first]
+                dv = velocity[second] - velocity[first]
+                with np.errstate(all="ignore"):
+                    dt = np.clip(-np.sum(dr * dv, axis=1) / np.sum(dv * dv, axis=1), -sub_step / 2, sub_step / 2)
+                closest = np.linalg.norm(dr + dv * dt[:, None], axis=1)
+                close = closest < distance_km + INTERPOLATION_MARGIN_KM
+                if not close.any():
+                    continue
+                hits_first.append(a[close])
+                hits_second.append(b[close])
+                hits_time.append(times[k] + s * sub_step + dt[close])
+                hits_distance.append(closest[close])
+
+    if not hits_first:
+        return []
+    first = np.concatenate(hits_first)
+    second = np.concatenate(hits_second)
+    swap = first > second
+    first, second = np.where(swap, second, first), np.where(swap, first, second)
+    hit_time = np.concatenate(hits_time)
+    hit_distance = np.concatenate(hits_distance)
+
+    # One encounter per pair per pass: hits of a pair close together in time
+    order = np.lexsort((hit_time, second, first))
+    first, second, hit_time, hit_distance = first[order], second[order], hit_time[order], hit_distance[order]
+    new_event = np.ones(len(first), dtype=bool)
+    new_event[1:] = (first[1:] != first[:-1]) | (second[1:] != second[:-1]) | \
+        (hit_time[1:] - hit_time[:-1] > 2 * sub_step)
+    event = np.cumsum(new_event) - 1
+    # Closest hit of each encounter
+    by_distance = np.lexsort((hit_distance, event))
+    first_of_event = np.ones(len(by_distance), dtype=bool)
+    first_of_event[1:] = event[by_distance][1:] != event[by_distance][:-1]
+    best = by_distance[first_of_event]
+
+    tca, miss, speed = _refine(objects, first[best], second[best], hit_time[best], sub_step)
+    inside = (miss < distance_km) & (tca >= start_unix) & (tca <= start_unix + hours * 3600.0)
+    events = []
+    for k in np.flatnonzero(inside)[np.argsort(miss[inside])]:
+        i, j = int(first[best[k]]), int(second[best[k]])
+        if is_primary is not None and not is_primary[i]:
+            i, j = j, i
+        events.append({
+            "norad_id": int(objects.norad_ids[i]),
+            "name": objects.names[i],
+            "other_norad_id": int(objects.norad_ids[j]),
+            "other_name": objects.names[j],
+            "tca": datetime.fromtimestamp(float(tca[k]), timezone.utc).isoformat(timespec="seconds"),
+            "miss_distance_km": round(float(miss[k]), 3),
+            "relative_speed_km_s": round(float(speed[k]), 3),
+        })
+    return events
@@ -1,8 +1,15 @@
 # agents/dictionary_agent.py
 
-import requests
 import re
 
+from . import http_client
+
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("goal",)
+WRITES = ("definition",)
+# Cheap and side-effect free: may be started speculatively while the plan is being made.
+SPECULATIVE = True
+
 def run(previous_data: dict) -> dict:
     """
     Dictionary agent that provides word definitions, synonyms, and language information.
@@ -216,7 +223,7 @@ def fetch_definition(word: str) -> list:
     try:
         # Use Free Dictionary API
         url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         
         if response.status_code == 200:
             data = response.json()
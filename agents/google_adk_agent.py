@@ -6,8 +6,8 @@
 import os
 import json
 from typing import Dict, List, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
+from agent_utils import get_llm
 
 class GoogleADKCoordinator:
     """
@@ -19,13 +19,10 @@ class GoogleADKCoordinator:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
         
-        # Initialize LangChain ChatGoogleGenerativeAI model
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=api_key,
-            temperature=0.3,
-            max_tokens=1000
-        )
+        # Shared LangChain ChatGoogleGenerativeAI client from the process-wide pool
+        self.llm = get_llm(temperature=0.3, max_tokens=1000)
+        if self.llm is None:
+            raise ValueError("langchain_google_genai is required for the ADK coordinator")
     
     def plan_agent_sequence(self, user_goal: str) -> List[str]:
         """
@@ -0,0 +1,196 @@
+"""
+HTTP Response Cache
+Persistent TTL cache for JSON API responses with HTTP revalidation.
+
+Entries are keyed by a caller-chosen key (e.g. endpoint + resource id), kept in
+memory and mirrored to one JSON file per key on disk, so they survive restarts
+and are shared by the web app, the scheduler and the CLI.
+
+Lookup policy for an entry of age `a` with policy (ttl, stale):
+- a < ttl: served from cache.
+- ttl <= a < ttl + stale: served from cache while a background request
+  revalidates it (stale-while-revalidate).
+- otherwise: fetched synchronously with If-None-Match / If-Modified-Since;
+  a 304 refreshes the entry without transferring the body again.
+If the upstream request fails and any cached copy exists, that copy is served.
+Concurrent synchronous refreshes of one key share a single upstream request.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .singleflight import SingleFlight
+
+# (ttl_seconds, stale_while_revalidate_seconds)
+CachePolicy = Tuple[int, int]
+
+DEFAULT_POLICY: CachePolicy = (300, 600)
+
+
+class ResponseCache:
+    """Thread-safe, disk-backed response cache with hit/miss counters."""
+
+    def __init__(self, cache_dir: str, persist: bool = True):
+        self._cache_dir = cache_dir
+        self._persist = persist
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self._refreshes = SingleFlight("response_cache")
+        self._counters = {
+            "hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "refreshed": 0,
+            "stale_on_error": 0,
+            "upstream_requests": 0,
+            "coalesced": 0,
+        }
+
+    def get_json(
+        self,
+        key: str,
+        fetch: Callable[[Dict[str, str]], Any],
+        policy: CachePolicy = DEFAULT_POLICY,
+        conditional: bool = True,
+    ) -> Any:
+        """
+        Return the JSON body for `key`.
+
+        `fetch(headers)` performs the upstream request with the given extra
+        headers and returns a requests-style response. HTTP errors raised by
+        `raise_for_status()` propagate when no cached copy is available.
+        """
+        ttl, stale = policy
+        entry = self._get_entry(key)
+        now = time.time()
+
+        if entry is not None:
+            age = now - entry["stored_at"]
+            if age < ttl:
+                self._count("hits")
+                return json.loads(entry["body"])
+            if age < ttl + stale:
+                self._count("stale_hits")
+                self._revalidate_in_background(key, fetch, conditional)
+                return json.loads(entry["body"])
+        else:
+            self._count("misses")
+
+        try:
+            entry, shared = self._refreshes.do(key, lambda: self._refresh(key, fetch, conditional))
+            if shared:
+                self._count("coalesced")
+        except Exception:
+            cached = self._get_entry(key)
+            if cached is None:
+                raise
+            self._count("stale_on_error")
+            return json.loads(cached["body"])
+        return json.loads(entry["body"])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        served = counters["hits"] + counters["stale_hits"] + counters["stale_on_error"]
+        lookups = served + counters["misses"] + counters["revalidated"] + counters["refreshed"]
+        counters["hit_rate"] = round(served / lookups, 3) if lookups else 0.0
+        return counters
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._persist and os.path.isdir(self._cache_dir):
+            for filename in os.listdir(self._cache_dir):
+                if filename.endswith(".json"):
+                    os.remove(os.path.join(self._cache_dir, filename))
+
+    def _refresh(self, key: str, fetch: Callable[[Dict[str, str]], Any], conditional: bool) -> Dict[str, Any]:
+        cached = self._get_entry(key)
+        headers = {}
+        if conditional and cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        self._count("upstream_requests")
+        response = fetch(headers)
+        if response.status_code == 304 and cached is not None:
+            self._count("revalidated")
+            entry = dict(cached, stored_at=time.time())
+        else:
+            response.raise_for_status()
+            if cached is not None:
+                self._count("refreshed")
+            entry = {
+                "key": key,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "stored_at": time.time(),
+                "body": response.text,
+            }
+        self._store(key, entry)
+        return entry
+
+    def _revalidate_in_background(self, key: str, fetch: Callable[[Dict[str, str]], Any], conditional: bool):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def _worker():
+            try:
+                self._refresh(key, fetch, conditional)
+            except Exception as exc:
+                print(f"⚠️ Response Cache: background revalidation failed for {key}: {exc}")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        threading.Thread(target=_worker, daemon=True).start()
+
+    def _get_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is not None or not self._persist:
+            return entry
+
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            self._entries.setdefault(key, entry)
+        return entry
+
+    def _store(self, key: str, entry: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = entry
+        if not self._persist:
+            return
+        try:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            path = self._path_for(key)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump(entry, handle)
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            print(f"⚠️ Response Cache: could not persist {key}: {exc}")
+
+    def _path_for(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dir, f"{digest}.json")
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
@@ -0,0 +1,209 @@
+"""
+Shared HTTP Client
+Pooled HTTP access used by every agent instead of bare `requests.get`.
+
+- One keep-alive `requests.Session` per host, so repeated calls to the same API
+  reuse TCP/TLS connections.
+- Default (connect, read) timeouts for callers that do not pass one.
+- Retries with jittered exponential backoff for idempotent GETs on connection
+  errors, timeouts and 429/5xx responses.
+- A per-host concurrency limit so parallel agents cannot flood one upstream.
+- Per-host request, retry and connection-reuse statistics via `stats()`.
+- Cooperative cancellation: under a current `CancellationToken`, timeouts are
+  capped to the time left, and no request or retry starts once it is cancelled.
+- Identical concurrent GETs (same URL, params, headers and timeout) are
+  coalesced into one upstream request. Every caller gets its own Response
+  with the same status, headers and body, since a Response is not safe to
+  read from several threads.
+"""
+
+import random
+import threading
+import time
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .cancellation import OperationCancelled, current_token
+from .singleflight import SingleFlight
+
+DEFAULT_TIMEOUT = (5, 15)  # (connect, read) seconds
+POOL_MAXSIZE = 10
+MAX_CONCURRENT_PER_HOST = 8
+GET_RETRIES = 2
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = 4.0
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+_lock = threading.Lock()
+_hosts: Dict[str, Dict[str, Any]] = {}
+_get_flights = SingleFlight("http_get")
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """
+    GET through the shared pool, retried on transient failures. Concurrent
+    identical GETs share one request and each get a copy of its response;
+    streamed responses are never shared.
+    """
+    if kwargs.get("stream"):
+        return request("GET", url, **kwargs)
+    response, _ = _get_flights.do(_flight_key(url, kwargs), lambda: request("GET", url, **kwargs))
+    return _copy_response(response)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """POST through the shared pool. Not retried: POSTs are not assumed idempotent."""
+    return request("POST", url, **kwargs)
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    host = _host_state(url)
+    timeout = kwargs.pop("timeout", DEFAULT_TIMEOUT)
+    retries = GET_RETRIES if method.upper() == "GET" else 0
+    token = current_token()
+
+    attempt = 0
+    while True:
+        if token is not None:
+            token.raise_if_cancelled()
+            kwargs["timeout"] = token.cap_timeout(timeout)
+        else:
+            kwargs["timeout"] = timeout
+        _acquire(host["semaphore"], token)
+        try:
+            _count(host, "requests")
+            try:
+                response = host["session"].request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                _count(host, "errors")
+                if token is not None and token.cancelled:
+                    _count(host, "cancelled")
+                    raise OperationCancelled(f"{method} {url}: {token.reason}") from exc
+                if attempt >= retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                    return response
+                response.close()
+        finally:
+            host["semaphore"].release()
+        attempt += 1
+        _count(host, "retries")
+        delay = _backoff_delay(attempt)
+        if token is None:
+            time.sleep(delay)
+        elif token.wait(delay):
+            _count(host, "cancelled")
+            raise OperationCancelled(f"{method} {url}: {token.reason}")
+
+
+def coalescing_stats() -> Dict[str, Any]:
+    """How many GETs were served by another caller's in-flight request."""
+    return _get_flights.stats()
+
+
+def stats() -> Dict[str, Any]:
+    """Per-host request counters and keep-alive connection reuse."""
+    with _lock:
+        hosts = dict(_hosts)
+
+    summary = {}
+    for name, host in hosts.items():
+        connections = _connections_opened(host["session"])
+        requests_sent = host["counters"]["requests"]
+        summary[name] = dict(
+            host["counters"],
+            connections_opened=connections,
+            reused_connections=max(requests_sent - connections, 0),
+            reuse_ratio=round(1 - connections / requests_sent, 3) if requests_sent else 0.0,
+        )
+    return summary
+
+
+def close():
+    """Close all pooled connections (e.g. on shutdown or in tests)."""
+    with _lock:
+        hosts = list(_hosts.values())
+        _hosts.clear()
+    for host in hosts:
+        host["session"].close()
+
+
+def _host_state(url: str) -> Dict[str, Any]:
+    parts = urlsplit(url)
+    name = f"{parts.scheme}://{parts.netloc}"
+    with _lock:
+        host = _hosts.get(name)
+        if host is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            host = {
+                "session": session,
+                "semaphore": threading.BoundedSemaphore(MAX_CONCURRENT_PER_HOST),
+                "counters": {"requests": 0, "retries": 0, "errors": 0, "cancelled": 0},
+            }
+            _hosts[name] = host
+        return host
+
+
+def _flight_key(url: str, kwargs: Dict[str, Any]) -> tuple:
+    # Prepare the request so equivalent params/headers spellings share a key. The
+    # timeout is part of it: a caller never waits on a request allowed longer than its own.
+    prepared = requests.Request("GET", url, params=kwargs.get("params"), headers=kwargs.get("headers")).prepare()
+    return (prepared.url, tuple(sorted((k.lower(), v) for k, v in prepared.headers.items())),
+            repr(kwargs.get("auth")), repr(kwargs.get("timeout", DEFAULT_TIMEOUT)))
+
+
+def _copy_response(response: requests.Response) -> requests.Response:
+    """A Response of its own for one caller: same status, headers and body bytes (already read)."""
+    clone = requests.Response()
+    clone.status_code = response.status_code
+    clone.headers = CaseInsensitiveDict(response.headers)
+    clone._content = response.content
+    clone._content_consumed = True
+    clone.encoding = response.encoding
+    clone.reason = response.reason
+    clone.url = response.url
+    clone.elapsed = response.elapsed
+    clone.request = response.request
+    clone.history = list(response.history)
+    clone.cookies = response.cookies.copy()
+    return clone
+
+
+def _acquire(semaphore: threading.BoundedSemaphore, token):
+    """Take a host slot, giving up if the token is cancelled while waiting."""
+    if token is None or token.remaining() is None:
+        semaphore.acquire()
+        return
+    if not semaphore.acquire(timeout=token.remaining()):
+        raise OperationCancelled(f"waiting for a connection slot: {token.reason or 'deadline exceeded'}")
+
+
+def _count(host: Dict[str, Any], counter: str):
+    with _lock:
+        host["counters"][counter] += 1
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff."""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+
+def _connections_opened(session: requests.Session) -> int:
+    """Number of TCP connections urllib3 has opened for this session."""
+    opened = 0
+    for adapter in set(session.adapters.values()):
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            opened += getattr(pool, "num_connections", 0) if pool is not None else 0
+    return opened
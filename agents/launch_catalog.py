@@ -0,0 +1,165 @@
+"""
+Launch Catalog
+In-memory index of SpaceX launches used for mission lookups by name.
+
+The catalog is loaded once through an injected loader and refreshed when its
+TTL expires. Launch names and payload names are normalized into tokens and kept
+in an inverted index, so a mission search is a local probe ranked by token
+rarity and fuzzy similarity instead of a scan over the network.
+"""
+
+import difflib
+import math
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_TTL_SECONDS = 900
+# Share of the query's (rarity-weighted) tokens a launch must cover to match.
+MIN_MATCH_SCORE = 0.5
+# Tokens that are not in the index are matched to close vocabulary entries.
+FUZZY_CUTOFF = 0.8
+FUZZY_WEIGHT = 0.6
+PAYLOAD_WEIGHT = 0.8
+
+_TOKEN_PATTERN = re.compile(r"[a-z]+|\d+")
+
+LaunchLoader = Callable[[], Tuple[List[Dict[str, Any]], Dict[str, str]]]
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """
+    Split text into lowercase alphabetic and numeric tokens.
+    "Orbcomm OG-2", "ORBCOMM OG2" and "orbcomm og 2" all give
+    ["orbcomm", "og", "2"].
+    """
+    if not text:
+        return []
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class LaunchCatalog:
+    """Thread-safe, TTL-refreshed inverted index over launch and payload names."""
+
+    def __init__(self, loader: LaunchLoader, ttl_seconds: int = DEFAULT_TTL_SECONDS):
+        self._loader = loader
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._launches: List[Dict[str, Any]] = []
+        self._names: List[str] = []
+        self._name_index: Dict[str, set] = {}
+        self._payload_index: Dict[str, set] = {}
+        self._document_frequency: Dict[str, int] = {}
+
+    def search(self, mission_name: str, limit: int = 5) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to `limit` (launch, score) pairs, best match first."""
+        query_tokens = normalize_tokens(mission_name)
+        if not query_tokens:
+            return []
+        self._ensure_fresh()
+
+        with self._lock:
+            launches = self._launches
+            names = self._names
+            name_index = self._name_index
+            payload_index = self._payload_index
+            total = max(len(launches), 1)
+            weights = {
+                token: math.log(1 + total / (1 + self._document_frequency.get(token, 0)))
+                for token in set(query_tokens)
+            }
+            vocabulary = list(self._document_frequency)
+
+        scores: Dict[int, float] = {}
+        total_weight = sum(weights.values())
+        for token, weight in weights.items():
+            matches = [(token, 1.0)]
+            if token not in name_index and token not in payload_index and len(token) >= 4:
+                matches = [
+                    (close, FUZZY_WEIGHT)
+                    for close in difflib.get_close_matches(token, vocabulary, n=3, cutoff=FUZZY_CUTOFF)
+                ]
+            credited: Dict[int, float] = {}
+            for candidate, factor in matches:
+                for position in name_index.get(candidate, ()):
+                    credited[position] = max(credited.get(position, 0.0), factor)
+                for position in payload_index.get(candidate, ()):
+                    credited[position] = max(credited.get(position, 0.0), factor * PAYLOAD_WEIGHT)
+            for position, factor in credited.items():
+                scores[position] = scores.get(position, 0.0) + weight * factor / total_weight
+
+        query_text = " ".join(query_tokens)
+        ranked = []
+        for position, score in scores.items():
+            if score < MIN_MATCH_SCORE:
+                continue
+            name_text = names[position]
+            similarity = difflib.SequenceMatcher(None, query_text, name_text).ratio()
+            phrase = 1 if query_text in name_text else 0
+            upcoming = 1 if launches[position].get("upcoming") else 0
+            ranked.append((score, phrase, similarity, upcoming, position))
+
+        ranked.sort(reverse=True)
+        return [(launches[item[-1]], round(item[0], 3)) for item in ranked[:limit]]
+
+    def best_match(self, mission_name: str) -> Optional[Dict[str, Any]]:
+        matches = self.search(mission_name, limit=1)
+        return matches[0][0] if matches else None
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "launches": len(self._launches),
+                "tokens": len(self._document_frequency),
+                "age_seconds": round(time.time() - self._loaded_at, 1) if self._loaded_at else None,
+                "ttl_seconds": self._ttl_seconds,
+            }
+
+    def _ensure_fresh(self):
+        with self._lock:
+            if self._loaded_at and time.time() - self._loaded_at < self._ttl_seconds:
+                return
+            try:
+                launches, payload_names = self._loader()
+            except Exception as exc:
+                if self._loaded_at:
+                    print(f"⚠️ Launch Catalog: refresh failed, keeping previous index: {exc}")
+                    return
+                raise
+            self._build_index(launches or [], payload_names or {})
+            self._loaded_at = time.time()
+
+    def _build_index(self, launches: List[Dict[str, Any]], payload_names: Dict[str, str]):
+        name_index: Dict[str, set] = {}
+        payload_index: Dict[str, set] = {}
+        document_frequency: Dict[str, int] = {}
+        names = []
+
+        for position, launch in enumerate(launches):
+            name_tokens = normalize_tokens(launch.get("name", ""))
+            names.append(" ".join(name_tokens))
+            payload_tokens = []
+            for payload in launch.get("payloads") or []:
+                if isinstance(payload, dict):
+                    payload_tokens.extend(normalize_tokens(payload.get("name", "")))
+                else:
+                    payload_tokens.extend(normalize_tokens(payload_names.get(payload, "")))
+
+            for token in set(name_tokens):
+                name_index.setdefault(token, set()).add(position)
+            for token in set(payload_tokens):
+                payload_index.setdefault(token, set()).add(position)
+            for token in set(name_tokens) | set(payload_tokens):
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+
+        self._launches = launches
+        self._names = names
+        self._name_index = name_index
+        self._payload_index = payload_index
+        self._document_frequency = document_frequency
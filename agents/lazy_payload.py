@@ -0,0 +1,109 @@
+"""
+Lazy Payload
+Dict that defers loading some of its sections until they are first accessed.
+
+Deferred keys are present from the start so the payload keeps its usual shape.
+Until loaded they hold a small placeholder, which is what bulk readers such as
+`json.dumps`, `dict(payload)` or `.items()` see. Reading a deferred key through
+`payload[key]` or `payload.get(key)` loads it through the loader and stores the
+real value in place.
+
+Anything that leaves the process (JSON responses, pickles) should go through
+`snapshot()`, which returns plain dicts without loading anything. Sections
+nobody read keep their placeholder, so a response never pays for fetches the
+agents skipped. A caller that needs a section in the output names it up front
+(e.g. `spacex_sections`), and the agent then fetches it with everything else.
+Copies and deep copies stay lazy and share the loader. Pickling gives the
+snapshot, because the loader itself cannot be pickled.
+"""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Iterable, List
+
+DEFERRED_PLACEHOLDER = {"deferred": True}
+
+SectionLoader = Callable[[List[str]], Dict[str, Any]]
+
+
+class LazyPayload(dict):
+    """Dict whose deferred sections are fetched on first access."""
+
+    def __init__(self, data: Dict[str, Any] = None, deferred: Iterable[str] = (), loader: SectionLoader = None):
+        super().__init__(data or {})
+        self._loader = loader
+        self._deferred = set()
+        self._lock = threading.RLock()
+        for key in deferred:
+            self._deferred.add(key)
+            super().__setitem__(key, dict(DEFERRED_PLACEHOLDER))
+
+    def __getitem__(self, key):
+        if key in self._deferred:
+            self._load([key])
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key in self._deferred:
+            self._load([key])
+        return super().get(key, default)
+
+    def __setitem__(self, key, value):
+        self._deferred.discard(key)
+        super().__setitem__(key, value)
+
+    def update(self, *args, **kwargs):
+        updates = dict(*args, **kwargs)
+        self._deferred.difference_update(updates)
+        super().update(updates)
+
+    def deferred_keys(self) -> List[str]:
+        return sorted(self._deferred)
+
+    def materialize(self) -> "LazyPayload":
+        """Load every deferred section in one loader call."""
+        self._load(list(self._deferred))
+        return self
+
+    def __copy__(self):
+        clone = LazyPayload(loader=self._loader)
+        dict.update(clone, self)
+        clone._deferred = set(self._deferred)
+        return clone
+
+    def __deepcopy__(self, memo):
+        clone = LazyPayload(loader=self._loader)
+        memo[id(self)] = clone
+        for key, value in dict.items(self):
+            dict.__setitem__(clone, copy.deepcopy(key, memo), copy.deepcopy(value, memo))
+        clone._deferred = set(self._deferred)
+        return clone
+
+    def __reduce__(self):
+        return dict, (snapshot(self),)
+
+    def _load(self, keys: List[str]):
+        with self._lock:
+            pending = [key for key in keys if key in self._deferred]
+            if not pending or self._loader is None:
+                return
+            values = self._loader(pending)
+            for key in pending:
+                super().__setitem__(key, values.get(key))
+                self._deferred.discard(key)
+
+
+def snapshot(value: Any) -> Any:
+    """
+    Plain copy of `value` for serialization. Every LazyPayload inside it (at
+    any depth) becomes a plain dict holding what has been loaded so far, and
+    deferred sections keep their placeholder. Nothing is fetched. Other
+    containers are copied and leaves are shared.
+    """
+    if isinstance(value, dict):
+        return {key: snapshot(item) for key, item in dict.items(value)}
+    if isinstance(value, list):
+        return [snapshot(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(snapshot(item) for item in value)
+    return value
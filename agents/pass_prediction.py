@@ -0,0 +1,217 @@
+"""
+Pass Prediction
+Rise, culmination and set times of satellites over a ground observer.
+
+Passes are found in two stages, each vectorized over all satellites:
+1. Coarse: elevations of every satellite at `step_seconds` intervals over the
+   window, from one propagation call. Runs of samples above the elevation
+   mask are passes; the samples around each run bracket its rise and set, and
+   its highest sample brackets the culmination.
+2. Refinement: all brackets are refined together, by bisection for rise and
+   set (to REFINE_TOLERANCE_SECONDS) and by golden-section search for the
+   culmination, propagating one row per bracket.
+
+A pass that stays above the mask for less than one coarse step can fall
+between samples; lower `step_seconds` to catch such grazing passes.
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .orbit_propagator import (
+    WGS84_FLATTENING, WGS84_RADIUS_KM, Propagator, teme_to_ecef, to_unix_seconds,
+)
+
+COARSE_STEP_SECONDS = 60.0
+REFINE_TOLERANCE_SECONDS = 0.5
+DEFAULT_MIN_ELEVATION = 10.0
+DEFAULT_WINDOW_HOURS = 24.0
+
+GOLDEN_RATIO = (math.sqrt(5.0) - 1.0) / 2.0
+
+
+class Observer:
+    """Ground location on the WGS-84 ellipsoid (degrees, km)."""
+
+    def __init__(self, latitude: float, longitude: float, altitude_km: float = 0.0):
+        self.latitude = float(latitude)
+        self.longitude = float(longitude)
+        self.altitude_km = float(altitude_km)
+
+        lat = math.radians(self.latitude)
+        lon = math.radians(self.longitude)
+        e2 = WGS84_FLATTENING * (2.0 - WGS84_FLATTENING)
+        n = WGS84_RADIUS_KM / math.sqrt(1.0 - e2 * math.sin(lat) ** 2)
+        self.ecef = np.array([
+            (n + self.altitude_km) * math.cos(lat) * math.cos(lon),
+            (n + self.altitude_km) * math.cos(lat) * math.sin(lon),
+            (n * (1.0 - e2) + self.altitude_km) * math.sin(lat),
+        ])
+        # Rows: east, north, up unit vectors in earth-fixed coordinates
+        self.enu = np.array([
+            [-math.sin(lon), math.cos(lon), 0.0],
+            [-math.sin(lat) * math.cos(lon), -math.sin(lat) * math.sin(lon), math.cos(lat)],
+            [math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)],
+        ])
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Dict[str, Any]) -> "Observer":
+        """From a {"latitude", "longitude"[, "altitude_km"]} dict, e.g. the launchpad coordinates."""
+        return cls(coordinates["latitude"], coordinates["longitude"], coordinates.get("altitude_km", 0.0))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"latitude": self.latitude, "longitude": self.longitude, "altitude_km": self.altitude_km}
+
+
+def look_angles(propagator: Propagator, observer: Observer, unix_times) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Elevation and azimuth (degrees) and range (km) of every satellite from the
+    observer. `unix_times` is shape (times,) for times shared by all
+    satellites, or (satellites, times). Failed propagations, decayed
+    satellites included, give NaN.
+    """
+    unix = np.asarray(unix_times, dtype=float)
+    if unix.ndim <= 1:
+        unix = np.atleast_1d(unix)
+        r, _, errors = propagator.propagate(unix)
+    else:
+        r, _, errors = propagator.propagate_minutes((unix - propagator.epoch_unix[:, None]) / 60.0)
+    r[errors != 0] = np.nan
+    topocentric = (teme_to_ecef(r, unix) - observer.ecef) @ observer.enu.T
+    east, north, up = topocentric[..., 0], topocentric[..., 1], topocentric[..., 2]
+    distance = np.linalg.norm(topocentric, axis=-1)
+    with np.errstate(all="ignore"):
+        elevation = np.degrees(np.arcsin(up / distance))
+    azimuth = np.mod(np.degrees(np.arctan2(east, north)), 360.0)
+    return elevation, azimuth, distance
+
+
+def _elevation_at(propagator: Propagator, observer: Observer, unix_times: np.ndarray) -> np.ndarray:
+    # One time per row of `propagator`
+    elevation, _, _ = look_angles(propagator, observer, unix_times[:, None])
+    return elevation[:, 0]
+
+
+def _refine_crossings(propagator: Propagator, observer: Observer, lo: np.ndarray, hi: np.ndarray,
+                      rising: np.ndarray, min_elevation: float, tolerance: float) -> np.ndarray:
+    """Bisect each [lo, hi] bracket to the time the elevation crosses the mask."""
+    width = float(np.max(hi - lo)) if len(lo) else 0.0
+    for _ in range(max(1, math.ceil(math.log2(max(width, tolerance) / tolerance)))):
+        mid = 0.5 * (lo + hi)
+        above = _elevation_at(propagator, observer, mid) > min_elevation
+        move_hi = above == rising
+        hi = np.where(move_hi, mid, hi)
+        lo = np.where(move_hi, lo, mid)
+    return 0.5 * (lo + hi)
+
+
+def _refine_culminations(propagator: Propagator, observer: Observer, lo: np.ndarray, hi: np.ndarray,
+                         tolerance: float) -> np.ndarray:
+    """Golden-section search for the highest elevation within each [lo, hi]."""
+    a, b = lo.copy(), hi.copy()
+    c = b - GOLDEN_RATIO * (b - a)
+    d = a + GOLDEN_RATIO * (b - a)
+    fc = _elevation_at(propagator, observer, c)
+    fd = _elevation_at(propagator, observer, d)
+    width = float(np.max(b - a)) if len(a) else 0.0
+    iterations = max(1, math.ceil(math.log(max(width, tolerance) / tolerance) / -math.log(GOLDEN_RATIO)))
+    for _ in range(iterations):
+        left = fc >= fd
+        # Keep [a, d] when c is higher, [c, b] otherwise; one new evaluation per bracket
+        b = np.where(left, d, b)
+        a = np.where(left, a, c)
+        new_c = b - GOLDEN_RATIO * (b - a)
+        new_d = a + GOLDEN_RATIO * (b - a)
+        probe = np.where(left, new_c, new_d)
+        value = _elevation_at(propagator, observer, probe)
+        fd, fc = np.where(left, fc, value), np.where(left, value, fd)
+        d, c = np.where(left, c, new_d), np.where(left, new_c, d)
+    return 0.5 * (a + b)
+
+
+def predict_passes(propagator: Propagator, observer: Observer, start=None,
+                   hours: float = DEFAULT_WINDOW_HOURS, min_elevation: float = DEFAULT_MIN_ELEVATION,
+                   step_seconds: float = COARSE_STEP_SECONDS,
+                   tolerance_seconds: float = REFINE_TOLERANCE_SECONDS) -> List[Dict[str, Any]]:
+    """
+    Passes of every satellite above `min_elevation` degrees during `hours`
+    from `start` (default now), ordered by start time. A pass already in
+    progress at the window start has no rise_time; one still in progress at
+    the end has no set_time.
+    """
+    start_unix = float(np.atleast_1d(to_unix_seconds(start if start is not None else datetime.now(timezone.utc)))[0])
+    end_unix = start_unix + hours * 3600.0
+    times = start_unix + np.arange(0.0, hours * 3600.0 + step_seconds, step_seconds)
+    times = np.minimum(times, end_unix)
+
+    elevation, _, _ = look_angles(propagator, observer, times)
+    above = np.nan_to_num(elevation, nan=-90.0) > min_elevation
+
+    # Runs of samples above the mask, in row-major order: run k is satellite
+    # sats[k], samples first[k] .. last[k]
+    padded = np.zeros((len(propagator), len(times) + 2), dtype=np.int8)
+    padded[:, 1:-1] = above
+    edges = np.diff(padded, axis=1)
+    sats, first = np.nonzero(edges == 1)
+    _, end = np.nonzero(edges == -1)
+    last = end - 1
+    if not len(sats):
+        return []
+
+    peak = np.array([f + int(np.argmax(elevation[s, f:l + 1])) for s, f, l in zip(sats, first, last)], dtype=np.int64)
+    has_rise = first > 0
+    has_set = last < len(times) - 1
+
+    # Rise and set brackets, refined together
+    crossing_sats = np.concatenate([sats[has_rise], sats[has_set]])
+    lo = np.concatenate([times[first[has_rise] - 1], times[last[has_set]]])
+    hi = np.concatenate([times[first[has_rise]], times[np.minimum(last[has_set] + 1, len(times) - 1)]])
+    rising = np.concatenate([np.ones(int(has_rise.sum()), dtype=bool), np.zeros(int(has_set.sum()), dtype=bool)])
+    crossing_times = np.empty(0)
+    if len(crossing_sats):
+        crossing_times = _refine_crossings(propagator.take(crossing_sats), observer, lo, hi, rising,
+                                           min_elevation, tolerance_seconds)
+    rise_time = np.full(len(sats), np.nan)
+    set_time = np.full(len(sats), np.nan)
+    rise_time[has_rise] = crossing_times[:int(has_rise.sum())]
+    set_time[has_set] = crossing_times[int(has_rise.sum()):]
+
+    # Culmination between the neighbouring samples of the highest one, inside the pass
+    pass_start = np.where(has_rise, rise_time, start_unix)
+    pass_end = np.where(has_set, set_time, end_unix)
+    culmination = _refine_culminations(
+        propagator.take(sats), observer,
+        np.maximum(times[np.maximum(peak - 1, 0)], pass_start),
+        np.minimum(times[np.minimum(peak + 1, len(times) - 1)], pass_end),
+        tolerance_seconds,
+    )
+
+    # Look angles at rise, culmination and set in one call
+    events = np.stack([pass_start, culmination, pass_end], axis=1)
+    event_el, event_az, _ = look_angles(propagator.take(sats), observer, events)
+
+    passes = []
+    for k in range(len(sats)):
+        satellite = int(sats[k])
+        passes.append({
+            "norad_id": int(propagator.norad_ids[satellite]),
+            "name": propagator.names[satellite],
+            "start_time": _iso(pass_start[k]),
+            "rise_time": _iso(rise_time[k]) if has_rise[k] else None,
+            "rise_azimuth": round(float(event_az[k, 0]), 1) if has_rise[k] else None,
+            "culmination_time": _iso(culmination[k]),
+            "max_elevation": round(float(event_el[k, 1]), 1),
+            "culmination_azimuth": round(float(event_az[k, 1]), 1),
+            "set_time": _iso(set_time[k]) if has_set[k] else None,
+            "set_azimuth": round(float(event_az[k, 2]), 1) if has_set[k] else None,
+            "duration_minutes": round(float(pass_end[k] - pass_start[k]) / 60.0, 1),
+        })
+    passes.sort(key=lambda p: p["start_time"])
+    return passes
+
+
+def _iso(unix_seconds: float) -> str:
+    return datetime.fromtimestamp(round(float(unix_seconds)), timezone.utc).isoformat()
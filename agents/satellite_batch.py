@@ -0,0 +1,169 @@
+"""
+Satellite Batch
+Positions and orbital parameters of many satellites as parallel arrays.
+
+A `SatelliteBatch` holds one NumPy column per quantity (struct of arrays)
+instead of one dict per satellite, so tracking thousands of objects costs a
+few arrays rather than thousands of small dicts, and consumers such as the
+anomaly checks can work on whole columns at once. `to_dict()` gives the same
+layout as JSON-ready lists (`{"norad_id": [...], "latitude": [...], ...}`),
+and `from_dict()` reads it back.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .orbit_propagator import DECAYED_ERROR, EARTH_RADIUS_KM, Propagator, orbit_summary, teme_to_geodetic
+
+# Column -> decimals kept in to_dict(); None keeps integers as they are
+COLUMNS = {
+    "norad_id": None,
+    "latitude": 4,
+    "longitude": 4,
+    "altitude_km": 1,
+    "velocity_km_s": 3,
+    "inclination": 2,
+    "eccentricity": 7,
+    "period_minutes": 2,
+    "perigee_km": 1,
+    "apogee_km": 1,
+    "tle_age_days": 2,
+    "error": None,
+}
+INTEGER_COLUMNS = ("norad_id", "error")
+
+# Orbit regimes by mean altitude (km) for summaries
+LEO_MAX_ALTITUDE_KM = 2000.0
+GEO_ALTITUDE_KM = 35786.0
+GEO_TOLERANCE_KM = 500.0
+HIGHLY_ELLIPTICAL_ECCENTRICITY = 0.25
+
+
+class SatelliteBatch:
+    """Parallel arrays, one entry per satellite; `batch["altitude_km"]` is a column."""
+
+    def __init__(self, columns: Dict[str, Any], names=None, timestamp: Optional[float] = None):
+        missing = [column for column in COLUMNS if column not in columns]
+        if missing:
+            raise ValueError(f"Missing batch columns: {', '.join(missing)}")
+        self.columns = {
+            column: np.asarray(columns[column], dtype=np.int64 if column in INTEGER_COLUMNS else float)
+            for column in COLUMNS
+        }
+        count = len(self.columns["norad_id"])
+        if any(len(values) != count for values in self.columns.values()):
+            raise ValueError("Batch columns must have the same length")
+        self.names = np.asarray(names if names is not None else [""] * count, dtype=str)
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_propagator(cls, propagator: Propagator, unix_time: float) -> "SatelliteBatch":
+        """Propagate every satellite to `unix_time` in one call; failed and decayed satellites get no position."""
+        times = np.array([float(unix_time)])
+        r, v, errors = propagator.propagate(times)
+        r[errors != 0] = np.nan
+        v[errors != 0] = np.nan
+        lat, lon, alt = teme_to_geodetic(r[:, 0], times[0])
+        speed = orbit_summary(r[:, 0], v[:, 0])["speed_km_s"]
+        semi_major = propagator.semi_major_axis_km
+        return cls({
+            "norad_id": propagator.norad_ids,
+            "latitude": lat,
+            "longitude": lon,
+            "altitude_km": alt,
+            "velocity_km_s": speed,
+            "inclination": np.degrees(propagator.inclo),
+            "eccentricity": propagator.ecco,
+            "period_minutes": propagator.period_minutes,
+            "perigee_km": semi_major * (1.0 - propagator.ecco) - EARTH_RADIUS_KM,
+            "apogee_km": semi_major * (1.0 + propagator.ecco) - EARTH_RADIUS_KM,
+            "tle_age_days": (times[0] - propagator.epoch_unix) / 86400.0,
+            "error": errors[:, 0],
+        }, names=[name or "" for name in propagator.names], timestamp=times[0])
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SatelliteBatch":
+        """Inverse of to_dict()."""
+        timestamp = data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        return cls(data, names=data.get("name"), timestamp=timestamp)
+
+    def __len__(self) -> int:
+        return len(self.columns["norad_id"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Mask of satellites with a usable position (SGP4 error 0)."""
+        return (self.columns["error"] == 0) & np.isfinite(self.columns["altitude_km"])
+
+    @property
+    def decayed(self) -> np.ndarray:
+        """Mask of satellites SGP4 reports as decayed (re-entered); they have no position."""
+        return self.columns["error"] == DECAYED_ERROR
+
+    def take(self, indices) -> "SatelliteBatch":
+        """Batch of the satellites at `indices` (or a boolean mask)."""
+        return SatelliteBatch({column: values[indices] for column, values in self.columns.items()},
+                              names=self.names[indices], timestamp=self.timestamp)
+
+    def row(self, index: int) -> Dict[str, Any]:
+        """One satellite as a dict (for display; keep whole-batch work on the columns)."""
+        data = {"name": str(self.names[index])}
+        data.update({column: values[index].item() for column, values in self.columns.items()})
+        return data
+
+    def regimes(self) -> np.ndarray:
+        """Orbit regime per satellite: "LEO", "MEO", "GEO" or "HEO"."""
+        mean_altitude = 0.5 * (self.columns["perigee_km"] + self.columns["apogee_km"])
+        return np.select(
+            [self.columns["eccentricity"] >= HIGHLY_ELLIPTICAL_ECCENTRICITY,
+             mean_altitude < LEO_MAX_ALTITUDE_KM,
+             np.abs(mean_altitude - GEO_ALTITUDE_KM) <= GEO_TOLERANCE_KM],
+            ["HEO", "LEO", "GEO"],
+            "MEO",
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts and altitude statistics over the satellites with a usable position."""
+        valid = self.valid
+        altitude = self.columns["altitude_km"][valid]
+        regimes, counts = np.unique(self.regimes()[valid], return_counts=True)
+        return {
+            "count": len(self),
+            "propagated": int(np.count_nonzero(valid)),
+            "failed": int(np.count_nonzero(~valid)),
+            "decayed": int(np.count_nonzero(self.decayed)),
+            "altitude_km": {
+                "min": round(float(altitude.min()), 1),
+                "median": round(float(np.median(altitude)), 1),
+                "max": round(float(altitude.max()), 1),
+            } if len(altitude) else None,
+            "regimes": {str(regime): int(count) for regime, count in zip(regimes, counts)},
+            "oldest_tle_days": round(float(self.columns["tle_age_days"].max()), 2) if len(self) else None,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready columns (lists), rounded per COLUMNS; failed positions become None."""
+        data: Dict[str, Any] = {"name": self.names.tolist()}
+        for column, decimals in COLUMNS.items():
+            values = self.columns[column]
+            if decimals is None:
+                data[column] = values.tolist()
+                continue
+            rounded = np.round(values, decimals)
+            finite = np.isfinite(rounded)
+            data[column] = rounded.tolist() if finite.all() else _with_nones(rounded, finite)
+        if self.timestamp is not None:
+            data["timestamp"] = datetime.fromtimestamp(self.timestamp, timezone.utc).isoformat()
+        return data
+
+
+def _with_nones(values: np.ndarray, finite: np.ndarray) -> List[Optional[float]]:
+    # NaN is not valid JSON
+    return [value if ok else None for value, ok in zip(values.tolist(), finite.tolist())]
@@ -1,14 +1,133 @@
 """
 Satellite Data Agent
 Fetches satellite information, tracking data, and orbital parameters.
+
+Positions are computed locally with SGP4 from a cached element set (TLE), so
+tracking questions don't need a request per query: the TLE is fetched at most
+every few hours (N2YO with an API key, CelesTrak otherwise) and propagated
+with `orbit_propagator`.
+
+Element sets are kept in the local TLE catalog (`tle_catalog`), which also
+resolves the satellite a goal asks about: a NORAD id ("NORAD 20580"), a
+well-known name, or a name found in the catalog. Unknown names trigger one
+bulk catalog refresh from CelesTrak at most every few hours.
+
+Goals about several satellites ("NORAD 25544, 20580 and 48274") or a whole
+group ("all Starlink satellites") run in batch mode: every satellite is
+propagated in one vectorized call and returned as columns (`satellite_batch`)
+rather than one dict per satellite.
+
+Goals about close approaches ("any conjunctions for the ISS?") also screen
+for conjunctions over the next few hours (`conjunction_screening`): the
+tracked satellite against the whole catalog, or a batch among itself.
 """
 
 import requests
 import os
+import re
+import threading
+import time
 from datetime import datetime, timezone
 
+from . import http_client
+from .blackboard import LAUNCH_TOPIC
+from .http_cache import ResponseCache
+
+try:
+    import numpy as np
+    from .orbit_propagator import (
+        Propagator, parse_omm, parse_tle, orbit_summary, teme_to_geodetic, EARTH_RADIUS_KM, ERROR_MESSAGES,
+    )
+    from .tle_catalog import TLECatalog, STALE_TLE_DAYS, MIN_REFETCH_SECONDS
+    from .pass_prediction import Observer, predict_passes
+    from .satellite_batch import SatelliteBatch
+    from .conjunction_screening import SCREENING_DISTANCE_KM, screen_conjunctions
+    PROPAGATOR_AVAILABLE = True
+except ImportError:
+    PROPAGATOR_AVAILABLE = False
+
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("goal", "spacex", "coordinates", "satellite_ids", "satellite_group", "screen_conjunctions")
+WRITES = ("satellite",)
+# May start from the launch-site partial result instead of waiting for the full snapshot.
+EARLY_INPUTS = {"spacex": LAUNCH_TOPIC}
+
 # N2YO API for satellite data (free tier available)
 N2YO_API_BASE = "https://api.n2yo.com/rest/v1/satellite"
+# CelesTrak general perturbations data (no key required)
+CELESTRAK_GP_URL = "https://celestrak.org/NORAD/elements/gp.php"
+
+ISS_NORAD_ID = 25544
+KSC_COORDINATES = (28.6080585, -80.6039558)
+
+# Names people use for satellites whose catalog names differ
+KNOWN_SATELLITES = {
+    "iss": 25544,
+    "international space station": 25544,
+    "space station": 25544,
+    "hubble": 20580,
+    "tiangong": 48274,
+    "chinese space station": 48274,
+}
+# "NORAD 25544", "NORAD ids 25544, 20580 and 48274"
+NORAD_ID_PATTERN = re.compile(
+    r"\b(?:norad|catalog|catnr)\s*(?:ids?|numbers?|nos?\.?)?\s*#?\s*(\d{1,6}(?:\s*(?:,|and|&)\s*\d{1,6})*)\b",
+    re.IGNORECASE
+)
+TRACK_PATTERN = re.compile(
+    r"\b(?:track|tracking|where is|where's|position of|locate)\s+(?:the\s+)?(?:satellite\s+)?([^?.!,;]+)",
+    re.IGNORECASE
+)
+# Longest name (in words) tried against the catalog after a tracking verb
+MAX_NAME_WORDS = 4
+# CelesTrak group used to fill the catalog when a name is not found
+CATALOG_GROUP = "active"
+
+# Groups a goal can ask for as a whole: name -> (CelesTrak group, catalog name
+# fragment used when CelesTrak is unreachable)
+SATELLITE_GROUPS = {
+    "starlink": ("starlink", "STARLINK"),
+    "oneweb": ("oneweb", "ONEWEB"),
+    "gps": ("gps-ops", "GPS "),
+    "galileo": ("galileo", "GALILEO"),
+    "glonass": ("glo-ops", None),
+    "beidou": ("beidou", "BEIDOU"),
+    "iridium": ("iridium-NEXT", "IRIDIUM"),
+    "globalstar": ("globalstar", "GLOBALSTAR"),
+    "space stations": ("stations", None),
+    "geostationary": ("geo", None),
+}
+# A group name only means the whole group alongside one of these words
+GROUP_HINT_PATTERN = re.compile(r"\b(?:all|every|constellation|group|shell|fleet|satellites)\b", re.IGNORECASE)
+MAX_BATCH_SATELLITES = 30000
+# Element sets fetched one by one for a list of ids not (freshly) in the catalog
+MAX_BATCH_FETCHES = 25
+
+# Conjunction screening runs when the goal asks about close approaches
+CONJUNCTION_PATTERN = re.compile(
+    r"\b(?:conjunctions?|close approach(?:es)?|collisions?|near[- ]miss(?:es)?|debris)\b", re.IGNORECASE
+)
+CONJUNCTION_WINDOW_HOURS = 6
+MAX_LISTED_CONJUNCTIONS = 20
+
+# Element sets are published a few times a day; SGP4 stays accurate for days.
+CACHE_DIR = os.getenv("SATELLITE_CACHE_DIR", os.path.join(".cache", "satellite"))
+TLE_CACHE_POLICY = (6 * 3600, 18 * 3600)
+
+# Ground track returned with each answer: one orbit ahead
+TRACK_STEP_MINUTES = 10
+TRACK_MINUTES = 90
+
+# Passes over the observer: window, elevation mask (degrees) and how many to list
+PASS_WINDOW_HOURS = 24
+PASS_MIN_ELEVATION = 10.0
+MAX_LISTED_PASSES = 5
+
+_response_cache = ResponseCache(CACHE_DIR)
+_catalog = TLECatalog() if PROPAGATOR_AVAILABLE else None
+_catalog_refreshed_at = 0.0
+_catalog_refresh_lock = threading.Lock()
+
 
 def run(previous_data: dict) -> dict:
     """
@@ -19,24 +138,380 @@ def run(previous_data: dict) -> dict:
     - Pass predictions
     """
     api_key = os.getenv("N2YO_API_KEY")
-    
-    # For demo purposes, we'll use mock data if API key is not available
-    # In production, you would use the N2YO API or similar service
-    if not api_key:
-        print("⚠️ Satellite Agent: N2YO_API_KEY not set, using mock data")
-        satellite_data = _get_mock_satellite_data()
-    else:
+    satellite_data = None
+
+    if PROPAGATOR_AVAILABLE:
         try:
-            satellite_data = _fetch_satellite_data(api_key, previous_data)
+            norad_ids, group = _resolve_batch(previous_data)
+            if norad_ids or group:
+                satellite_data = _batch_result(norad_ids, group, api_key, _wants_conjunctions(previous_data))
+            else:
+                norad_id = _resolve_target(previous_data.get("goal", ""))
+                satellite_data = _track_satellite(norad_id, api_key, previous_data)
         except Exception as e:
-            print(f"⚠️ Satellite Agent: API error, using mock data: {e}")
+            print(f"⚠️ Satellite Agent: local propagation unavailable: {e}")
+
+    # Without local propagation, fall back to the N2YO positions API, or to
+    # mock data if API key is not available
+    if satellite_data is None:
+        if not api_key:
+            print("⚠️ Satellite Agent: N2YO_API_KEY not set, using mock data")
             satellite_data = _get_mock_satellite_data()
+        else:
+            try:
+                satellite_data = _fetch_satellite_data(api_key, previous_data)
+            except Exception as e:
+                print(f"⚠️ Satellite Agent: API error, using mock data: {e}")
+                satellite_data = _get_mock_satellite_data()
     
     previous_data.update({"satellite": satellite_data})
     print("🛰️ Satellite Agent: satellite data loaded.")
     return previous_data
 
 
+def _observer(previous_data: dict) -> tuple:
+    """Observer location: the launch site from the SpaceX data, Kennedy Space Center by default."""
+    spacex_data = previous_data.get("spacex", {})
+    coordinates = spacex_data.get("coordinates") or previous_data.get("coordinates") or {}
+    return (
+        coordinates.get("latitude", KSC_COORDINATES[0]),
+        coordinates.get("longitude", KSC_COORDINATES[1]),
+    )
+
+
+def _fetch_elements(norad_id: int, api_key: str = None) -> dict:
+    """Mean elements for `norad_id` from the cached TLE (refreshed per TLE_CACHE_POLICY)."""
+    if api_key:
+        data = _response_cache.get_json(
+            f"n2yo/tle/{norad_id}",
+            lambda headers: http_client.get(
+                f"{N2YO_API_BASE}/tle/{norad_id}", params={"apiKey": api_key}, headers=headers, timeout=10
+            ),
+            policy=TLE_CACHE_POLICY,
+        )
+        lines = [line for line in (data.get("tle") or "").splitlines() if line.strip()]
+        if len(lines) < 2:
+            raise ValueError(f"N2YO returned no TLE for {norad_id}")
+        return parse_tle(lines[0], lines[1], data.get("info", {}).get("satname"))
+
+    records = _response_cache.get_json(
+        f"celestrak/gp/{norad_id}",
+        lambda headers: http_client.get(
+            CELESTRAK_GP_URL, params={"CATNR": norad_id, "FORMAT": "JSON"}, headers=headers, timeout=10
+        ),
+        policy=TLE_CACHE_POLICY,
+    )
+    if not records:
+        raise ValueError(f"CelesTrak returned no elements for {norad_id}")
+    return parse_omm(records[0])
+
+
+def _load_elements(norad_id: int, api_key: str = None) -> tuple:
+    """
+    (elements, source): the catalog's element set while fresh, otherwise one
+    fetched from N2YO/CelesTrak and merged into the catalog.
+    """
+    record = _catalog.get(norad_id)
+    if record is not None and time.time() - record["fetched_at"] < TLE_CACHE_POLICY[0]:
+        return record, "TLE catalog"
+    try:
+        elements = _fetch_elements(norad_id, api_key)
+    except Exception as e:
+        if record is None:
+            raise
+        print(f"⚠️ Satellite Agent: element set refresh failed, using catalog copy: {e}")
+        return record, "TLE catalog"
+    _catalog.update([elements])
+    return elements, f"{'N2YO' if api_key else 'CelesTrak'} TLE"
+
+
+def _resolve_target(goal: str) -> int:
+    """NORAD id of the satellite the goal asks about (the ISS by default)."""
+    match = NORAD_ID_PATTERN.search(goal)
+    if match:
+        return int(re.match(r"\d+", match.group(1)).group())
+
+    text = goal.lower()
+    for alias, norad_id in sorted(KNOWN_SATELLITES.items(), key=lambda item: -len(item[0])):
+        if re.search(rf"\b{re.escape(alias)}\b", text):
+            return norad_id
+
+    match = TRACK_PATTERN.search(goal)
+    if match:
+        words = match.group(1).split()[:MAX_NAME_WORDS]
+        found = _search_catalog(words)
+        if found is None and refresh_catalog():
+            found = _search_catalog(words)
+        if found is not None:
+            print(f"🛰️ Satellite Agent: tracking {found['name']} (NORAD {found['norad_id']})")
+            return found["norad_id"]
+    return ISS_NORAD_ID
+
+
+def _search_catalog(words: list):
+    # "starlink-1130 over florida" -> tries the longest leading phrase first
+    for count in range(len(words), 0, -1):
+        matches = _catalog.search(" ".join(words[:count]), limit=1)
+        if matches:
+            return matches[0]
+    return None
+
+
+def refresh_catalog(group: str = CATALOG_GROUP, force: bool = False) -> bool:
+    """
+    Merge a CelesTrak group into the TLE catalog (only newer element sets
+    replace stored ones). Runs at most every MIN_REFETCH_SECONDS unless
+    forced; returns whether a refresh happened.
+    """
+    global _catalog_refreshed_at
+    with _catalog_refresh_lock:
+        if not force and time.time() - _catalog_refreshed_at < MIN_REFETCH_SECONDS:
+            return False
+        _catalog_refreshed_at = time.time()
+        try:
+            response = http_client.get(CELESTRAK_GP_URL, params={"GROUP": group, "FORMAT": "TLE"}, timeout=30)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"⚠️ Satellite Agent: catalog refresh failed: {e}")
+            return False
+        counts = _catalog.ingest_text(response.text)
+        print(f"🛰️ Satellite Agent: catalog refreshed from '{group}': {counts}")
+        return True
+
+
+def _resolve_batch(previous_data: dict) -> tuple:
+    """
+    (norad_ids, group) when the request is about several satellites:
+    explicit `satellite_ids` / `satellite_group` keys, more than one NORAD id
+    in the goal, or a known group named as a whole. (None, None) otherwise.
+    """
+    if previous_data.get("satellite_ids") or previous_data.get("satellite_group"):
+        return previous_data.get("satellite_ids"), previous_data.get("satellite_group")
+
+    goal = previous_data.get("goal", "")
+    norad_ids = [int(n) for match in NORAD_ID_PATTERN.finditer(goal) for n in re.findall(r"\d+", match.group(1))]
+    if len(set(norad_ids)) > 1:
+        return list(dict.fromkeys(norad_ids)), None
+
+    if GROUP_HINT_PATTERN.search(goal):
+        text = goal.lower()
+        for name in sorted(SATELLITE_GROUPS, key=len, reverse=True):
+            # "starlink satellites" is the group, "starlink-1130" one satellite
+            if re.search(rf"\b{re.escape(name)}\b(?![-\s]*\d)", text):
+                return None, name
+    return None, None
+
+
+def _group_ids(group: str) -> "np.ndarray":
+    """
+    NORAD ids in a SATELLITE_GROUPS group, from the cached CelesTrak group
+    listing; element sets not freshly in the catalog are merged into it.
+    Without CelesTrak, catalog objects whose names match the group.
+    """
+    celestrak_group, name_fragment = SATELLITE_GROUPS.get(group, (group, None))
+    try:
+        records = _response_cache.get_json(
+            f"celestrak/group/{celestrak_group}",
+            lambda headers: http_client.get(
+                CELESTRAK_GP_URL, params={"GROUP": celestrak_group, "FORMAT": "JSON"}, headers=headers, timeout=30
+            ),
+            policy=TLE_CACHE_POLICY,
+        )
+    except Exception as e:
+        if not name_fragment:
+            raise
+        print(f"⚠️ Satellite Agent: group '{celestrak_group}' unavailable, matching catalog names: {e}")
+        return _catalog.find(name_fragment)
+
+    norad_ids = np.array([int(record["NORAD_CAT_ID"]) for record in records], dtype=np.int64)
+    known = _catalog.records(norad_ids)
+    fresh = set(known["norad_id"][known["fetched_at"] >= time.time() - TLE_CACHE_POLICY[0]].tolist())
+    if len(fresh) < len(norad_ids):
+        elements = []
+        for record in records:
+            if int(record["NORAD_CAT_ID"]) in fresh:
+                continue
+            try:
+                elements.append(parse_omm(record))
+            except (KeyError, ValueError):
+                continue
+        _catalog.update(elements)
+    return norad_ids
+
+
+def track_batch(norad_ids=None, group: str = None, api_key: str = None, now: float = None) -> tuple:
+    """
+    (SatelliteBatch, missing_ids): positions and orbital parameters of every
+    requested satellite from one propagation call. `group` is a
+    SATELLITE_GROUPS name (or a CelesTrak group); ids without an element set
+    are returned in `missing_ids`.
+    """
+    propagator, missing = _batch_propagator(norad_ids, group, api_key)
+    return SatelliteBatch.from_propagator(propagator, time.time() if now is None else now), missing
+
+
+def _batch_propagator(norad_ids, group: str, api_key: str) -> tuple:
+    """(Propagator, missing_ids) for track_batch."""
+    ids = np.asarray(norad_ids if norad_ids is not None else [], dtype=np.int64)
+    if group:
+        ids = np.concatenate([ids, _group_ids(group)])
+    ids = ids[np.sort(np.unique(ids, return_index=True)[1])]
+    if len(ids) > MAX_BATCH_SATELLITES:
+        print(f"⚠️ Satellite Agent: batch limited to the first {MAX_BATCH_SATELLITES} of {len(ids)} satellites")
+        ids = ids[:MAX_BATCH_SATELLITES]
+
+    if not group:
+        # Explicit lists are short: fetch ids missing from the catalog, or stale there
+        known = _catalog.records(ids)
+        fresh = known["norad_id"][known["fetched_at"] >= time.time() - TLE_CACHE_POLICY[0]]
+        for norad_id in np.setdiff1d(ids, fresh)[:MAX_BATCH_FETCHES].tolist():
+            try:
+                _load_elements(norad_id, api_key)
+            except Exception as e:
+                print(f"⚠️ Satellite Agent: no element set for NORAD {norad_id}: {e}")
+
+    records = _catalog.records(ids)
+    missing = np.setdiff1d(ids, records["norad_id"]).tolist()
+    if not len(records):
+        raise ValueError("No element sets found for the requested satellites")
+    return Propagator(records), missing
+
+
+def _batch_result(norad_ids, group: str, api_key: str, screen: bool = False) -> dict:
+    started = time.perf_counter()
+    propagator, missing = _batch_propagator(norad_ids, group, api_key)
+    now = time.time()
+    batch = SatelliteBatch.from_propagator(propagator, now)
+    label = f"{group} group" if group else "requested satellites"
+    print(f"🛰️ Satellite Agent: propagated {len(batch)} satellites ({label}) "
+          f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+    result = {
+        "mode": "batch",
+        "satellite_name": f"{len(batch)} satellites ({label})",
+        "group": group,
+        "summary": batch.summary(),
+        "satellites": batch.to_dict(),
+        "missing_ids": missing,
+        "timestamp": datetime.fromtimestamp(batch.timestamp, timezone.utc).isoformat(),
+        "source": "SGP4 (TLE catalog)",
+    }
+    if screen:
+        result["conjunctions"] = _screen(propagator, now)
+    return result
+
+
+def _wants_conjunctions(previous_data: dict) -> bool:
+    return bool(previous_data.get("screen_conjunctions")) or \
+        bool(CONJUNCTION_PATTERN.search(previous_data.get("goal", "")))
+
+
+def _screen(propagator: "Propagator", now: float, primaries=None) -> dict:
+    """Conjunction screening report for the next CONJUNCTION_WINDOW_HOURS (None if screening failed)."""
+    started = time.perf_counter()
+    try:
+        events = screen_conjunctions(propagator, now, hours=CONJUNCTION_WINDOW_HOURS, primaries=primaries)
+    except Exception as e:
+        print(f"⚠️ Satellite Agent: conjunction screening failed: {e}")
+        return None
+    print(f"🛰️ Satellite Agent: screened {len(propagator)} objects over {CONJUNCTION_WINDOW_HOURS} h, "
+          f"{len(events)} close approaches in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return {
+        "window_hours": CONJUNCTION_WINDOW_HOURS,
+        "distance_km": SCREENING_DISTANCE_KM,
+        "objects_screened": len(propagator),
+        "count": len(events),
+        "events": events[:MAX_LISTED_CONJUNCTIONS],
+    }
+
+
+def _screen_against_catalog(norad_id: int, now: float) -> dict:
+    """Screening of one satellite against every catalog object (None with no catalog to screen against)."""
+    if len(_catalog) < 2:
+        return None
+    propagator = _catalog.propagator()
+    primaries = np.flatnonzero(propagator.norad_ids == norad_id)
+    return _screen(propagator, now, primaries)
+
+
+def get_catalog_stats() -> dict:
+    """Size and staleness of the local TLE catalog."""
+    return _catalog.stats() if _catalog is not None else {"objects": 0}
+
+
+def _track_satellite(norad_id: int, api_key: str, previous_data: dict) -> dict:
+    """Current position, orbit and ground track from SGP4, without a positions request."""
+    elements, source = _load_elements(norad_id, api_key)
+    propagator = Propagator([elements])
+
+    now = time.time()
+    times = now + np.arange(0, TRACK_MINUTES + 1, TRACK_STEP_MINUTES) * 60.0
+    r, v, errors = propagator.propagate(times)
+    if errors[0, 0] != 0:
+        # Includes decayed satellites: SGP4 still returns a position, but it is below the surface
+        raise ValueError(f"SGP4 error {int(errors[0, 0])} for {norad_id}: {ERROR_MESSAGES.get(int(errors[0, 0]), 'unknown')}")
+    lat, lon, alt = teme_to_geodetic(r[0], times)
+    summary = orbit_summary(r[0], v[0])
+
+    epoch_unix = float(propagator.epoch_unix[0])
+    tle_age_days = (now - epoch_unix) / 86400.0
+    if tle_age_days > STALE_TLE_DAYS:
+        print(f"⚠️ Satellite Agent: element set is {tle_age_days:.1f} days old; positions may be off")
+
+    semi_major = float(propagator.semi_major_axis_km[0])
+    eccentricity = elements["eccentricity"]
+    observer_lat, observer_lon = _observer(previous_data)
+    passes = predict_passes(
+        propagator, Observer(observer_lat, observer_lon), now,
+        hours=PASS_WINDOW_HOURS, min_elevation=PASS_MIN_ELEVATION
+    )
+    return {
+        "satellite_name": elements.get("name") or f"NORAD {norad_id}",
+        "norad_id": norad_id,
+        "orbital_parameters": {
+            "inclination": round(float(np.degrees(elements["inclination"])), 2),
+            "eccentricity": round(eccentricity, 7),
+            "period_minutes": round(float(propagator.period_minutes[0]), 2),
+            "altitude_km": round(float(alt[0]), 1),
+            "perigee_km": round(semi_major * (1 - eccentricity) - EARTH_RADIUS_KM, 1),
+            "apogee_km": round(semi_major * (1 + eccentricity) - EARTH_RADIUS_KM, 1),
+            "velocity_km_s": round(float(summary["speed_km_s"][0]), 3),
+        },
+        "current_position": {
+            "latitude": round(float(lat[0]), 4),
+            "longitude": round(float(lon[0]), 4),
+            "altitude_km": round(float(alt[0]), 1),
+            "velocity_km_s": round(float(summary["speed_km_s"][0]), 3),
+        },
+        "ground_track": [
+            {
+                "timestamp": datetime.fromtimestamp(t, timezone.utc).isoformat(),
+                "latitude": round(float(la), 3),
+                "longitude": round(float(lo), 3),
+                "altitude_km": round(float(al), 1),
+            }
+            for t, la, lo, al, error in zip(times, lat, lon, alt, errors[0])
+            if error == 0
+        ],
+        "next_pass": passes[0] if passes else None,
+        "passes": passes[:MAX_LISTED_PASSES],
+        "conjunctions": _screen_against_catalog(norad_id, now) if _wants_conjunctions(previous_data) else None,
+        "tle_epoch": datetime.fromtimestamp(epoch_unix, timezone.utc).isoformat(),
+        "tle_age_days": round(tle_age_days, 2),
+        "observer_location": {
+            "latitude": observer_lat,
+            "longitude": observer_lon,
+            "altitude": 0
+        },
+        "timestamp": datetime.fromtimestamp(now, timezone.utc).isoformat(),
+        "source": f"SGP4 ({source})"
+    }
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters of the element-set cache (process-wide)."""
+    return _response_cache.stats()
+
+
 def _fetch_satellite_data(api_key: str, previous_data: dict) -> dict:
     """Fetch real satellite data from N2YO API"""
     # Example: Get positions of popular satellites
@@ -44,11 +519,7 @@ def _fetch_satellite_data(api_key: str, previous_data: dict) -> dict:
     iss_norad_id = 25544
     
     # Get observer location (default to Kennedy Space Center)
-    spacex_data = previous_data.get("spacex", {})
-    coordinates = spacex_data.get("coordinates", {})
-    
-    observer_lat = coordinates.get("latitude", 28.6080585)
-    observer_lon = coordinates.get("longitude", -80.6039558)
+    observer_lat, observer_lon = _observer(previous_data)
     observer_alt = 0  # Sea level
     
     # Get current positions
@@ -56,13 +527,13 @@ def _fetch_satellite_data(api_key: str, previous_data: dict) -> dict:
     params = {"apiKey": api_key}
     
     try:
-        response = requests.get(positions_url, params=params, timeout=10)
+        response = http_client.get(positions_url, params=params, timeout=10)
         response.raise_for_status()
         positions_data = response.json()
         
         # Get satellite info
         tle_url = f"{N2YO_API_BASE}/tle/{iss_norad_id}"
-        tle_response = requests.get(tle_url, params=params, timeout=10)
+        tle_response = http_client.get(tle_url, params=params, timeout=10)
         tle_data = tle_response.json() if tle_response.status_code == 200 else {}
         
         return {
@@ -0,0 +1,118 @@
+"""
+Single-Flight
+Coalesces identical concurrent calls into one execution.
+
+The first caller for a key (the leader) runs the function; callers arriving
+with the same key while it is in flight wait for it and receive the same
+result, or the same exception. Nothing is cached: once the call finishes,
+the next caller starts a new one.
+
+Used for identical upstream fetches (`http_client.get`, `ResponseCache`) and
+for whole goals (`main.run_goal`). Waiting respects the current
+`CancellationToken`, so a follower stops waiting when its own deadline
+passes or its token is cancelled, while the leader keeps running for the
+others.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from .cancellation import OperationCancelled, current_token
+
+# Longest a follower waits between checks of its token. cancel() (on the
+# token or a parent) does not signal the call's event, so this bounds how
+# late a follower notices it.
+WAIT_POLL_SECONDS = 0.05
+
+
+def _cancelled() -> bool:
+    token = current_token()
+    return token is not None and token.cancelled
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Per-key call coalescing with counters for leaders and shared results."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._counters = {"executions": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run `fn()` once for all concurrent callers with `key`.
+        Returns (result, shared); `shared` is True for callers that joined
+        another caller's execution. If the leader was cancelled by its own
+        deadline, followers that are still live retry instead of failing.
+        """
+        while True:
+            call, leader = self._join(key)
+            if leader:
+                self._lead(call, key, fn)
+            else:
+                self._wait(call)
+            if not leader and isinstance(call.error, OperationCancelled) and not _cancelled():
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result, not leader
+
+    def _join(self, key: Hashable) -> Tuple[_Call, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._counters["executions"] += 1
+            else:
+                call.waiters += 1
+                self._counters["coalesced"] += 1
+        return call, leader
+
+    def _lead(self, call: _Call, key: Hashable, fn: Callable[[], Any]):
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self._counters["errors"] += 1
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["in_flight"] = len(self._calls)
+        calls = counters["executions"] + counters["coalesced"]
+        counters["coalesce_rate"] = round(counters["coalesced"] / calls, 3) if calls else 0.0
+        return counters
+
+    @staticmethod
+    def _wait(call: _Call):
+        token = current_token()
+        if token is None:
+            call.done.wait()
+            return
+        while True:
+            remaining = token.remaining()
+            if call.done.wait(timeout=WAIT_POLL_SECONDS if remaining is None else min(remaining, WAIT_POLL_SECONDS)):
+                return
+            if token.cancelled:
+                raise OperationCancelled(token.reason)
@@ -1,5 +1,19 @@
 import requests
 import re
+import os
+import json
+import hashlib
+import time
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from . import http_client
+from . import blackboard
+from .cancellation import current_token
+from .http_cache import ResponseCache
+from .launch_catalog import LaunchCatalog
+from .lazy_payload import LazyPayload
 
 API_BASE_URL = "https://api.spacexdata.com/v4"
 
@@ -24,6 +38,85 @@ SINGLE_ENDPOINTS = {
 
 V3_MISSIONS_ENDPOINT = "https://api.spacexdata.com/v3/missions"
 
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("goal", "spacex_sections")
+WRITES = ("spacex",)
+# Cheap and side-effect free: may be started speculatively while the plan is being made.
+SPECULATIVE = True
+
+# Sections of the spacex payload that can be fetched lazily, and the goal
+# keywords that make each of them part of the up-front projection.
+RESOURCE_LABELS = list(COLLECTION_ENDPOINTS) + ["missions"]
+LAUNCH_SECTIONS = ["next_launch", "latest_launch_detail", "latest_launch"]
+ALL_SECTIONS = ["next_launch", "latest_launch"] + RESOURCE_LABELS + list(SINGLE_ENDPOINTS)
+SECTION_KEYWORDS = {
+    "next_launch": ["next", "upcoming", "compare"],
+    "latest_launch": ["latest", "last", "previous", "recent", "compare"],
+    "capsules": ["capsule"],
+    "cores": ["core", "booster", "reuse"],
+    "dragons": ["dragon"],
+    "history": ["history", "milestone", "achievement"],
+    "launches_upcoming": ["upcoming", "schedule", "manifest"],
+    "launches_past": ["past launches", "previous launches", "track record", "launch record"],
+    "landpads": ["landpad", "landing"],
+    "launchpads": ["launchpad", "launch pad", "launch site"],
+    "payloads": ["payload"],
+    "rockets": ["rocket", "falcon", "vehicle"],
+    "ships": ["ship", "drone", "recovery"],
+    "missions": ["missions"],
+    "company": ["company", "founder", "employee", "headquarters", "valuation"],
+    "roadster": ["roadster", "tesla", "starman"],
+}
+BROAD_SECTION_KEYWORDS = ["asset", "resource", "overview", "everything", "comprehensive", "inventory", "fleet"]
+
+REQUEST_TIMEOUT_SECONDS = 15
+# Fan-out limits for the resource overview: every endpoint gets its own deadline,
+# and the whole bundle is abandoned (with partial results) after the overall one.
+ENDPOINT_DEADLINE_SECONDS = 8
+OVERALL_DEADLINE_SECONDS = 12
+# The full overview is 14 jobs. The pool holds two of them so every job of a
+# request starts at once, even while jobs abandoned by an earlier request are
+# still waiting out their socket timeouts.
+MAX_CONCURRENT_FETCHES = 28
+
+# Related documents resolved server-side by `launches/query`, so a launch
+# snapshot costs one round trip instead of one request per referenced id.
+LAUNCH_POPULATE = ["launchpad", "rocket", "payloads", "capsules"]
+LAUNCH_QUERIES = {
+    "launches/next": ({"upcoming": True}, {"flight_number": "asc"}),
+    "launches/latest": ({"upcoming": False}, {"flight_number": "desc"}),
+}
+# After a failed query call, use the per-id path for a while before retrying.
+QUERY_RETRY_AFTER_SECONDS = 300
+_query_unavailable_until = 0.0
+
+# Mission lookups are served from an in-memory index refreshed on this TTL.
+CATALOG_TTL_SECONDS = 900
+
+# Response cache policies per endpoint class: (ttl_seconds, stale_while_revalidate_seconds).
+# Launch data moves quickly; vehicles, pads and company data almost never change.
+CACHE_DIR = os.getenv("SPACEX_CACHE_DIR", os.path.join(".cache", "spacex"))
+CACHE_POLICIES = {
+    "launches": (120, 300),
+    "payloads": (3600, 3600),
+    "capsules": (3600, 3600),
+    "cores": (3600, 3600),
+    "roadster": (3600, 3600),
+    "rockets": (86400, 86400),
+    "launchpads": (86400, 86400),
+    "landpads": (86400, 86400),
+    "dragons": (86400, 86400),
+    "ships": (86400, 86400),
+    "history": (86400, 86400),
+    "company": (86400, 86400),
+    "v3/missions": (86400, 86400),
+}
+
+_response_cache = ResponseCache(CACHE_DIR)
+
+_fetch_pool = None
+_fetch_pool_lock = threading.Lock()
+
 
 def run(previous_data: dict) -> dict:
     """
@@ -58,7 +151,7 @@ def run(previous_data: dict) -> dict:
     if not primary_launch:
         primary_endpoint = "launches/latest" if wants_latest else "launches/next"
         try:
-            primary_launch = _fetch(primary_endpoint)
+            primary_launch = _fetch_launch(primary_endpoint)
             if mission_requested:
                 fallback_mission = primary_launch.get("name", "Unknown")
                 print(f"⚠️ SpaceX Agent: Using fallback launch: {fallback_mission}")
@@ -67,27 +160,43 @@ def run(previous_data: dict) -> dict:
             if wants_latest:
                 print(f"⚠️ SpaceX Agent: latest launch unavailable, falling back to next: {e}")
                 wants_latest = False
-                primary_launch = _fetch("launches/next")
+                primary_launch = _fetch_launch("launches/next")
             else:
                 raise Exception(f"SpaceX API request failed: {e}") from e
 
     launch_info = _build_launch_snapshot(primary_launch)
-    next_launch_snapshot = (
-        launch_info if not wants_latest else _build_launch_snapshot(_safe_fetch("launches/next"))
-    )
-    latest_launch_detail = (
-        launch_info if wants_latest else _build_launch_snapshot(_safe_fetch("launches/latest"))
+    if launch_info:
+        # Let weather/satellite agents start on the launch site while the rest loads.
+        launch_site = {field: launch_info.get(field) for field in blackboard.TOPIC_SCHEMAS[blackboard.LAUNCH_TOPIC]}
+        blackboard.publish(blackboard.LAUNCH_TOPIC, launch_site, publisher="spacex_agent")
+    sections = _plan_projection(goal_text, previous_data.get("spacex_sections"))
+
+    launch_sections = {}
+    if wants_latest:
+        launch_sections["latest_launch_detail"] = launch_info
+        launch_sections["latest_launch"] = _safe_launch_summary("launches/latest", launch=primary_launch)
+        if "next_launch" in sections:
+            launch_sections.update(_load_launch_sections(["next_launch"]))
+    else:
+        launch_sections["next_launch"] = launch_info
+        if "latest_launch" in sections:
+            launch_sections.update(_load_launch_sections(["latest_launch_detail", "latest_launch"]))
+
+    eager_labels = [label for label in RESOURCE_LABELS + list(SINGLE_ENDPOINTS) if label in sections]
+    resource_overview, single_resource_data, fetch_metrics = _collect_remote_resources(eager_labels)
+    resources = LazyPayload(
+        {label: resource_overview.get(label) for label in RESOURCE_LABELS},
+        deferred=[label for label in RESOURCE_LABELS if label not in resource_overview],
+        loader=lambda labels: _collect_remote_resources(labels)[0],
     )
-    latest_launch = _safe_launch_summary("launches/latest", launch=primary_launch if wants_latest else None)
-    resource_overview = _collect_resource_overview()
-    single_resource_data = _collect_single_resources()
 
     spacex_payload = {
         "primary_focus": "latest" if wants_latest else "next",
-        "next_launch": next_launch_snapshot,
-        "latest_launch_detail": latest_launch_detail,
-        "latest_launch": latest_launch,
-        "resources": resource_overview,
+        "next_launch": launch_sections.get("next_launch"),
+        "latest_launch_detail": launch_sections.get("latest_launch_detail"),
+        "latest_launch": launch_sections.get("latest_launch"),
+        "resources": resources,
+        "fetch_metrics": dict(fetch_metrics, cache=get_cache_stats(), projection=sorted(sections)),
     }
     if launch_info:
         spacex_payload.update(
@@ -103,47 +212,145 @@ def run(previous_data: dict) -> dict:
             found_mission = launch_info.get("mission", "")
             if mission_name.lower() not in found_mission.lower() and found_mission.lower() not in mission_name.lower():
                 spacex_payload["mission_search_note"] = f"Requested mission '{mission_name}' not found. Showing: {found_mission}"
-    spacex_payload.update(single_resource_data)
+    for label in SINGLE_ENDPOINTS:
+        spacex_payload[label] = single_resource_data.get(label)
+
+    loaded = set(launch_sections) | set(single_resource_data)
+    deferred = [key for key in LAUNCH_SECTIONS + list(SINGLE_ENDPOINTS) if key not in loaded]
+    if deferred:
+        print(f"🚀 SpaceX Agent: deferring {', '.join(deferred)} until first access")
+    spacex_payload = LazyPayload(spacex_payload, deferred=deferred, loader=_load_payload_sections)
 
     previous_data.update({"spacex": spacex_payload})
     print("🚀 SpaceX Agent: enriched SpaceX snapshot loaded.")
     return previous_data
 
 
-def _fetch(endpoint, resource_id=None):
+def _fetch(endpoint, resource_id=None, timeout=REQUEST_TIMEOUT_SECONDS):
     url = f"{API_BASE_URL}/{endpoint}"
+    key = endpoint
     if resource_id:
         url = f"{url}/{resource_id}"
-    response = requests.get(url, timeout=15)
-    response.raise_for_status()
-    return response.json()
+        key = f"{endpoint}/{resource_id}"
+    return _response_cache.get_json(
+        key,
+        lambda headers: http_client.get(url, headers=headers, timeout=timeout),
+        policy=_cache_policy(endpoint),
+    )
+
+
+def _cache_policy(endpoint):
+    return CACHE_POLICIES.get(endpoint.split("/")[0], CACHE_POLICIES["launches"])
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters of the SpaceX response cache (process-wide)."""
+    return _response_cache.stats()
 
 
-def _safe_fetch(endpoint, resource_id=None):
+def _safe_fetch(endpoint, resource_id=None, timeout=REQUEST_TIMEOUT_SECONDS):
     try:
-        return _fetch(endpoint, resource_id)
+        return _fetch(endpoint, resource_id, timeout=timeout)
     except requests.RequestException as exc:
         print(f"⚠️ SpaceX Agent: failed to fetch {endpoint}{'/' + resource_id if resource_id else ''}: {exc}")
         return None
 
 
+def _query(endpoint, query, options, timeout=REQUEST_TIMEOUT_SECONDS):
+    url = f"{API_BASE_URL}/{endpoint}/query"
+    body = {"query": query, "options": options}
+    digest = hashlib.sha1(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+    return _response_cache.get_json(
+        f"{endpoint}/query/{digest}",
+        lambda headers: http_client.post(url, json=body, headers=headers, timeout=timeout),
+        policy=_cache_policy(endpoint),
+        conditional=False,
+    )
+
+
+def _safe_query_docs(endpoint, query, options):
+    """
+    Run a query and return its `docs` list, or None when the query endpoint is
+    unavailable (in which case callers use their per-id/list fallbacks).
+    """
+    global _query_unavailable_until
+    if time.time() < _query_unavailable_until:
+        return None
+    try:
+        result = _query(endpoint, query, options)
+    except requests.RequestException as exc:
+        print(f"⚠️ SpaceX Agent: {endpoint}/query unavailable, using fallback lookups: {exc}")
+        _query_unavailable_until = time.time() + QUERY_RETRY_AFTER_SECONDS
+        return None
+    if not isinstance(result, dict):
+        return None
+    return result.get("docs")
+
+
+def _query_populated_launch(query, sort=None):
+    """
+    Fetch a single launch with its launchpad, rocket, payloads and capsules
+    populated in one `launches/query` round trip.
+    Returns None when the query endpoint is unavailable or nothing matched.
+    """
+    options = {"limit": 1, "populate": LAUNCH_POPULATE}
+    if sort:
+        options["sort"] = sort
+    docs = _safe_query_docs("launches", query, options)
+    if not docs:
+        return None
+    return docs[0]
+
+
+def _fetch_launch(endpoint):
+    """Fetch `launches/next` or `launches/latest`, populated when possible."""
+    query, sort = LAUNCH_QUERIES[endpoint]
+    launch = _query_populated_launch(query, sort)
+    if launch:
+        return launch
+    return _fetch(endpoint)
+
+
+def _safe_fetch_launch(endpoint):
+    try:
+        return _fetch_launch(endpoint)
+    except requests.RequestException as exc:
+        print(f"⚠️ SpaceX Agent: failed to fetch {endpoint}: {exc}")
+        return None
+
+
+def _ref_id(value):
+    """Return the document id for a reference that may already be populated."""
+    if isinstance(value, dict):
+        return value.get("id")
+    return value
+
+
+def _is_populated(launch) -> bool:
+    refs = [launch.get("launchpad"), launch.get("rocket")]
+    refs.extend(launch.get("payloads") or [])
+    refs.extend(launch.get("capsules") or [])
+    refs = [ref for ref in refs if ref]
+    return all(isinstance(ref, dict) for ref in refs)
+
+
 def _build_launch_snapshot(launch):
     if not launch:
         return {}
 
-    launchpad_id = launch.get("launchpad")
-    rocket_id = launch.get("rocket")
-    payload_ids = launch.get("payloads", []) or []
-    capsule_ids = launch.get("capsules", []) or []
+    if not _is_populated(launch) and launch.get("id"):
+        launch = _query_populated_launch({"_id": launch["id"]}) or launch
 
-    launchpad = _safe_fetch("launchpads", launchpad_id) if launchpad_id else None
-    rocket = _safe_fetch("rockets", rocket_id) if rocket_id else None
-
-    payloads = [_summarize_payload(_safe_fetch("payloads", payload_id)) for payload_id in payload_ids[:3]]
+    if _is_populated(launch):
+        launchpad = launch.get("launchpad")
+        rocket = launch.get("rocket")
+        payloads = [_summarize_payload(payload) for payload in (launch.get("payloads") or [])[:3]]
+        capsules = [_summarize_capsule(capsule) for capsule in (launch.get("capsules") or [])[:3]]
+    else:
+        launchpad, rocket, payloads, capsules = _resolve_launch_references(launch)
     payloads = [payload for payload in payloads if payload]
-
-    capsules = [_summarize_capsule(_safe_fetch("capsules", capsule_id)) for capsule_id in capsule_ids[:3]]
     capsules = [capsule for capsule in capsules if capsule]
+    launchpad_id = _ref_id(launch.get("launchpad"))
 
     coordinates = None
     if launchpad:
@@ -170,6 +377,24 @@ def _build_launch_snapshot(launch):
     }
 
 
+def _resolve_launch_references(launch):
+    """
+    Per-id fallback used when `launches/query` cannot populate the launch.
+    References may be ids or (partially) populated documents, e.g. launches
+    from the catalog carry payloads populated with their names only.
+    """
+    launchpad_id = _ref_id(launch.get("launchpad"))
+    rocket_id = _ref_id(launch.get("rocket"))
+    payload_ids = [_ref_id(ref) for ref in launch.get("payloads", []) or [] if _ref_id(ref)]
+    capsule_ids = [_ref_id(ref) for ref in launch.get("capsules", []) or [] if _ref_id(ref)]
+
+    launchpad = _safe_fetch("launchpads", launchpad_id) if launchpad_id else None
+    rocket = _safe_fetch("rockets", rocket_id) if rocket_id else None
+    payloads = [_summarize_payload(_safe_fetch("payloads", payload_id)) for payload_id in payload_ids[:3]]
+    capsules = [_summarize_capsule(_safe_fetch("capsules", capsule_id)) for capsule_id in capsule_ids[:3]]
+    return launchpad, rocket, payloads, capsules
+
+
 def _safe_launch_summary(endpoint, launch=None):
     if launch is None:
         launch = _safe_fetch(endpoint)
@@ -179,8 +404,8 @@ def _safe_launch_summary(endpoint, launch=None):
         "mission": launch.get("name"),
         "date": launch.get("date_utc"),
         "success": launch.get("success"),
-        "rocket": launch.get("rocket"),
-        "launchpad": launch.get("launchpad"),
+        "rocket": _ref_id(launch.get("rocket")),
+        "launchpad": _ref_id(launch.get("launchpad")),
     }
 
 
@@ -218,47 +443,214 @@ def _summarize_rocket(rocket):
     }
 
 
-def _collect_resource_overview() -> dict:
-    overview = {}
-    for label, config in COLLECTION_ENDPOINTS.items():
-        endpoint = config["endpoint"]
-        limit = config["limit"]
-        fields = config["fields"]
-        data = _safe_fetch(endpoint)
-        if not data:
-            overview[label] = {"error": f"Unable to load {endpoint}"}
-            continue
-        if isinstance(data, dict):
-            data_items = [data]
-        else:
-            data_items = data
+def _get_fetch_pool() -> ThreadPoolExecutor:
+    """Lazily create the worker pool shared by all concurrent SpaceX fetches."""
+    global _fetch_pool
+    with _fetch_pool_lock:
+        if _fetch_pool is None:
+            _fetch_pool = ThreadPoolExecutor(
+                max_workers=MAX_CONCURRENT_FETCHES,
+                thread_name_prefix="spacex-fetch",
+            )
+        return _fetch_pool
 
-        summary_items = []
-        for item in data_items[:limit]:
-            summary_items.append({field: item.get(field) for field in fields})
 
-        overview[label] = {"count": len(data_items), "sample": summary_items}
-
-    overview["missions"] = _fetch_v3_missions()
-    return overview
+def _fetch_concurrently(jobs: dict, overall_deadline: float = OVERALL_DEADLINE_SECONDS,
+                        endpoint_deadline: float = ENDPOINT_DEADLINE_SECONDS):
+    """
+    Run independent fetch jobs at once on the shared fetch pool.
+
+    `jobs` maps a label to a zero-argument callable. A job still running
+    `endpoint_deadline` seconds after it started, or when the overall deadline
+    expires, is abandoned: its label maps to None in the results and is
+    reported as "timeout" in the metrics. Abandoned jobs that have not started
+    are cancelled; running ones finish in the background and are ignored.
+    Returns (results, metrics).
+    """
+    pool = _get_fetch_pool()
+    started_at = time.perf_counter()
+    timings = {}
+    job_starts = {}
 
+    def _timed(label, job):
+        job_start = job_starts[label] = time.perf_counter()
+        try:
+            return job()
+        finally:
+            timings[label] = (time.perf_counter() - job_start) * 1000
+
+    # Each job runs in a copy of the caller's context so it sees the current cancellation token.
+    futures = {
+        pool.submit(contextvars.copy_context().run, _timed, label, job): label
+        for label, job in jobs.items()
+    }
+    pending = set(futures)
+    token = current_token()
+    if token is not None and token.remaining() is not None:
+        overall_deadline = min(overall_deadline, token.remaining())
+    deadline = started_at + overall_deadline
+    expired = set()
+    while pending - expired and time.perf_counter() < deadline:
+        waiting = pending - expired
+        # Wake up at the overall deadline or when the earliest job can hit its own
+        # (a job not started yet cannot expire sooner than a full deadline from now).
+        now = time.perf_counter()
+        wake_at = min([deadline] + [
+            job_starts.get(futures[future], now) + endpoint_deadline for future in waiting
+        ])
+        done, _ = wait(waiting, timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+        pending -= done
+        now = time.perf_counter()
+        expired = {
+            future for future in pending
+            if futures[future] in job_starts and now - job_starts[futures[future]] >= endpoint_deadline
+        }
 
-def _collect_single_resources() -> dict:
     results = {}
-    for label, config in SINGLE_ENDPOINTS.items():
-        data = _safe_fetch(config["endpoint"])
-        if not data:
-            results[label] = {"error": f"Unable to load {config['endpoint']}"}
+    endpoints = {}
+    timed_out = []
+    for future, label in futures.items():
+        if future in pending:
+            future.cancel()
+            results[label] = None
+            timed_out.append(label)
+            endpoints[label] = {
+                "status": "timeout",
+                "latency_ms": round((time.perf_counter() - started_at) * 1000, 1),
+            }
             continue
-        results[label] = {field: data.get(field) for field in config["fields"]}
-    return results
+        try:
+            results[label] = future.result()
+            failed = not results[label] or (isinstance(results[label], dict) and "error" in results[label])
+            status = "error" if failed else "ok"
+        except Exception as exc:
+            print(f"⚠️ SpaceX Agent: {label} fetch failed: {exc}")
+            results[label] = None
+            status = "error"
+        endpoints[label] = {"status": status, "latency_ms": round(timings.get(label, 0.0), 1)}
+
+    if timed_out:
+        print(f"⏱️ SpaceX Agent: deadline hit, returning partial results (timed out: {', '.join(timed_out)})")
+
+    metrics = {
+        "wall_time_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        "endpoint_deadline_s": endpoint_deadline,
+        "overall_deadline_s": overall_deadline,
+        "timed_out": timed_out,
+        "endpoints": endpoints,
+    }
+    return results, metrics
+
+
+def _plan_projection(goal_text: str, requested_sections=None) -> set:
+    """
+    Map the goal (and any sections a caller asks for explicitly through
+    `spacex_sections`) to the SpaceX sub-resources that must be fetched up front.
+
+    The primary launch fields (mission, date, launchpad_id, coordinates) are
+    always built: they are what weather, satellite, anomaly and summary agents
+    read. Everything outside the returned set is deferred until first access.
+    """
+    if requested_sections == "all" or (requested_sections and "all" in requested_sections):
+        return set(ALL_SECTIONS)
+    sections = set(requested_sections or [])
+
+    goal_lower = (goal_text or "").lower()
+    if any(keyword in goal_lower for keyword in BROAD_SECTION_KEYWORDS):
+        return set(ALL_SECTIONS)
+    for section, keywords in SECTION_KEYWORDS.items():
+        if any(keyword in goal_lower for keyword in keywords):
+            sections.add(section)
+    return sections
+
+
+def _load_launch_sections(keys):
+    sections = {}
+    if "next_launch" in keys:
+        sections["next_launch"] = _build_launch_snapshot(_safe_fetch_launch("launches/next"))
+    if "latest_launch_detail" in keys or "latest_launch" in keys:
+        latest_launch = _safe_fetch_launch("launches/latest")
+        sections["latest_launch_detail"] = _build_launch_snapshot(latest_launch)
+        sections["latest_launch"] = _safe_launch_summary("launches/latest", launch=latest_launch)
+    return sections
+
+
+def _load_payload_sections(keys):
+    """Loader for deferred top-level keys of the spacex payload."""
+    sections = _load_launch_sections(keys)
+    single_labels = [key for key in keys if key in SINGLE_ENDPOINTS]
+    if single_labels:
+        _, single_resources, _ = _collect_remote_resources(single_labels)
+        sections.update(single_resources)
+    return sections
+
+
+def _collect_remote_resources(labels=None):
+    """
+    Fetch the requested resource overview entries (collection labels and
+    "missions" for the v3 missions sample) and single-document resources
+    (company, roadster) in one concurrent fan-out. All of them by default.
+    Returns (overview, single_resources, fetch_metrics) restricted to `labels`.
+    """
+    if labels is None:
+        labels = RESOURCE_LABELS + list(SINGLE_ENDPOINTS)
+
+    jobs = {}
+    for label in labels:
+        config = COLLECTION_ENDPOINTS.get(label) or SINGLE_ENDPOINTS.get(label)
+        if config:
+            jobs[label] = lambda endpoint=config["endpoint"]: _safe_fetch(endpoint, timeout=ENDPOINT_DEADLINE_SECONDS)
+    if "missions" in labels:
+        jobs["missions"] = lambda: _fetch_v3_missions(timeout=ENDPOINT_DEADLINE_SECONDS)
+
+    results, metrics = _fetch_concurrently(jobs)
+
+    overview = {
+        label: _summarize_collection(config, results.get(label))
+        for label, config in COLLECTION_ENDPOINTS.items()
+        if label in jobs
+    }
+    if "missions" in jobs:
+        missions = results.get("missions")
+        overview["missions"] = missions if missions else {"error": "Unable to load missions: deadline exceeded"}
+
+    single_resources = {
+        label: _summarize_single(config, results.get(label))
+        for label, config in SINGLE_ENDPOINTS.items()
+        if label in jobs
+    }
+    return overview, single_resources, metrics
+
+
+def _summarize_collection(config: dict, data) -> dict:
+    if not data:
+        return {"error": f"Unable to load {config['endpoint']}"}
+    if isinstance(data, dict):
+        data_items = [data]
+    else:
+        data_items = data
+
+    fields = config["fields"]
+    summary_items = []
+    for item in data_items[:config["limit"]]:
+        summary_items.append({field: item.get(field) for field in fields})
+
+    return {"count": len(data_items), "sample": summary_items}
+
+
+def _summarize_single(config: dict, data) -> dict:
+    if not data:
+        return {"error": f"Unable to load {config['endpoint']}"}
+    return {field: data.get(field) for field in config["fields"]}
 
 
-def _fetch_v3_missions(limit: int = 4) -> dict:
+def _fetch_v3_missions(limit: int = 4, timeout=REQUEST_TIMEOUT_SECONDS) -> dict:
     try:
-        response = requests.get(V3_MISSIONS_ENDPOINT, timeout=15)
-        response.raise_for_status()
-        missions = response.json()
+        missions = _response_cache.get_json(
+            "v3/missions",
+            lambda headers: http_client.get(V3_MISSIONS_ENDPOINT, headers=headers, timeout=timeout),
+            policy=CACHE_POLICIES["v3/missions"],
+        )
     except requests.RequestException as exc:
         msg = f"Unable to load missions: {exc}"
         print(f"⚠️ SpaceX Agent: {msg}")
@@ -415,119 +807,50 @@ def _extract_mission_name(goal_text: str) -> str:
     return None
 
 
+def _load_launch_catalog():
+    """
+    Loader for the launch catalog: every launch with payload names attached.
+    Uses a single unpaginated query when available, otherwise the upcoming and
+    past lists plus the payload collection (three requests per refresh).
+    """
+    launches = _safe_query_docs(
+        "launches",
+        {},
+        {"pagination": False, "populate": [{"path": "payloads", "select": {"name": 1}}]},
+    )
+    if launches is not None:
+        return launches, {}
+
+    launches = []
+    for endpoint in ("launches/upcoming", "launches/past"):
+        data = _fetch(endpoint)
+        launches.extend([data] if isinstance(data, dict) else data or [])
+    payloads = _safe_fetch("payloads") or []
+    payload_names = {payload.get("id"): payload.get("name", "") for payload in payloads}
+    return launches, payload_names
+
+
+_launch_catalog = LaunchCatalog(loader=_load_launch_catalog, ttl_seconds=CATALOG_TTL_SECONDS)
+
+
 def _search_mission_by_name(mission_name: str) -> dict:
     """
     Search for a specific mission by name in both upcoming and past launches.
+    Matches launch names and payload names through the local launch catalog.
     Returns the launch data if found, None otherwise.
     """
     if not mission_name:
         return None
-    
-    mission_lower = mission_name.lower()
-    
-    def _search_in_launches(launches_data):
-        """Helper to search in a list of launches"""
-        if not launches_data:
-            return None
-        
-        # Handle both list and single dict responses
-        if isinstance(launches_data, dict):
-            launches_list = [launches_data]
-        else:
-            launches_list = launches_data
-        
-        for launch in launches_list:
-            launch_name = launch.get("name", "").lower()
-            # Check launch name
-            if mission_lower in launch_name or launch_name in mission_lower:
-                return launch
-            
-            # Also check payloads - mission name might be in payload (e.g., "Orbcomm OG2")
-            payload_ids = launch.get("payloads", [])
-            if payload_ids:
-                for payload_id in payload_ids[:5]:  # Check first 5 payloads
-                    try:
-                        payload = _safe_fetch("payloads", payload_id)
-                        if payload:
-                            payload_name = payload.get("name", "").lower()
-                            # Check if mission name is in payload name
-                            if mission_lower in payload_name or payload_name in mission_lower:
-                                return launch
-                            # Also check partial match (e.g., "orbcomm" in "Orbcomm OG2 Mission 1")
-                            mission_words = mission_lower.split()
-                            for word in mission_words:
-                                if len(word) > 3 and word in payload_name:
-                                    return launch
-                    except:
-                        continue
-        return None
-    
-    # Search in upcoming launches first
-    try:
-        upcoming = _safe_fetch("launches/upcoming")
-        result = _search_in_launches(upcoming)
-        if result:
-            return result
-    except Exception as e:
-        print(f"⚠️ SpaceX Agent: Error searching upcoming launches: {e}")
-    
-    # Search in past launches
+
     try:
-        past = _safe_fetch("launches/past")
-        result = _search_in_launches(past)
-        if result:
-            return result
+        matches = _launch_catalog.search(mission_name, limit=3)
     except Exception as e:
-        print(f"⚠️ SpaceX Agent: Error searching past launches: {e}")
-    
-    # Try partial matching with each keyword separately
-    mission_keywords = mission_lower.split()
-    
-    # Try each keyword (e.g., "orbcomm" or "og2")
-    for keyword in mission_keywords:
-        if len(keyword) > 2:  # Only if it's substantial
-            try:
-                upcoming = _safe_fetch("launches/upcoming")
-                result = _search_in_launches(upcoming)
-                if result:
-                    return result
-            except:
-                pass
-            
-            try:
-                past = _safe_fetch("launches/past")
-                result = _search_in_launches(past)
-                if result:
-                    return result
-            except:
-                pass
-    
-    # Last resort: try searching with just "orbcomm" if mission contains it
-    if "orbcomm" in mission_lower:
-        try:
-            past = _safe_fetch("launches/past")
-            if isinstance(past, dict):
-                launches_list = [past]
-            else:
-                launches_list = past or []
-            # Search more thoroughly in past launches
-            for launch in launches_list:
-                launch_name = launch.get("name", "").lower()
-                # Check for variations: "orbcomm", "orbcomm og", "orbcomm-og"
-                if "orbcomm" in launch_name:
-                    # Also check payloads
-                    payload_ids = launch.get("payloads", [])
-                    if payload_ids:
-                        for payload_id in payload_ids[:5]:
-                            payload = _safe_fetch("payloads", payload_id)
-                            if payload:
-                                payload_name = payload.get("name", "").lower()
-                                if "orbcomm" in payload_name and ("og" in payload_name or "og2" in payload_name):
-                                    return launch
-                    # If launch name contains orbcomm, return it
-                    if "orbcomm" in launch_name:
-                        return launch
-        except Exception as e:
-            print(f"⚠️ SpaceX Agent: Error in Orbcomm search: {e}")
-    
-    return None
\ No newline at end of file
+        print(f"⚠️ SpaceX Agent: Error loading launch catalog: {e}")
+        return None
+
+    if not matches:
+        return None
+    if len(matches) > 1:
+        ranked = ", ".join(f"{launch.get('name')} ({score})" for launch, score in matches)
+        print(f"   Ranked matches: {ranked}")
+    return matches[0][0]
@@ -1,7 +1,8 @@
-import requests
 import os
 from datetime import datetime, timedelta
 
+from ... import http_client
+
 def run(previous_data: dict) -> dict:
     """
     Fetch latest news articles about a topic using NewsAPI
@@ -29,7 +30,7 @@ def run(previous_data: dict) -> dict:
         "pageSize": 5,  # limit number of articles to 5
     }
 
-    response = requests.get(url, params=params)
+    response = http_client.get(url, params=params)
     if response.status_code != 200:
         raise Exception(f"NewsAPI error: {response.status_code} - {response.text}")
 
@@ -1,6 +1,7 @@
-import requests
 import os
 
+from ... import http_client
+
 def run(previous_data: dict) -> dict:
     """
     Gets weather data at the launch location using coordinates from SpaceX agent
@@ -37,7 +38,7 @@ def run(previous_data: dict) -> dict:
         "appid": api_key,
         "units": "metric"  # metric for Celsius, can switch to 'imperial' for °F
     }
-    response = requests.get(url, params=params)
+    response = http_client.get(url, params=params)
     if response.status_code != 200:
         raise Exception(f"Weather API error: {response.status_code} - {response.text}")
 
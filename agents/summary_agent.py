@@ -1,5 +1,9 @@
 # summary_agent.py
 
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("goal", "spacex", "weather", "calculation", "definition", "news")
+WRITES = ("summary",)
+
 def run(data):
     """
     Generate a summary based on available data:
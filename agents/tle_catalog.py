@@ -0,0 +1,310 @@
+"""
+TLE Catalog
+Local, array-backed store of element sets for tens of thousands of objects.
+
+Element sets live in one NumPy structured array (one fixed-size record per
+object, ~130 bytes) saved as a `.npy` file and opened memory-mapped, so
+opening the full catalog costs a header read plus building the NORAD-id index
+rather than parsing text. Lookups by NORAD id are O(1) through a dense
+id -> row index; name search is a vectorized substring match.
+
+Updates are incremental: `update()` / `ingest_text()` keep, per object, the
+element set with the newest epoch. Changed rows are written in place through
+the memory map; new objects are appended by rewriting the file atomically.
+Each record also stores when it was last fetched, so refreshers can ask for
+the objects whose element sets are stale (`due_for_refresh`) instead of
+refetching everything.
+
+    python -m agents.tle_catalog ingest active.txt [--path .cache/satellite/catalog.npy]
+    python -m agents.tle_catalog search starlink
+    python -m agents.tle_catalog stats
+"""
+
+import argparse
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .orbit_propagator import ELEMENT_FIELDS, UNIX_EPOCH_JD, Propagator, parse_tle
+
+CATALOG_PATH = os.getenv(
+    "TLE_CATALOG_PATH", os.path.join(os.getenv("SATELLITE_CACHE_DIR", os.path.join(".cache", "satellite")), "catalog.npy")
+)
+# Element sets older than this (by epoch) are reported as stale
+STALE_TLE_DAYS = 7
+# Don't refetch an object more often than this, even if its element set stays old
+MIN_REFETCH_SECONDS = 6 * 3600
+NAME_LENGTH = 25
+
+RECORD_DTYPE = np.dtype(
+    [("norad_id", "<i4"), ("name", f"S{NAME_LENGTH}")]
+    + [(field, "<f8") for field in ELEMENT_FIELDS if field != "norad_id"]
+    + [("fetched_at", "<f8")]
+)
+
+
+def parse_tle_text(text: str) -> List[Dict[str, Any]]:
+    """Element dicts from two- or three-line element text (name lines optional, `0 ` prefix allowed)."""
+    lines = [line.rstrip() for line in text.splitlines() if line.strip()]
+    elements = []
+    name = None
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if line.startswith("1 ") and index + 1 < len(lines) and lines[index + 1].startswith("2 "):
+            try:
+                elements.append(parse_tle(line, lines[index + 1], name))
+            except ValueError as e:
+                print(f"⚠️ TLE Catalog: skipping malformed element set {line[2:7].strip()}: {e}")
+            name = None
+            index += 2
+            continue
+        name = line[2:] if line.startswith("0 ") else line
+        index += 1
+    return elements
+
+
+class TLECatalog:
+    """Memory-mapped element-set store with a NORAD-id index (thread-safe)."""
+
+    def __init__(self, path: Optional[str] = CATALOG_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = np.empty(0, dtype=RECORD_DTYPE)
+        self._index = np.full(1, -1, dtype=np.int64)
+        self._upper_names = None
+        if path and os.path.exists(path):
+            self._open()
+
+    def _open(self):
+        try:
+            records = np.load(self.path, mmap_mode="r+")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ TLE Catalog: could not open {self.path}: {e}")
+            return
+        if records.dtype != RECORD_DTYPE:
+            print(f"⚠️ TLE Catalog: {self.path} has an old record layout; starting empty")
+            return
+        self._set_records(records)
+
+    def _set_records(self, records: np.ndarray):
+        ids = records["norad_id"].astype(np.int64)
+        index = np.full(int(ids.max()) + 1 if len(ids) else 1, -1, dtype=np.int64)
+        index[ids] = np.arange(len(records))
+        self._records = records
+        self._index = index
+        self._upper_names = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, norad_id: int) -> bool:
+        return self._row(norad_id) >= 0
+
+    def _row(self, norad_id: int) -> int:
+        index = self._index
+        if 0 <= norad_id < len(index):
+            return int(index[norad_id])
+        return -1
+
+    def rows(self, norad_ids) -> np.ndarray:
+        """Row of each NORAD id (-1 for unknown ids)."""
+        ids = np.asarray(norad_ids, dtype=np.int64)
+        index = self._index
+        known = (ids >= 0) & (ids < len(index))
+        return np.where(known, index[np.where(known, ids, 0)], -1)
+
+    def get(self, norad_id: int) -> Optional[Dict[str, Any]]:
+        """Element dict for `norad_id` (as parse_tle returns, plus `fetched_at`), or None."""
+        with self._lock:
+            row = self._row(norad_id)
+            if row < 0:
+                return None
+            return _record_to_dict(self._records[row])
+
+    def records(self, norad_ids=None) -> np.ndarray:
+        """Copy of the records for the given ids (unknown ids skipped), or all of them."""
+        with self._lock:
+            if norad_ids is None:
+                return np.array(self._records)
+            rows = self.rows(norad_ids)
+            return np.array(self._records[rows[rows >= 0]])
+
+    def propagator(self, norad_ids=None) -> Propagator:
+        """SGP4 propagator for the given ids (or the whole catalog), in catalog order."""
+        return Propagator(self.records(norad_ids))
+
+    def search(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Objects whose name contains `query` (case-insensitive); exact names first, then newest epoch."""
+        query = query.strip().upper()
+        if not query:
+            return []
+        with self._lock:
+            rows = self._matching_rows(query)
+            if not len(rows):
+                return []
+            exact = self._upper_names[rows] == query.encode("ascii", "replace")
+            order = np.lexsort((-self._records["epoch_jd"][rows], ~exact))
+            return [
+                {"norad_id": int(record["norad_id"]), "name": record["name"].decode("ascii", "replace")}
+                for record in self._records[rows[order[:limit]]]
+            ]
+
+    def find(self, query: str) -> np.ndarray:
+        """NORAD ids of every object whose name contains `query` (case-insensitive), in catalog order."""
+        query = query.strip().upper()
+        if not query:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            return self._records["norad_id"][self._matching_rows(query)].astype(np.int64)
+
+    def _matching_rows(self, query: str) -> np.ndarray:
+        if self._upper_names is None:
+            self._upper_names = np.char.upper(self._records["name"])
+        return np.flatnonzero(np.char.find(self._upper_names, query.encode("ascii", "replace")) >= 0)
+
+    def ages_days(self, now: Optional[float] = None) -> np.ndarray:
+        """Element-set age (days since epoch) of every record, in catalog order."""
+        now = time.time() if now is None else now
+        return now / 86400.0 + UNIX_EPOCH_JD - self._records["epoch_jd"]
+
+    def stale(self, max_age_days: float = STALE_TLE_DAYS, now: Optional[float] = None) -> np.ndarray:
+        """NORAD ids whose element sets are older than `max_age_days`."""
+        with self._lock:
+            return np.array(self._records["norad_id"][self.ages_days(now) > max_age_days], dtype=np.int64)
+
+    def due_for_refresh(self, max_age_days: float = STALE_TLE_DAYS,
+                        min_refetch_seconds: float = MIN_REFETCH_SECONDS,
+                        now: Optional[float] = None) -> np.ndarray:
+        """Stale NORAD ids that were not fetched within `min_refetch_seconds`."""
+        now = time.time() if now is None else now
+        with self._lock:
+            due = (self.ages_days(now) > max_age_days) & (self._records["fetched_at"] < now - min_refetch_seconds)
+            return np.array(self._records["norad_id"][due], dtype=np.int64)
+
+    def ingest_text(self, text: str, fetched_at: Optional[float] = None) -> Dict[str, int]:
+        return self.update(parse_tle_text(text), fetched_at)
+
+    def ingest_file(self, path: str, fetched_at: Optional[float] = None) -> Dict[str, int]:
+        with open(path, encoding="ascii", errors="replace") as f:
+            return self.ingest_text(f.read(), fetched_at)
+
+    def update(self, elements: Iterable[Dict[str, Any]], fetched_at: Optional[float] = None) -> Dict[str, int]:
+        """
+        Merge element dicts into the catalog, keeping the newest epoch per object.
+        Every given object is marked as fetched at `fetched_at` (default: now).
+        Returns counts of added, updated and unchanged objects.
+        """
+        incoming = _to_records(elements, time.time() if fetched_at is None else fetched_at)
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        if not len(incoming):
+            return counts
+
+        # Newest element set per object within the batch
+        order = np.lexsort((-incoming["epoch_jd"], incoming["norad_id"]))
+        incoming = incoming[order]
+        first = np.ones(len(incoming), dtype=bool)
+        first[1:] = incoming["norad_id"][1:] != incoming["norad_id"][:-1]
+        incoming = incoming[first]
+
+        with self._lock:
+            rows = self.rows(incoming["norad_id"])
+            existing = rows >= 0
+            newer = np.zeros(len(incoming), dtype=bool)
+            newer[existing] = incoming["epoch_jd"][existing] > self._records["epoch_jd"][rows[existing]]
+            counts["added"] = int(np.count_nonzero(~existing))
+            counts["updated"] = int(np.count_nonzero(newer))
+            counts["unchanged"] = int(np.count_nonzero(existing & ~newer))
+
+            if counts["added"]:
+                records = np.array(self._records)
+                records[rows[newer]] = incoming[newer]
+                records["fetched_at"][rows[existing]] = incoming["fetched_at"][existing]
+                self._replace(np.concatenate([records, incoming[~existing]]))
+            elif existing.any():
+                # In place: only the touched rows are written back through the map
+                self._records[rows[newer]] = incoming[newer]
+                self._records["fetched_at"][rows[existing]] = incoming["fetched_at"][existing]
+                if counts["updated"]:
+                    self._upper_names = None
+                if isinstance(self._records, np.memmap):
+                    self._records.flush()
+        return counts
+
+    def _replace(self, records: np.ndarray):
+        if not self.path:
+            self._set_records(records)
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            np.save(f, records)
+        os.replace(temp_path, self.path)
+        self._records = np.empty(0, dtype=RECORD_DTYPE)
+        self._open()
+
+    def stats(self, now: Optional[float] = None) -> Dict[str, Any]:
+        with self._lock:
+            ages = self.ages_days(now)
+            return {
+                "objects": len(self._records),
+                "path": self.path,
+                "memory_mapped": isinstance(self._records, np.memmap),
+                "size_kb": round(self._records.nbytes / 1024, 1),
+                "stale": int(np.count_nonzero(ages > STALE_TLE_DAYS)),
+                "median_age_days": round(float(np.median(ages)), 2) if len(ages) else None,
+                "oldest_age_days": round(float(ages.max()), 2) if len(ages) else None,
+            }
+
+
+def _to_records(elements: Iterable[Dict[str, Any]], fetched_at: float) -> np.ndarray:
+    elements = list(elements)
+    records = np.zeros(len(elements), dtype=RECORD_DTYPE)
+    if not elements:
+        return records
+    for field in ELEMENT_FIELDS:
+        records[field] = [e[field] for e in elements]
+    records["name"] = [(e.get("name") or "").strip().encode("ascii", "replace")[:NAME_LENGTH] for e in elements]
+    records["fetched_at"] = [e.get("fetched_at", fetched_at) for e in elements]
+    return records
+
+
+def _record_to_dict(record) -> Dict[str, Any]:
+    data = {field: record[field].item() for field in ELEMENT_FIELDS}
+    data["name"] = record["name"].decode("ascii", "replace") or None
+    data["fetched_at"] = float(record["fetched_at"])
+    return data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local TLE catalog")
+    parser.add_argument("--path", default=CATALOG_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    ingest = commands.add_parser("ingest", help="merge two/three-line element files")
+    ingest.add_argument("files", nargs="+")
+    search = commands.add_parser("search", help="find objects by name")
+    search.add_argument("query")
+    commands.add_parser("stats", help="catalog size and staleness")
+    args = parser.parse_args()
+
+    catalog = TLECatalog(args.path)
+    if args.command == "ingest":
+        for path in args.files:
+            started = time.perf_counter()
+            counts = catalog.ingest_file(path)
+            print(f"📥 {path}: {counts} in {(time.perf_counter() - started) * 1000:.0f} ms")
+        print(f"🛰️ Catalog: {len(catalog)} objects in {args.path}")
+    elif args.command == "search":
+        for match in catalog.search(args.query, limit=25):
+            print(f"{match['norad_id']:>6}  {match['name']}")
+    else:
+        print(catalog.stats())
+
+
+if __name__ == "__main__":
+    main()
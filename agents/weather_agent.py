@@ -1,6 +1,15 @@
 import os
 import requests
 
+from . import http_client
+from .blackboard import LAUNCH_TOPIC
+
+# Keys read from / written to the shared data dict; run_goal schedules agents by them.
+READS = ("goal", "spacex", "latitude", "lat", "longitude", "lon", "location")
+WRITES = ("weather",)
+# May start from the launch-site partial result instead of waiting for the full snapshot.
+EARLY_INPUTS = {"spacex": LAUNCH_TOPIC}
+
 KNOWN_LOCATIONS = {
     "kennedy space center": {
         "latitude": 28.6080585,
@@ -49,7 +58,7 @@ def run(previous_data: dict) -> dict:
         "appid": api_key,
         "units": "metric"  # metric for Celsius, can switch to 'imperial' for °F
     }
-    response = requests.get(url, params=params)
+    response = http_client.get(url, params=params)
     if response.status_code != 200:
         raise Exception(f"Weather API error: {response.status_code} - {response.text}")
 
@@ -139,7 +148,7 @@ def _geocode_location(location_name: str, api_key: str):
             "limit": 1,
             "appid": api_key,
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, timeout=10)
         response.raise_for_status()
         data = response.json()
         if not data:
@@ -0,0 +1,120 @@
+"""
+Batch tracking benchmark
+Compares tracking many satellites as one SatelliteBatch (struct of arrays,
+one propagation call) with building one result dict per satellite, the way a
+loop over the single-satellite path would.
+
+    python benchmarks/batch_tracking.py [--satellites 1000 10000] [--repeat 3]
+
+Satellites are synthetic LEO element sets with recent epochs. Reported per
+size: time to propagate and build the results and the memory the results
+retain (tracemalloc), for the batch columns, its JSON-ready `to_dict()`
+form, and per-satellite dicts.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.orbit_propagator import (  # noqa: E402
+    EARTH_RADIUS_KM, UNIX_EPOCH_JD, Propagator, orbit_summary, teme_to_geodetic,
+)
+from agents.satellite_batch import SatelliteBatch  # noqa: E402
+
+
+def _catalog(count: int, now: float, seed: int = 7) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    fields = ("norad_id", "epoch_jd", "ndot", "nddot", "bstar", "inclination", "raan",
+              "eccentricity", "arg_perigee", "mean_anomaly", "mean_motion")
+    records = np.zeros(count, dtype=[("name", "S25")] + [(field, "<f8") for field in fields])
+    records["norad_id"] = 40000 + np.arange(count)
+    records["name"] = [f"SAT-{index}".encode() for index in range(count)]
+    records["epoch_jd"] = (now - rng.uniform(0, 2 * 86400, count)) / 86400.0 + UNIX_EPOCH_JD
+    records["bstar"] = rng.uniform(1e-5, 3e-4, count)
+    records["inclination"] = np.radians(rng.uniform(30, 100, count))
+    records["raan"] = rng.uniform(0, 2 * math.pi, count)
+    records["eccentricity"] = rng.uniform(0, 0.01, count)
+    records["arg_perigee"] = rng.uniform(0, 2 * math.pi, count)
+    records["mean_anomaly"] = rng.uniform(0, 2 * math.pi, count)
+    records["mean_motion"] = rng.uniform(14.5, 15.6, count) * 2 * math.pi / 1440.0
+    return records
+
+
+def per_satellite_dicts(records: np.ndarray, now: float) -> list:
+    """One propagation and one result dict per satellite."""
+    results = []
+    times = np.array([now])
+    for index in range(len(records)):
+        propagator = Propagator(records[index:index + 1])
+        r, v, errors = propagator.propagate(times)
+        lat, lon, alt = teme_to_geodetic(r[0], times)
+        speed = orbit_summary(r[0], v[0])["speed_km_s"]
+        semi_major = float(propagator.semi_major_axis_km[0])
+        eccentricity = float(propagator.ecco[0])
+        results.append({
+            "satellite_name": propagator.names[0],
+            "norad_id": int(propagator.norad_ids[0]),
+            "orbital_parameters": {
+                "inclination": round(float(np.degrees(propagator.inclo[0])), 2),
+                "eccentricity": round(eccentricity, 7),
+                "period_minutes": round(float(propagator.period_minutes[0]), 2),
+                "perigee_km": round(semi_major * (1 - eccentricity) - EARTH_RADIUS_KM, 1),
+                "apogee_km": round(semi_major * (1 + eccentricity) - EARTH_RADIUS_KM, 1),
+                "velocity_km_s": round(float(speed[0]), 3),
+            },
+            "current_position": {
+                "latitude": round(float(lat[0]), 4),
+                "longitude": round(float(lon[0]), 4),
+                "altitude_km": round(float(alt[0]), 1),
+            },
+            "tle_age_days": round((now - float(propagator.epoch_unix[0])) / 86400.0, 2),
+            "error": int(errors[0, 0]),
+        })
+    return results
+
+
+def measure(build, repeat: int) -> tuple:
+    """(best seconds, KB retained by the result) for `build()`."""
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build()
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    result = build()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, retained / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--satellites", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    now = time.time()
+    print(f"{'satellites':>10}  {'mode':<18}{'time ms':>10}{'result KB':>12}")
+    for count in args.satellites:
+        records = _catalog(count, now)
+        modes = (
+            ("batch (columns)", lambda: SatelliteBatch.from_propagator(Propagator(records), now)),
+            ("batch + to_dict", lambda: SatelliteBatch.from_propagator(Propagator(records), now).to_dict()),
+            ("per-satellite", lambda: per_satellite_dicts(records, now)),
+        )
+        for label, build in modes:
+            repeat = 1 if label == "per-satellite" else args.repeat
+            seconds, retained_kb = measure(build, repeat)
+            print(f"{count:>10}  {label:<18}{seconds * 1000:>10.1f}{retained_kb:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Context copy benchmark
+Compares the per-agent dict copies the coordinators used to make with the
+layered SharedContext, replaying the real-time scheduler's data flow without
+running any agents.
+
+    python benchmarks/context_copies.py [--tasks 8] [--keys 40] [--rounds 200]
+
+For each simulated request, every task receives the shared data plus its
+dependencies' results, its agent writes one key, and the result is merged
+back. "copies" reproduces the old flow (copy for the task, copy per merge,
+copy handed to the agent, full result kept per task); "layered" does the same
+with SharedContext overlays. Reported per request: peak memory allocated while
+it runs (tracemalloc) and time (best of five batches).
+
+The layered context trades time for memory: with the defaults it keeps about
+a third of the memory per request but takes roughly a third longer, since
+every read and write goes through Python-level layer lookups where the copies
+are single C-level dict copies. Both are microseconds against agents that
+take hundreds of milliseconds each.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_context import SharedContext, changes  # noqa: E402
+
+TIMING_REPEATS = 5
+
+
+def _payload(index: int) -> dict:
+    return {"value": index, "items": list(range(50)), "label": f"result-{index}"}
+
+
+def _initial_data(keys: int) -> dict:
+    data = {"goal": "When is the next SpaceX launch and what's the weather there?"}
+    for index in range(keys):
+        data[f"seed_{index}"] = _payload(index)
+    return data
+
+
+def _plan(tasks: int) -> list:
+    # A chain of pairs: each task depends on the one two steps back, like spacex -> weather/satellite -> summary.
+    return [{"id": f"t{i}", "depends_on": [f"t{i - 2}"] if i >= 2 else []} for i in range(tasks)]
+
+
+def _agent(data, task_id: str):
+    # Agents read the goal and write their own key, returning the data they were given.
+    data[f"agent_{task_id}"] = {"goal_length": len(data["goal"]), "items": list(range(20))}
+    return data
+
+
+def run_copies(data: dict, plan: list) -> dict:
+    shared = dict(data)
+    all_results = {}
+    for task in plan:
+        task_data = shared.copy()
+        for dep in task["depends_on"]:
+            merged = task_data.copy()
+            merged.update(all_results[dep])
+            task_data = merged
+        result = _agent(task_data.copy(), task["id"])
+        all_results[task["id"]] = result
+        merged = shared.copy()
+        merged.update(result)
+        shared = merged
+    return shared
+
+
+def run_layered(data: dict, plan: list) -> dict:
+    shared = SharedContext(data)
+    all_results = {}
+    for task in plan:
+        task_data = shared
+        for dep in task["depends_on"]:
+            task_data = task_data.with_layer(all_results[dep])
+        written = changes(_agent(task_data.overlay(), task["id"]), task_data)
+        all_results[task["id"]] = written
+        shared = shared.with_layer(written)
+    return shared.to_dict()
+
+
+def measure(runner, data: dict, plan: list, rounds: int) -> dict:
+    runner(data, plan)  # warm up
+    tracemalloc.start()
+    peaks = []
+    for _ in range(rounds):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        runner(data, plan)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    tracemalloc.stop()
+
+    elapsed = float("inf")
+    for _ in range(TIMING_REPEATS):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            runner(data, plan)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return {
+        "peak_kb": sum(peaks) / rounds / 1024,
+        "us": elapsed / rounds * 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=8)
+    parser.add_argument("--keys", type=int, default=40, help="keys already in the shared data")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    data = _initial_data(args.keys)
+    plan = _plan(args.tasks)
+    assert run_copies(data, plan) == run_layered(data, plan)
+
+    print(f"{args.tasks} tasks, {args.keys} shared keys, {args.rounds} requests")
+    print(f"{'mode':<10}{'peak KB/request':>16}{'µs/request':>12}")
+    results = {}
+    for name, runner in (("copies", run_copies), ("layered", run_layered)):
+        results[name] = measure(runner, data, plan, args.rounds)
+        stats = results[name]
+        print(f"{name:<10}{stats['peak_kb']:>16.1f}{stats['us']:>12.1f}")
+    ratio = results["copies"]["peak_kb"] / max(results["layered"]["peak_kb"], 1e-9)
+    print(f"\ncopies / layered peak memory: {ratio:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
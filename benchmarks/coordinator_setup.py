@@ -0,0 +1,84 @@
+"""
+Coordinator setup benchmark
+Compares the per-request setup cost of building a RealTimeCoordinator for
+every problem (what solve_problem_realtime() used to do) with reusing the
+shared one from get_shared_coordinator().
+
+    python benchmarks/coordinator_setup.py [--requests 500] [--agents spacex_agent weather_agent ...]
+
+Setup covers everything a request pays before the LLM breakdown: getting a
+coordinator and resolving the agent modules of a typical plan. "per call"
+builds a coordinator and loads each agent through load_agent(), as every
+request did before; "shared" takes the process-wide coordinator and its cached
+agent modules. Pass --fresh-llm to also build a new Gemini client per call
+(the cost before LLM clients were pooled). No requests are sent; when
+GOOGLE_API_KEY is unset a placeholder is used so clients can be built.
+Reported per mode: mean and p95 setup time per request.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+import agent_utils  # noqa: E402
+from agent_utils import load_agent  # noqa: E402
+from realtime_coordinator import RealTimeCoordinator, get_shared_coordinator  # noqa: E402
+
+DEFAULT_PLAN_AGENTS = ["spacex_agent", "weather_agent", "satellite_data_agent", "anomalies_detection_agent", "summary_agent"]
+
+
+def per_call_setup(agents: list, fresh_llm: bool):
+    if fresh_llm:
+        agent_utils._llm_pool.clear()
+    coordinator = RealTimeCoordinator()
+    for agent_name in agents:
+        load_agent(agent_name)
+    return coordinator
+
+
+def shared_setup(agents: list, fresh_llm: bool):
+    coordinator = get_shared_coordinator()
+    for agent_name in agents:
+        coordinator._get_agent(agent_name)
+    return coordinator
+
+
+def measure(setup, agents: list, requests: int, fresh_llm: bool) -> dict:
+    setup(agents, fresh_llm)  # warm up: imports and the first client
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        setup(agents, fresh_llm)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "mean_ms": sum(samples) / len(samples),
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--agents", nargs="+", default=DEFAULT_PLAN_AGENTS)
+    parser.add_argument("--fresh-llm", action="store_true", help="build a new Gemini client for every per-call coordinator")
+    args = parser.parse_args()
+
+    print(f"{args.requests} requests, {len(args.agents)} agents per plan")
+    print(f"{'mode':<10}{'mean ms':>10}{'p95 ms':>10}")
+    results = {}
+    for name, setup in (("per call", per_call_setup), ("shared", shared_setup)):
+        results[name] = measure(setup, args.agents, args.requests, args.fresh_llm and name == "per call")
+        stats = results[name]
+        print(f"{name:<10}{stats['mean_ms']:>10.4f}{stats['p95_ms']:>10.4f}")
+    ratio = results["per call"]["mean_ms"] / max(results["shared"]["mean_ms"], 1e-9)
+    print(f"\nper call / shared setup time: {ratio:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
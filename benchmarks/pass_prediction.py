@@ -0,0 +1,114 @@
+"""
+Pass prediction benchmark
+Times 24 h of pass predictions for a set of low-earth-orbit satellites over
+one observer, and checks the refined events against brute-force sampling.
+
+    python benchmarks/pass_prediction.py [--satellites 100] [--hours 24] [--check 5]
+
+Satellites are synthetic LEO element sets (random inclination, node and
+anomaly, 12-16 revolutions per day) with epochs at the window start; the
+observer is Kennedy Space Center. The check samples the first `--check`
+satellites every second and compares pass counts, rise/set times and
+maximum elevations with the engine's results.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.orbit_propagator import UNIX_EPOCH_JD, Propagator  # noqa: E402
+from agents.pass_prediction import (  # noqa: E402
+    DEFAULT_MIN_ELEVATION, Observer, look_angles, predict_passes,
+)
+
+KSC = (28.6080585, -80.6039558)
+
+
+def _satellites(count: int, epoch_unix: float, seed: int = 3) -> Propagator:
+    rng = np.random.default_rng(seed)
+    elements = []
+    for index in range(count):
+        elements.append({
+            "name": f"LEO-{index}",
+            "norad_id": 90000 + index,
+            "epoch_jd": epoch_unix / 86400.0 + UNIX_EPOCH_JD,
+            "ndot": 0.0,
+            "nddot": 0.0,
+            "bstar": rng.uniform(1e-5, 3e-4),
+            "inclination": math.radians(rng.uniform(30, 100)),
+            "raan": rng.uniform(0, 2 * math.pi),
+            "eccentricity": rng.uniform(0, 0.01),
+            "arg_perigee": rng.uniform(0, 2 * math.pi),
+            "mean_anomaly": rng.uniform(0, 2 * math.pi),
+            "mean_motion": rng.uniform(12, 16) * 2 * math.pi / 1440.0,
+        })
+    return Propagator(elements)
+
+
+def _unix(iso: str) -> float:
+    return datetime.fromisoformat(iso).timestamp()
+
+
+def sampling_errors(propagator: Propagator, observer: Observer, passes, start: float, hours: float,
+                    count: int) -> tuple:
+    """Pass-count mismatches and worst rise/set (s) and max-elevation (deg) errors vs 1 s sampling."""
+    fine = start + np.arange(0.0, hours * 3600.0 + 1.0, 1.0)
+    worst_time = worst_elevation = 0.0
+    mismatched = 0
+    for index in range(min(count, len(propagator))):
+        elevation, _, _ = look_angles(propagator.take([index]), observer, fine)
+        above = np.concatenate([[0], elevation[0] > DEFAULT_MIN_ELEVATION, [0]]).astype(np.int8)
+        starts = np.flatnonzero(np.diff(above) == 1)
+        ends = np.flatnonzero(np.diff(above) == -1)
+        mine = [p for p in passes if p["norad_id"] == int(propagator.norad_ids[index])]
+        if len(mine) != len(starts):
+            mismatched += 1
+            continue
+        for (first, end), predicted in zip(zip(starts, ends), mine):
+            worst_elevation = max(worst_elevation, abs(elevation[0, first:end].max() - predicted["max_elevation"]))
+            if predicted["rise_time"]:
+                worst_time = max(worst_time, abs(_unix(predicted["rise_time"]) - fine[first]))
+            if predicted["set_time"]:
+                worst_time = max(worst_time, abs(_unix(predicted["set_time"]) - fine[end - 1]))
+    return mismatched, worst_time, worst_elevation
+
+
+def check(propagator: Propagator, observer: Observer, passes, start: float, hours: float, count: int) -> bool:
+    mismatched, worst_time, worst_elevation = sampling_errors(propagator, observer, passes, start, hours, count)
+    passed = mismatched == 0 and worst_time <= 2.0 and worst_elevation <= 0.1
+    print(f"{'✅' if passed else '❌'} vs 1 s sampling of {min(count, len(propagator))} satellites: "
+          f"{mismatched} pass-count mismatches, rise/set within {worst_time:.0f} s, "
+          f"max elevation within {worst_elevation:.3f}°")
+    return passed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--satellites", type=int, default=100)
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--check", type=int, default=5)
+    args = parser.parse_args()
+
+    start = float(np.floor(time.time()))
+    propagator = _satellites(args.satellites, start)
+    observer = Observer(*KSC)
+    predict_passes(propagator.take([0]), observer, start, hours=1)  # warm-up
+
+    started = time.perf_counter()
+    passes = predict_passes(propagator, observer, start, hours=args.hours)
+    elapsed = time.perf_counter() - started
+    print(f"{len(passes)} passes for {args.satellites} satellites over {args.hours:g} h "
+          f"in {elapsed * 1000:.0f} ms")
+    ok = check(propagator, observer, passes, start, args.hours, args.check)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
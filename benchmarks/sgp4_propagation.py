@@ -0,0 +1,205 @@
+"""
+SGP4 propagation benchmark
+Checks the vectorized propagator against reference vectors, then measures
+propagations per second.
+
+    python benchmarks/sgp4_propagation.py [--satellites 1000] [--times 1440] [--repeat 3]
+
+Accuracy: the embedded vectors come from the verification run published with
+Vallado et al., "Revisiting Spacetrack Report #3" (tcppver.out): near-earth,
+deep-space with the Lyddane modification, 12 h and 24 h resonances. When the
+`sgp4` package is installed, its bundled SGP4-VER.TLE / tcppver.out are
+checked in full as well.
+
+Throughput: a catalog of `--satellites` element sets (the verification sets
+that propagate cleanly for a day, with randomised mean anomaly, node and
+epochs within the last two days, so near-earth and deep-space orbits are
+mixed) propagated over `--times` one-minute steps in one call, compared with
+propagating one satellite and one time per call.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.orbit_propagator import Propagator, parse_tle, UNIX_EPOCH_JD  # noqa: E402
+
+# (line1, line2, tsince minutes, r km, v km/s)
+REFERENCE_VECTORS = [
+    ("1 00005U 58002B   00179.78495062  .00000023  00000-0  28098-4 0  4753",
+     "2 00005  34.2682 348.7242 1859667 331.7664  19.3264 10.82419157413667",
+     0.0, (7022.46529266, -1400.08296755, 0.03995155), (1.893841015, 6.405893759, 4.534807250)),
+    ("1 00005U 58002B   00179.78495062  .00000023  00000-0  28098-4 0  4753",
+     "2 00005  34.2682 348.7242 1859667 331.7664  19.3264 10.82419157413667",
+     720.0, (-7134.59340119, 6531.68641334, 3260.27186483), (-4.113793027, -2.911922039, -2.557327851)),
+    ("1 04632U 70093B   04031.91070959 -.00000084  00000-0  10000-3 0  9955",
+     "2 04632  11.4628 273.1101 1450506 207.6000 143.9350  1.20231981 44145",
+     -5184.0, (-29020.02587128, 13819.84419063, -5713.33679183), (-1.768068390, -3.235371192, -0.395206135)),
+    ("1 09880U 77021A   06176.56157475  .00000421  00000-0  10000-3 0  9814",
+     "2 09880  64.5968 349.3786 7069051 270.0229  16.3320  2.00813614112380",
+     360.0, (328.74217398, 19554.92047380, 40558.26246145), (-1.593281066, 0.126772913, -0.359627307)),
+    ("1 28626U 05008A   06176.46683397 -.00000205  00000-0  10000-3 0  2190",
+     "2 28626   0.0019 286.9433 0000335  13.7918  55.6504  1.00270176  4891",
+     240.0, (23232.82515008, 35187.33981802, 4.98927428), (-2.565776620, 1.694193132, 0.000163365)),
+]
+
+POSITION_TOLERANCE_KM = 1e-6
+VELOCITY_TOLERANCE_KM_S = 1e-8
+
+
+def check_reference_vectors() -> bool:
+    ok = True
+    for line1, line2, tsince, r_ref, v_ref in REFERENCE_VECTORS:
+        r, v, error = Propagator.from_tles([(line1, line2)]).propagate_minutes([tsince])
+        dr = float(np.max(np.abs(r[0, 0] - r_ref)))
+        dv = float(np.max(np.abs(v[0, 0] - v_ref)))
+        passed = error[0, 0] == 0 and dr < POSITION_TOLERANCE_KM and dv < VELOCITY_TOLERANCE_KM_S
+        ok &= passed
+        print(f"{'✅' if passed else '❌'} {line1[2:7]} t={tsince:>8.1f} min  |dr|={dr:.1e} km  |dv|={dv:.1e} km/s")
+    return ok
+
+
+def _verification_files():
+    try:
+        import sgp4
+    except ImportError:
+        return None
+    directory = os.path.dirname(sgp4.__file__)
+    tle_path = os.path.join(directory, "SGP4-VER.TLE")
+    out_path = os.path.join(directory, "tcppver.out")
+    if not (os.path.exists(tle_path) and os.path.exists(out_path)):
+        return None
+    return tle_path, out_path
+
+
+def _read_verification_tles(tle_path):
+    with open(tle_path) as f:
+        lines = f.read().splitlines()
+    tles = {}
+    for first, second in zip(lines, lines[1:]):
+        if first.startswith("1 ") and second.startswith("2 "):
+            tles[int(first[2:7])] = (first, second[:69])
+    return tles
+
+
+def verification_errors():
+    """
+    (satellites, states compared, max |dr| km, max |dv| km/s) over every case
+    of the sgp4 package's verification output, or None without the package.
+    """
+    files = _verification_files()
+    if files is None:
+        return None
+    tle_path, out_path = files
+    tles = _read_verification_tles(tle_path)
+
+    cases, current = {}, None
+    with open(out_path) as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) == 2 and fields[1] == "xx":
+                current = cases.setdefault(int(fields[0]), [])
+            elif current is not None and len(fields) >= 7:
+                current.append([float(x) for x in fields[:7]])
+
+    worst_r = worst_v = 0.0
+    rows = 0
+    for norad_id, expected in cases.items():
+        expected = np.array(expected)
+        r, v, error = Propagator.from_tles([tles[norad_id]]).propagate_minutes(expected[:, 0])
+        valid = error[0] == 0
+        rows += int(valid.sum())
+        if valid.any():
+            worst_r = max(worst_r, float(np.max(np.abs(r[0][valid] - expected[valid, 1:4]))))
+            worst_v = max(worst_v, float(np.max(np.abs(v[0][valid] - expected[valid, 4:7]))))
+    return len(cases), rows, worst_r, worst_v
+
+
+def check_verification_suite() -> bool:
+    """Compare every case of the sgp4 package's verification output, when available."""
+    errors = verification_errors()
+    if errors is None:
+        print("ℹ️ sgp4 package not installed; skipping the full verification suite")
+        return True
+    satellites, rows, worst_r, worst_v = errors
+    # tcppver.out prints 8 decimals for positions and 9 for velocities
+    passed = worst_r < POSITION_TOLERANCE_KM and worst_v < VELOCITY_TOLERANCE_KM_S
+    print(f"{'✅' if passed else '❌'} verification suite: {satellites} satellites, {rows} states, "
+          f"max |dr|={worst_r:.1e} km, max |dv|={worst_v:.1e} km/s")
+    return passed
+
+
+def _catalog(count: int, epoch_jd: float, seed: int = 7) -> Propagator:
+    files = _verification_files()
+    if files:
+        base = list(_read_verification_tles(files[0]).values())
+    else:
+        base = [(line1, line2) for line1, line2, *_ in REFERENCE_VECTORS]
+    # The verification suite includes sets that decay or fail on purpose
+    _, _, error = Propagator.from_tles(base).propagate_minutes(np.arange(0.0, 1441.0, 30.0))
+    base = [tle for tle, errors in zip(base, error) if not errors.any()]
+    rng = np.random.default_rng(seed)
+    elements = []
+    for index in range(count):
+        element = parse_tle(*base[index % len(base)])
+        element["norad_id"] = index
+        element["epoch_jd"] = epoch_jd - rng.uniform(0, 2)
+        element["mean_anomaly"] = rng.uniform(0, 2 * math.pi)
+        element["raan"] = rng.uniform(0, 2 * math.pi)
+        elements.append(element)
+    return Propagator(elements)
+
+
+def measure_throughput(satellites: int, times: int, repeat: int):
+    start_unix = time.time()
+    catalog = _catalog(satellites, start_unix / 86400.0 + UNIX_EPOCH_JD)
+    offsets = np.arange(times, dtype=float)
+    unix = start_unix + offsets * 60.0
+
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        _, _, error = catalog.propagate(unix)
+        best = min(best, time.perf_counter() - started)
+    total = satellites * times
+    failed = int(np.count_nonzero((error != 0) & (error != 6)))
+    deep = int(np.count_nonzero(catalog.deep_space))
+    print(f"batch:  {satellites} satellites ({deep} deep-space) x {times} times = {total:,} states "
+          f"in {best * 1000:.1f} ms -> {total / best:,.0f} propagations/s ({failed:,} states with errors)")
+
+    single = Propagator.from_elements([{
+        "name": None, "norad_id": 0, "epoch_jd": catalog.epoch_jd[0], "ndot": 0.0, "nddot": 0.0,
+        "bstar": catalog.bstar[0], "inclination": catalog.inclo[0], "raan": catalog.nodeo[0],
+        "eccentricity": catalog.ecco[0], "arg_perigee": catalog.argpo[0],
+        "mean_anomaly": catalog.mo[0], "mean_motion": catalog.no_kozai[0],
+    }])
+    calls = min(2000, total)
+    started = time.perf_counter()
+    for offset in offsets[:calls] if calls <= times else np.resize(offsets, calls):
+        single.propagate_minutes([offset])
+    elapsed = time.perf_counter() - started
+    print(f"single: {calls:,} calls of one satellite x one time in {elapsed * 1000:.1f} ms "
+          f"-> {calls / elapsed:,.0f} propagations/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--satellites", type=int, default=1000)
+    parser.add_argument("--times", type=int, default=1440)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ok = check_reference_vectors()
+    ok &= check_verification_suite()
+    measure_throughput(args.satellites, args.times, args.repeat)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
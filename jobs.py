@@ -0,0 +1,187 @@
+"""
+Goal Jobs
+Asynchronous execution of goals on a bounded worker pool.
+
+A goal takes 15-30 seconds, which used to hold a web request thread for the
+whole run. `JobManager.submit()` queues the goal and returns a `Job` at once;
+a fixed number of workers run queued jobs in order, each capturing its own
+request log. Callers poll `get()` for status, logs and the result.
+
+Admission control: when `max_queued` jobs are already waiting, `submit()`
+raises `JobQueueFull` instead of letting the backlog grow without bound.
+Finished jobs are kept for `retention_seconds` so their results can be fetched.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from request_logs import RequestLog, capture
+
+MAX_JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+MAX_QUEUED_JOBS = int(os.getenv("JOB_QUEUE_LIMIT", "32"))
+JOB_RETENTION_SECONDS = 3600
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# runner(goal, realtime, spacex_sections) -> result dict
+GoalRunner = Callable[[str, bool, Optional[List[str]]], Dict[str, Any]]
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """One queued goal and what became of it."""
+
+    def __init__(self, goal: str, realtime: bool = False, spacex_sections: Optional[List[str]] = None):
+        self.id = uuid.uuid4().hex
+        self.goal = goal
+        self.realtime = realtime
+        self.spacex_sections = spacex_sections
+        self.status = QUEUED
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.log = RequestLog()
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def wait_ms(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.submitted_at) * 1000
+
+    @property
+    def run_ms(self) -> Optional[float]:
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at) * 1000
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "goal": self.goal,
+            "realtime": self.realtime,
+            "spacex_sections": self.spacex_sections,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_ms": round(self.wait_ms, 1) if self.wait_ms is not None else None,
+            "run_ms": round(self.run_ms, 1) if self.run_ms is not None else None,
+        }
+        if include_result:
+            data["result"] = self.result
+            data["error"] = self.error
+            data["logs"] = self.log.logs
+        return data
+
+
+class JobManager:
+    """Bounded worker pool and registry for goal jobs."""
+
+    def __init__(self, runner: GoalRunner, max_workers: int = MAX_JOB_WORKERS,
+                 max_queued: int = MAX_QUEUED_JOBS, retention_seconds: float = JOB_RETENTION_SECONDS):
+        self._runner = runner
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max(0, max_queued)
+        self.retention_seconds = retention_seconds
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="goal-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._queued = 0
+        self._running = 0
+        self._counters = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+        self._total_run_ms = 0.0
+
+    def submit(self, goal: str, realtime: bool = False, spacex_sections: Optional[List[str]] = None) -> Job:
+        job = Job(goal, realtime, spacex_sections)
+        with self._lock:
+            self._expire_finished()
+            if self._queued >= self.max_queued:
+                self._counters["rejected"] += 1
+                raise JobQueueFull(f"Job queue is full ({self._queued} jobs waiting)")
+            self._jobs[job.id] = job
+            self._queued += 1
+            self._counters["submitted"] += 1
+        self._pool.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        """1-based position among queued jobs, or None once it has started."""
+        with self._lock:
+            if job.status != QUEUED:
+                return None
+            return 1 + sum(
+                1 for other in self._jobs.values()
+                if other.status == QUEUED and other.submitted_at < job.submitted_at
+            )
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._counters["completed"] + self._counters["failed"] + self._running
+            finished = self._counters["completed"] + self._counters["failed"]
+            oldest_wait_ms = max(
+                ((time.time() - job.submitted_at) * 1000 for job in self._jobs.values() if job.status == QUEUED),
+                default=0.0
+            )
+            return {
+                **self._counters,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "workers": self.max_workers,
+                "queue_limit": self.max_queued,
+                "avg_wait_ms": round(self._total_wait_ms / started, 1) if started else 0.0,
+                "max_wait_ms": round(self._max_wait_ms, 1),
+                "oldest_queued_ms": round(oldest_wait_ms, 1),
+                "avg_run_ms": round(self._total_run_ms / finished, 1) if finished else 0.0,
+            }
+
+    def _run(self, job: Job):
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            job.status = RUNNING
+            job.started_at = time.time()
+            self._total_wait_ms += job.wait_ms
+            self._max_wait_ms = max(self._max_wait_ms, job.wait_ms)
+
+        status = COMPLETED
+        with capture(job.log):
+            try:
+                job.result = self._runner(job.goal, job.realtime, job.spacex_sections)
+            except Exception as e:
+                print(f"❌ Job {job.id} failed: {e}")
+                job.error = str(e)
+                status = FAILED
+
+        with self._lock:
+            job.finished_at = time.time()
+            job.status = status
+            self._running -= 1
+            self._counters[status] += 1
+            self._total_run_ms += job.run_ms
+
+    def _expire_finished(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
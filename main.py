@@ -1,18 +1,51 @@
 import os
+import copy
+import contextvars
+from typing import List, Optional
 from dotenv import load_dotenv
 from agents.google_adk_agent import GoogleADKCoordinator
-from agent_utils import AGENT_GETTERS, load_agent, get_gemini_response
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from agent_utils import AGENT_GETTERS, load_agent, get_gemini_response, build_agent_dependencies
+from plan_cache import PlanCache, fingerprint_goal
+from speculation import SpeculativePrefetch
+from shared_context import SharedContext, as_context, changes
+from request_logs import emit as emit_progress, AGENT_STARTED, AGENT_FINISHED, AGENT_FAILED
+from agents.singleflight import SingleFlight
+import agents.planner as planner
 
 # Import real-time coordinator
 try:
-    from realtime_coordinator import solve_problem_realtime, RealTimeCoordinator
+    from realtime_coordinator import solve_problem_realtime, RealTimeCoordinator, realtime_plan_cache
     REALTIME_AVAILABLE = True
 except (ImportError, ValueError) as e:
     REALTIME_AVAILABLE = False
+    realtime_plan_cache = None
     # Warning will be shown when real-time mode is actually requested
 
 load_dotenv()
 
+PLANNER_CACHE_PATH = os.getenv("PLANNER_CACHE_PATH", os.path.join(".cache", "planner_decisions.json"))
+PLANNER_CACHE_TTL_SECONDS = 24 * 3600
+PLANNER_CACHE_MAX_ENTRIES = 512
+MAX_PARALLEL_AGENTS = 4
+
+
+def _is_valid_sequence(sequence) -> bool:
+    return (
+        isinstance(sequence, list)
+        and bool(sequence)
+        and all(agent in AGENT_GETTERS for agent in sequence)
+    )
+
+
+# LLM agent-selection decisions, reused for repeat goals across runs.
+planner_cache = PlanCache(
+    max_entries=PLANNER_CACHE_MAX_ENTRIES,
+    ttl_seconds=PLANNER_CACHE_TTL_SECONDS,
+    path=PLANNER_CACHE_PATH,
+    validator=_is_valid_sequence,
+)
+
 def extract_agent_output(agent_name: str, current_data: dict, previous_data: dict) -> str:
     if agent_name == "spacex_agent":
         spacex_data = current_data.get("spacex", {})
@@ -134,7 +167,37 @@ def extract_agent_output(agent_name: str, current_data: dict, previous_data: dic
                 lon = current_pos.get('longitude')
                 if lat is not None and lon is not None:
                     output += f"• Current Position: Lat {lat}, Lon {lon}\n"
-            
+
+            next_pass = satellite_data.get('next_pass')
+            if next_pass and isinstance(next_pass, dict) and next_pass.get('start_time'):
+                output += (f"• Next Pass: {next_pass['start_time']}, max elevation "
+                           f"{next_pass.get('max_elevation')}°, {next_pass.get('duration_minutes')} min\n")
+
+            conjunctions = satellite_data.get('conjunctions')
+            if conjunctions and isinstance(conjunctions, dict):
+                output += (f"• Close Approaches: {conjunctions.get('count', 0)} within "
+                           f"{conjunctions.get('distance_km')} km in the next {conjunctions.get('window_hours')} h")
+                events = conjunctions.get('events') or []
+                if events:
+                    closest = events[0]
+                    output += (f" (closest: {closest['name'] or closest['norad_id']} and "
+                               f"{closest['other_name'] or closest['other_norad_id']}, "
+                               f"{closest['miss_distance_km']} km at {closest['tca']})")
+                output += "\n"
+
+            batch_summary = satellite_data.get('summary') if satellite_data.get('mode') == 'batch' else None
+            if batch_summary and isinstance(batch_summary, dict):
+                decayed = batch_summary.get('decayed')
+                output += (f"• Propagated: {batch_summary.get('propagated')} of {batch_summary.get('count')}"
+                           f"{f' ({decayed} decayed)' if decayed else ''}\n")
+                altitudes = batch_summary.get('altitude_km')
+                if altitudes:
+                    output += (f"• Altitude: {altitudes['min']}-{altitudes['max']} km "
+                               f"(median {altitudes['median']} km)\n")
+                regimes = batch_summary.get('regimes')
+                if regimes:
+                    output += f"• Orbits: {', '.join(f'{count} {regime}' for regime, count in regimes.items())}\n"
+
             # Fallback: check if data is directly in satellite_data (if nested structure is empty)
             has_orbital_data = orbital_params and isinstance(orbital_params, dict) and \
                               (orbital_params.get('altitude_km') or orbital_params.get('altitude') or 
@@ -228,9 +291,8 @@ def _generate_fallback_summary(user_goal: str, agent_outputs: dict, data: dict)
     
     return "\n".join(summary_parts)
 
-def run_goal(user_goal: str):
-    print(f"📝 Processing request: '{user_goal}'")
-
+def _plan_agent_sequence(user_goal: str, goal_key: str) -> list:
+    """Ask Gemini for the agent sequence (ADK/keyword planner as fallback); Gemini decisions are cached."""
     print("\n🧠 Step 1: Consulting Gemini for agent selection...")
 
     selection_prompt = """You are an intelligent agent coordinator for a multi-agent AI system focused on space-related queries.
@@ -269,30 +331,167 @@ Return a comma-separated list like: spacex_agent, weather_agent, summary_agent""
             sequence.append("summary_agent")
 
         print(f"🎯 Gemini selected agents: {sequence}")
+        planner_cache.put(goal_key, sequence)
     else:
         try:
             adk = GoogleADKCoordinator()
             sequence = adk.plan_agent_sequence(user_goal)
         except Exception:
-            import agents.planner as planner
             sequence = planner.plan(user_goal)
 
-    print(f"\n⚙️ Step 2: Executing {len(sequence)} agents...")
-    data = {"goal": user_goal}
-    agent_outputs = {}
+    return sequence
 
-    for i, agent_name in enumerate(sequence, 1):
-        print(f"\n🔄 [{i}/{len(sequence)}] Running {agent_name}...")
-        try:
+
+def _run_agent(index: int, sequence: list, context: SharedContext, speculation: SpeculativePrefetch = None) -> tuple:
+    """
+    Run one agent on an overlay of `context`; return (keys it wrote, display output).
+    A matching speculative run started during planning is adopted instead of re-running.
+    """
+    agent_name = sequence[index]
+    print(f"\n🔄 [{index + 1}/{len(sequence)}] Running {agent_name}...")
+    emit_progress(AGENT_STARTED, agent=agent_name, step=index + 1, total=len(sequence))
+    try:
+        speculative = speculation.take(agent_name, sequence) if speculation else None
+        result = context.overlay()
+        if speculative is not None:
+            result.update(speculative)
+        else:
             agent = load_agent(agent_name)
-            previous_data = data.copy()
-            data = agent.run(data)
-            agent_output = extract_agent_output(agent_name, data, previous_data)
-            agent_outputs[agent_name] = agent_output
-            print(f"✅ Output:\n{agent_output}")
-        except Exception as e:
-            print(f"❌ Error in {agent_name}: {e}")
-            agent_outputs[agent_name] = f"Error: {e}"
+            result = agent.run(result)
+        agent_output = extract_agent_output(agent_name, result, context)
+        print(f"✅ Output:\n{agent_output}")
+        emit_progress(AGENT_FINISHED, agent=agent_name, output=agent_output)
+        return changes(result, context), agent_output
+    except Exception as e:
+        print(f"❌ Error in {agent_name}: {e}")
+        emit_progress(AGENT_FAILED, agent=agent_name, error=str(e))
+        return {}, f"Error: {e}"
+
+
+def _run_agent_graph(sequence: list, data: dict, speculation: SpeculativePrefetch = None) -> tuple:
+    """
+    Execute the agent sequence as a dependency DAG built from each agent's
+    declared READS/WRITES. Independent agents run concurrently; an agent starts
+    once every agent it depends on has finished, and sees their results exactly
+    as it would in a sequential run. Results are merged in sequence order, so
+    the returned (data, agent_outputs) match sequential execution.
+
+    Each agent's input is the shared context with its ancestors' writes layered
+    on top, so no agent gets a full copy of the data collected so far.
+    """
+    dependencies = build_agent_dependencies(sequence)
+    ancestors = []
+    for deps in dependencies:
+        closure = set(deps)
+        for dep in deps:
+            closure |= ancestors[dep]
+        ancestors.append(closure)
+
+    roots = [sequence[index] for index, deps in enumerate(dependencies) if not deps]
+    if len(roots) > 1:
+        print(f"⚡ Independent agents running concurrently: {', '.join(roots)}")
+
+    base = as_context(data)
+    written = [None] * len(sequence)
+    outputs = [None] * len(sequence)
+    pending = set(range(len(sequence)))
+    finished = set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(MAX_PARALLEL_AGENTS, len(sequence)))) as executor:
+        while pending or running:
+            for index in sorted(pending):
+                if dependencies[index] <= finished:
+                    agent_input = base
+                    for earlier in sorted(ancestors[index]):
+                        agent_input = agent_input.with_layer(written[earlier])
+                    running[executor.submit(contextvars.copy_context().run, _run_agent, index, sequence, agent_input, speculation)] = index
+                    pending.discard(index)
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                written[index], outputs[index] = future.result()
+                finished.add(index)
+
+    agent_outputs = {}
+    for index, agent_name in enumerate(sequence):
+        base = base.with_layer(written[index])
+        agent_outputs[agent_name] = outputs[index]
+    return base.to_dict(), agent_outputs
+
+
+# Identical goals submitted while one is already running share its execution
+goal_flights = SingleFlight("goals")
+
+
+def normalize_goal(user_goal: str) -> str:
+    """Case- and whitespace-insensitive form of a goal; word order still matters."""
+    return " ".join((user_goal or "").lower().split())
+
+
+def normalize_sections(spacex_sections) -> Optional[List[str]]:
+    """
+    SpaceX sections a caller asked for, as a sorted list (None for none). They
+    come as a list or a comma-separated string. They are fetched up front, in
+    place of being left deferred in the result.
+    """
+    if not spacex_sections:
+        return None
+    if isinstance(spacex_sections, str):
+        spacex_sections = spacex_sections.split(",")
+    sections = sorted({str(section).strip().lower() for section in spacex_sections if str(section).strip()})
+    return sections or None
+
+
+def initial_data(user_goal: str, spacex_sections=None) -> dict:
+    """The data a goal's agents start from: the goal, plus any SpaceX sections asked for."""
+    data = {"goal": user_goal}
+    if spacex_sections:
+        data["spacex_sections"] = list(spacex_sections)
+    return data
+
+
+def _coalesce(mode: str, user_goal: str, execute, spacex_sections=None) -> dict:
+    """
+    Run `execute(user_goal, spacex_sections)` once for all concurrent requests with the
+    same goal, mode and requested sections.
+    Requests that joined another's run get their own top-level dict and their own
+    copy of each agent's section, so setting keys on them never leaks across requests.
+    """
+    sections = normalize_sections(spacex_sections)
+    key = (mode, normalize_goal(user_goal), tuple(sections or ()))
+    result, shared = goal_flights.do(key, lambda: execute(user_goal, sections))
+    if shared:
+        print(f"🔗 Reused the result of an identical request already in progress: '{user_goal}'")
+        return {key: copy.copy(value) if isinstance(value, dict) else value for key, value in result.items()}
+    return result
+
+
+def run_goal(user_goal: str, spacex_sections=None):
+    return _coalesce("sequential", user_goal, _execute_goal, spacex_sections)
+
+
+def _execute_goal(user_goal: str, spacex_sections=None):
+    print(f"📝 Processing request: '{user_goal}'")
+
+    goal_key = fingerprint_goal(user_goal, namespace="run_goal")
+    cached_sequence = planner_cache.get(goal_key)
+    speculation = None
+    if cached_sequence:
+        sequence = list(cached_sequence)
+        print(f"\n🧠 Step 1: Reusing cached agent selection: {sequence}")
+    else:
+        # Start the agents the keyword planner predicts while Gemini decides.
+        speculation = SpeculativePrefetch(user_goal, planner.plan(user_goal), data=initial_data(user_goal, spacex_sections))
+        sequence = _plan_agent_sequence(user_goal, goal_key)
+
+    print(f"\n⚙️ Step 2: Executing {len(sequence)} agents...")
+
+    try:
+        data, agent_outputs = _run_agent_graph(sequence, initial_data(user_goal, spacex_sections), speculation)
+    finally:
+        if speculation:
+            speculation.close()
 
     print("\n🎯 Step 3: Summarizing result with Gemini...")
 
@@ -339,7 +538,7 @@ Key Data Points:
     data["agent_sequence"] = sequence
     return data
 
-def run_goal_realtime(user_goal: str):
+def run_goal_realtime(user_goal: str, spacex_sections=None):
     """
     Run goal using real-time coordinator that breaks problems into sub-tasks
     and executes agents in parallel with solution sharing.
@@ -347,10 +546,10 @@ def run_goal_realtime(user_goal: str):
     """
     if not REALTIME_AVAILABLE:
         print("⚠️ Real-time coordinator not available, falling back to sequential execution")
-        return run_goal(user_goal)
+        return run_goal(user_goal, spacex_sections)
     
     # Space-related validation is done inside solve_problem_realtime
-    return solve_problem_realtime(user_goal)
+    return _coalesce("realtime", user_goal, solve_problem_realtime, spacex_sections)
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,143 @@
+"""
+Plan Cache
+Size-bounded LRU + TTL cache for planning decisions, optionally persisted to disk.
+
+Planning a goal costs a full Gemini round trip, yet many goals repeat
+(scheduler tasks, dashboard presets, evaluation suites). Decisions are stored
+under a normalized goal fingerprint and validated again before reuse.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+# Filler that does not change which agents a goal needs. Connectives such as
+# "and", "then", "to" or "for" are kept: they carry the order and relation of
+# the parts of a goal.
+FINGERPRINT_STOPWORDS = {
+    "a", "an", "the", "please", "me", "my", "can", "could", "you", "would",
+    "what", "whats", "is", "are", "tell", "show", "give", "i", "want", "know", "s",
+}
+
+# Bumped whenever the canonical form changes, so keys persisted under the
+# old form are never matched by a different goal.
+FINGERPRINT_VERSION = 2
+
+
+def fingerprint_goal(goal: str, namespace: str = "") -> str:
+    """
+    Normalize a goal into a stable cache key: lowercase words without
+    punctuation or filler words, kept in order and with repeats, then hashed.
+    "What's the next SpaceX launch?" and "next spacex launch" share a key;
+    "weather then satellites" and "satellites then weather" do not.
+    """
+    words = re.findall(r"[a-z0-9]+", (goal or "").lower())
+    tokens = [word for word in words if word not in FINGERPRINT_STOPWORDS]
+    canonical = f"v{FINGERPRINT_VERSION}|{namespace}|{' '.join(tokens)}"
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+class PlanCache:
+    """Thread-safe LRU cache with per-entry TTL, validation and hit-rate metrics."""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: int = 86400,
+        path: Optional[str] = None,
+        validator: Optional[Callable[[Any], bool]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self._validator = validator
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "expired": 0, "invalid": 0, "evictions": 0}
+        self._load()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            if time.time() - entry["stored_at"] > self.ttl_seconds:
+                del self._entries[key]
+                self._counters["expired"] += 1
+                self._counters["misses"] += 1
+                return None
+            if self._validator and not self._is_valid(entry["value"]):
+                del self._entries[key]
+                self._counters["invalid"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return entry["value"]
+
+    def put(self, key: str, value: Any):
+        if self._validator and not self._is_valid(value):
+            return
+        with self._lock:
+            self._entries[key] = {"value": value, "stored_at": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+            snapshot = list(self._entries.items())
+        self._save(snapshot)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._save([])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        return counters
+
+    def _is_valid(self, value: Any) -> bool:
+        try:
+            return bool(self._validator(value))
+        except Exception:
+            return False
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                stored = json.load(handle)
+        except (OSError, ValueError) as exc:
+            print(f"⚠️ Plan Cache: ignoring unreadable cache file {self.path}: {exc}")
+            return
+        now = time.time()
+        for key, entry in stored.get("entries", []):
+            if now - entry.get("stored_at", 0) <= self.ttl_seconds:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self, snapshot):
+        if not self.path:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as handle:
+                json.dump({"entries": snapshot}, handle)
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            print(f"⚠️ Plan Cache: could not persist {self.path}: {exc}")
@@ -5,13 +5,24 @@ with real-time solution sharing between agents.
 """
 
 import os
+import contextvars
+import copy
+import hashlib
+import json
 import time
 import threading
-from typing import Dict, List, Any, Callable, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue
+from collections.abc import Mapping
+from typing import Dict, List, Any, Callable, Optional, Tuple
+from concurrent.futures import Future, InvalidStateError, wait, FIRST_COMPLETED
 from dotenv import load_dotenv
 
+from agents.blackboard import Blackboard, ALL_TOPICS, use_blackboard
+from agents.cancellation import CancellationToken, current_token, use_token, check as check_cancelled
+from plan_cache import PlanCache, fingerprint_goal
+from shared_context import SharedContext, as_context, changes
+from task_pool import TaskPool
+from request_logs import emit as emit_progress, AGENT_STARTED, AGENT_FINISHED, AGENT_FAILED
+
 try:
     from langchain_google_genai import ChatGoogleGenerativeAI
     from langchain_core.messages import HumanMessage, SystemMessage
@@ -21,17 +32,212 @@ except ImportError:
     print("⚠️ langchain_google_genai not available. Real-time coordinator requires this package.")
 
 try:
-    from agent_utils import AGENT_GETTERS, load_agent, get_gemini_response
+    from agent_utils import AGENT_GETTERS, load_agent, get_gemini_response, get_llm, get_agent_io, get_agent_early_inputs
     from agents.google_adk_agent import GoogleADKCoordinator
+    from speculation import SpeculativePrefetch
 except ImportError as e:
     print(f"⚠️ Import error: {e}")
     AGENT_GETTERS = {}
     load_agent = None
     get_gemini_response = None
+    get_llm = None
+    get_agent_io = None
+    get_agent_early_inputs = None
     GoogleADKCoordinator = None
+    SpeculativePrefetch = None
 
 load_dotenv()
 
+# Agent calls one real-time run may have in flight at once. Every run gets its
+# own lane of this size in the shared task pool, so runs cannot starve each other.
+MAX_TASK_WORKERS = 8
+# Per-task deadline unless the plan sets "timeout_seconds"; every task is also
+# bounded by the deadline of the whole query.
+DEFAULT_TASK_TIMEOUT_SECONDS = 60
+QUERY_DEADLINE_SECONDS = 120
+
+REALTIME_PLAN_CACHE_PATH = os.getenv("REALTIME_PLAN_CACHE_PATH", os.path.join(".cache", "realtime_plans.json"))
+REALTIME_PLAN_CACHE_TTL_SECONDS = 24 * 3600
+REALTIME_PLAN_CACHE_MAX_ENTRIES = 256
+
+_task_pool = None
+_task_pool_lock = threading.Lock()
+
+
+def _get_task_pool() -> TaskPool:
+    global _task_pool
+    with _task_pool_lock:
+        if _task_pool is None:
+            _task_pool = TaskPool(thread_name_prefix="realtime-task")
+        return _task_pool
+
+
+def validate_plan(plan: Any) -> bool:
+    """
+    Schema check for a sub-task plan: unique task ids, known agents, and
+    `depends_on` / `parallel_groups` that only reference existing tasks
+    without forming a cycle.
+    """
+    if not isinstance(plan, dict) or plan.get("error"):
+        return False
+    sub_tasks = plan.get("sub_tasks")
+    if not isinstance(sub_tasks, list) or not sub_tasks:
+        return False
+
+    dependencies = {}
+    for task in sub_tasks:
+        if not isinstance(task, dict) or not isinstance(task.get("id"), str) or task["id"] in dependencies:
+            return False
+        agents = task.get("agents")
+        if not isinstance(agents, list) or not agents or not all(agent in AGENT_GETTERS for agent in agents):
+            return False
+        depends_on = task.get("depends_on", [])
+        if not isinstance(depends_on, list):
+            return False
+        timeout = task.get("timeout_seconds")
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            return False
+        dependencies[task["id"]] = set(depends_on)
+
+    if any(not deps <= dependencies.keys() for deps in dependencies.values()):
+        return False
+    groups = plan.get("parallel_groups", [])
+    if not isinstance(groups, list) or any(not isinstance(group, list) or not set(group) <= dependencies.keys() for group in groups):
+        return False
+
+    # Kahn's algorithm: every task must become ready eventually
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [task_id for task_id, deps in remaining.items() if not deps & remaining.keys()]
+        if not ready:
+            return False
+        for task_id in ready:
+            del remaining[task_id]
+    return True
+
+
+def _task_timeout(task: Dict[str, Any]) -> float:
+    """The plan's "timeout_seconds" for a task, clamped to the execution deadline."""
+    try:
+        timeout = float(task.get("timeout_seconds") or DEFAULT_TASK_TIMEOUT_SECONDS)
+    except (TypeError, ValueError):
+        timeout = DEFAULT_TASK_TIMEOUT_SECONDS
+    return min(max(timeout, 1.0), QUERY_DEADLINE_SECONDS)
+
+
+class TaskGraph:
+    """
+    Execution DAG compiled from a plan: task lookup, dependency sets, task
+    deadlines, the agents involved and which dependencies a task may skip
+    waiting for by starting from blackboard partials. Compiled once per distinct plan.
+    """
+    
+    def __init__(self, sub_tasks: List[Dict[str, Any]]):
+        self.sub_tasks = sub_tasks
+        self.task_map = {task["id"]: task for task in sub_tasks}
+        self.dependencies = {
+            task_id: frozenset(dep for dep in task.get("depends_on", []) if dep in self.task_map and dep != task_id)
+            for task_id, task in self.task_map.items()
+        }
+        self.timeouts = {task_id: _task_timeout(task) for task_id, task in self.task_map.items()}
+        self.plan_agents = [agent for task in sub_tasks for agent in task.get("agents", [])]
+        self.early_topics = {task_id: self._early_topics(task_id) for task_id in self.task_map}
+    
+    def _early_topics(self, task_id: str) -> Dict[str, Dict[str, str]]:
+        """
+        {dep_id: {key: topic}} for each dependency whose outputs read by this
+        task's agents can all be taken from a blackboard topic (the agents'
+        EARLY_INPUTS), so the task may start once those topics are published.
+        """
+        agents = self.task_map[task_id].get("agents", [])
+        try:
+            early_inputs = [get_agent_early_inputs(agent) for agent in agents]
+            reads = set().union(*(get_agent_io(agent)[0] for agent in agents)) if agents else set()
+        except (TypeError, ValueError):
+            return {}
+        if not agents or not all(early_inputs):
+            return {}
+        
+        early = {}
+        for dep_id in self.dependencies[task_id]:
+            topics = {}
+            try:
+                writes = set().union(*(get_agent_io(agent)[1] for agent in self.task_map[dep_id].get("agents", [])))
+            except (TypeError, ValueError):
+                continue
+            needed = writes if "*" in writes or "*" in reads else writes & reads
+            for key in needed:
+                candidates = {inputs.get(key) for inputs in early_inputs}
+                if len(candidates) != 1 or None in candidates:
+                    topics = {}
+                    break
+                topics[key] = candidates.pop()
+            if topics:
+                early[dep_id] = topics
+        return early
+
+
+def _plan_digest(sub_tasks: List[Dict[str, Any]]) -> str:
+    return hashlib.sha1(json.dumps(sub_tasks, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+# Validated LLM breakdowns, reused for structurally identical problems across runs.
+realtime_plan_cache = PlanCache(
+    max_entries=REALTIME_PLAN_CACHE_MAX_ENTRIES,
+    ttl_seconds=REALTIME_PLAN_CACHE_TTL_SECONDS,
+    path=REALTIME_PLAN_CACHE_PATH,
+    validator=validate_plan,
+)
+
+# Compiled task graphs keyed by plan content (in memory only).
+_compiled_graphs = PlanCache(
+    max_entries=REALTIME_PLAN_CACHE_MAX_ENTRIES,
+    ttl_seconds=REALTIME_PLAN_CACHE_TTL_SECONDS,
+)
+
+
+def compile_task_graph(sub_tasks: List[Dict[str, Any]]) -> TaskGraph:
+    """The TaskGraph for `sub_tasks`, reusing a previously compiled one for the same plan."""
+    digest = _plan_digest(sub_tasks)
+    graph = _compiled_graphs.get(digest)
+    if graph is None:
+        graph = TaskGraph(sub_tasks)
+        _compiled_graphs.put(digest, graph)
+    return graph
+
+
+class ExecutionContext:
+    """
+    Mutable state of one problem being solved: agent status, real-time updates,
+    the blackboard agents share results on and the speculative runs started for it.
+    """
+    
+    def __init__(self, problem: str, speculation=None, spacex_sections: Optional[List[str]] = None):
+        self.problem = problem
+        self.speculation = speculation
+        # The data agents start from: the goal plus any SpaceX sections the caller asked for
+        self.initial_data: Dict[str, Any] = {"goal": problem}
+        if spacex_sections:
+            self.initial_data["spacex_sections"] = list(spacex_sections)
+        self.plan_agents: List[str] = []
+        self.blackboard = Blackboard()  # Partial and final results shared between agents
+        self.agent_status: Dict[str, str] = {}  # Track agent status
+        self.realtime_updates: List[Dict[str, Any]] = []  # Store real-time updates
+        self._lock = threading.Lock()
+    
+    def set_status(self, agent_name: str, status: str):
+        with self._lock:
+            self.agent_status[agent_name] = status
+    
+    def add_update(self, update: Dict[str, Any]):
+        with self._lock:
+            self.realtime_updates.append(update)
+    
+    def snapshot(self) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+        """Copies of (agent_status, realtime_updates) that late agent threads cannot change."""
+        with self._lock:
+            return dict(self.agent_status), list(self.realtime_updates)
+
 
 class RealTimeCoordinator:
     """
@@ -40,6 +246,10 @@ class RealTimeCoordinator:
     2. Assigns agents to sub-tasks
     3. Runs agents in parallel where possible
     4. Shares solutions between agents in real-time
+    
+    The coordinator only holds shareable pieces (LLM client, loaded agent
+    modules, worker pool). Everything specific to one problem lives in an
+    ExecutionContext, so a single coordinator can solve concurrent problems.
     """
     
     def __init__(self):
@@ -50,15 +260,10 @@ class RealTimeCoordinator:
         if not self.api_key:
             raise ValueError("GOOGLE_API_KEY not found in environment")
         
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash",
-            google_api_key=self.api_key,
-            temperature=0.7,
-            max_tokens=2000
-        )
-        self.solution_queue = Queue()  # Shared solution queue for agents
-        self.agent_status = {}  # Track agent status
-        self.realtime_updates = []  # Store real-time updates
+        self.llm = get_llm(temperature=0.7, max_tokens=2000)
+        self.pool = _get_task_pool()
+        self._agents = {}  # Loaded agent modules, shared by all requests
+        self._agents_lock = threading.Lock()
         
         # Space-related keywords for query validation
         self.space_keywords = [
@@ -70,6 +275,13 @@ class RealTimeCoordinator:
             "trajectory", "orbital", "reentry", "landing", "booster", "stage"
         ]
         
+    def _get_agent(self, agent_name: str):
+        with self._agents_lock:
+            agent = self._agents.get(agent_name)
+            if agent is None:
+                agent = self._agents[agent_name] = load_agent(agent_name)
+            return agent
+    
     def is_space_related(self, problem: str) -> bool:
         """Check if the query is space-related"""
         problem_lower = problem.lower()
@@ -97,6 +309,12 @@ class RealTimeCoordinator:
                 "error": "Query is not space-related. Please ask about SpaceX, rockets, launches, missions, or space-related topics."
             }
         
+        plan_key = fingerprint_goal(problem, namespace="realtime_plan")
+        cached_plan = realtime_plan_cache.get(plan_key)
+        if cached_plan:
+            print(f"\n🧠 Reusing cached breakdown ({len(cached_plan['sub_tasks'])} sub-tasks)")
+            return copy.deepcopy(cached_plan)
+        
         print(f"\n🧠 Analyzing space-related problem: '{problem}'")
         print("📋 Breaking down into sub-tasks...")
         
@@ -150,7 +368,8 @@ Return your response in this JSON format:
       "agents": ["agent_name"],
       "depends_on": [],  // List of task IDs this depends on
       "can_parallel": true,  // Can run in parallel with other tasks
-      "data_needs": ["key1", "key2"]  // What data this task needs from previous tasks
+      "data_needs": ["key1", "key2"],  // What data this task needs from previous tasks
+      "timeout_seconds": 30  // Optional: how long this task may take before it is cancelled
     }
   ],
   "execution_order": ["task_1", "task_2"],  // Suggested execution order
@@ -169,13 +388,14 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
             response_text = response.content.strip()
             
             # Try to extract JSON from response
-            import json
             import re
             
             # Find JSON in the response
             json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
             if json_match:
                 plan = json.loads(json_match.group())
+                if validate_plan(plan):
+                    realtime_plan_cache.put(plan_key, copy.deepcopy(plan))
             else:
                 # Fallback: create a simple plan
                 plan = self._create_fallback_plan(problem)
@@ -276,14 +496,16 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
             "parallel_groups": [[t["id"] for t in sub_tasks[:-1]]] if len(sub_tasks) > 1 else []
         }
     
-    def prepare_agent_data(self, agent_name: str, shared_data: Dict[str, Any], data_needs: List[str]) -> Dict[str, Any]:
-        """Prepare data for a specific agent based on what it needs"""
+    def prepare_agent_data(self, agent_name: str, shared_data: Mapping, data_needs: List[str]) -> SharedContext:
+        """Prepare data for a specific agent based on what it needs; agents needing everything share `shared_data` as is"""
         agent_data = {"goal": shared_data.get("goal", "")}
         
         # Distribute relevant data to each agent
         if agent_name == "spacex_agent":
-            # SpaceX agent needs goal only
+            # SpaceX agent needs the goal and the sections the caller asked for
             agent_data["goal"] = shared_data.get("goal", "")
+            if "spacex_sections" in shared_data:
+                agent_data["spacex_sections"] = shared_data.get("spacex_sections")
             
         elif agent_name == "weather_agent":
             # Weather agent needs coordinates from SpaceX
@@ -326,40 +548,55 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
         
         elif agent_name == "anomalies_detection_agent":
             # Anomalies detection needs ALL data from other agents
-            agent_data = shared_data.copy()
+            return as_context(shared_data)
                 
         elif agent_name == "summary_agent":
             # Summary agent gets ALL data
-            agent_data = shared_data.copy()
+            return as_context(shared_data)
         else:
             # Default: give all data
-            agent_data = shared_data.copy()
+            return as_context(shared_data)
         
-        return agent_data
+        return SharedContext(agent_data)
     
-    def execute_agent(self, agent_name: str, data: Dict[str, Any], task_id: str, data_needs: List[str] = None) -> Dict[str, Any]:
-        """Execute a single agent and return updated data with improved error handling"""
+    def execute_agent(self, ctx: ExecutionContext, agent_name: str, data: Mapping, task_id: str,
+                      data_needs: List[str] = None) -> Dict[str, Any]:
+        """
+        Execute a single agent on an overlay of `data` and return the keys it wrote.
+        If the request's speculative runs hold an adoptable run of this agent, its result is used instead.
+        """
         if data_needs is None:
             data_needs = []
             
         try:
             print(f"  🔄 [{task_id}] Executing {agent_name}...")
-            self.agent_status[agent_name] = "running"
+            ctx.set_status(agent_name, "running")
+            emit_progress(AGENT_STARTED, agent=agent_name, task_id=task_id)
             
             # Prepare agent-specific data
             agent_data = self.prepare_agent_data(agent_name, data, data_needs)
+            view = agent_data.overlay()
+            
+            token = current_token()
+            wait_limit = token.remaining() if token else None
+            speculation = ctx.speculation
+            speculative = speculation.take(agent_name, ctx.plan_agents, timeout=wait_limit) if speculation else None
+            if speculative is not None:
+                view.update(speculative)
+                return self._complete_agent(ctx, agent_name, task_id, view.writes)
             
             # Validate agent exists
             if not load_agent:
                 raise ValueError("Agent loader not available")
             
-            agent = load_agent(agent_name)
+            agent = self._get_agent(agent_name)
             if not agent:
                 raise ValueError(f"Agent {agent_name} not found")
             
             # Execute agent with proper error handling
+            check_cancelled()
             try:
-                result_data = agent.run(agent_data.copy())
+                result_data = agent.run(view)
             except AttributeError as e:
                 # Handle case where agent.run doesn't exist or has wrong signature
                 if "run" not in dir(agent):
@@ -370,57 +607,62 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
                 raise Exception(f"Agent {agent_name} execution error: {str(e)}")
             
             # Validate result
-            if not isinstance(result_data, dict):
+            if not isinstance(result_data, Mapping):
                 raise ValueError(f"Agent {agent_name} returned invalid data type: {type(result_data)}")
             
-            # Share solution with other agents via queue
-            solution_update = {
-                "agent": agent_name,
-                "task_id": task_id,
-                "data": result_data,
-                "timestamp": time.time()
-            }
-            self.solution_queue.put(solution_update)
-            
-            # Add real-time update
-            self.realtime_updates.append({
-                "agent": agent_name,
-                "status": "completed",
-                "task_id": task_id,
-                "timestamp": time.time()
-            })
-            
-            self.agent_status[agent_name] = "completed"
-            print(f"  ✅ [{task_id}] {agent_name} completed")
-            
-            return result_data
+            return self._complete_agent(ctx, agent_name, task_id, changes(result_data, agent_data))
             
         except Exception as e:
+            token = current_token()
+            if token is not None and token.cancelled:
+                # The scheduler has already recorded this task as timed out
+                print(f"  ⏱️ [{task_id}] {agent_name} stopped: {token.reason}")
+                return {}
             error_msg = str(e)
             print(f"  ❌ [{task_id}] {agent_name} failed: {error_msg}")
-            self.agent_status[agent_name] = "failed"
-            self.realtime_updates.append({
+            ctx.set_status(agent_name, "failed")
+            emit_progress(AGENT_FAILED, agent=agent_name, task_id=task_id, error=error_msg)
+            ctx.add_update({
                 "agent": agent_name,
                 "status": "failed",
                 "task_id": task_id,
                 "error": error_msg,
                 "timestamp": time.time()
             })
-            # Return original data on error (don't break the chain)
-            return data
+            # Write nothing on error (don't break the chain)
+            return {}
+    
+    def _execute_with_token(self, token: CancellationToken, ctx: ExecutionContext, *args) -> Dict[str, Any]:
+        """Run `execute_agent` with `token` as the current cancellation token and the request's blackboard."""
+        with use_token(token), use_blackboard(ctx.blackboard):
+            return self.execute_agent(ctx, *args)
     
-    def merge_agent_results(self, base_data: Dict[str, Any], new_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Merge results from multiple agents"""
-        merged = base_data.copy()
+    def _complete_agent(self, ctx: ExecutionContext, agent_name: str, task_id: str, result_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Share a finished agent's result and record its completion"""
+        # Share solution with other agents via the blackboard
+        ctx.blackboard.publish(f"{agent_name}.result", result_data, publisher=agent_name)
         
-        # Merge all keys from new_data
-        for key, value in new_data.items():
-            if key != "goal":  # Don't overwrite the original goal
-                merged[key] = value
+        # Add real-time update
+        ctx.add_update({
+            "agent": agent_name,
+            "status": "completed",
+            "task_id": task_id,
+            "timestamp": time.time()
+        })
         
-        return merged
+        ctx.set_status(agent_name, "completed")
+        print(f"  ✅ [{task_id}] {agent_name} completed")
+        emit_progress(AGENT_FINISHED, agent=agent_name, task_id=task_id, writes=result_data)
+        
+        return result_data
+    
+    def merge_agent_results(self, base_data: Mapping, new_data: Mapping) -> SharedContext:
+        """Merge results from multiple agents as a new layer; `base_data` is left untouched"""
+        # Merge all keys from new_data
+        updates = {key: value for key, value in new_data.items() if key != "goal"}  # Don't overwrite the original goal
+        return as_context(base_data).with_layer(updates)
     
-    def solve_problem_realtime(self, problem: str) -> Dict[str, Any]:
+    def solve_problem_realtime(self, problem: str, spacex_sections: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Main method to solve a problem in real-time:
         1. Validate space-related query
@@ -428,6 +670,7 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
         3. Execute agents (parallel where possible)
         4. Share solutions between agents
         5. Return final result
+        `spacex_sections` names SpaceX sections to fetch up front instead of leaving them deferred.
         """
         print("\n" + "=" * 60)
         print("🚀 REAL-TIME MULTI-AGENT SPACE PROBLEM SOLVING")
@@ -445,7 +688,21 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
                 "realtime_updates": []
             }
         
-        # Step 1: Break down problem
+        # Step 1: Break down problem, speculatively starting the agents the
+        # keyword fallback plan predicts while the LLM breakdown is in flight
+        ctx = ExecutionContext(problem, spacex_sections=spacex_sections)
+        if SpeculativePrefetch:
+            predicted = [agent for task in self._create_fallback_plan(problem)["sub_tasks"] for agent in task["agents"]]
+            ctx.speculation = SpeculativePrefetch(problem, predicted, data=ctx.initial_data)
+        try:
+            return self._solve_with_plan(ctx)
+        finally:
+            if ctx.speculation:
+                ctx.speculation.close()
+    
+    def _solve_with_plan(self, ctx: ExecutionContext) -> Dict[str, Any]:
+        """Plan the problem and execute it, adopting matching speculative agent runs"""
+        problem = ctx.problem
         plan = self.break_down_problem(problem)
         
         # Check if plan has error
@@ -459,176 +716,310 @@ Be specific and thorough. Consider all aspects of the SPACE-RELATED problem."""
             }
         
         # Step 2: Initialize shared data structure
-        shared_data = {"goal": problem}
-        all_results = {}
+        shared_data = SharedContext(ctx.initial_data)
         
-        # Step 3: Execute tasks based on dependencies and parallelism
+        # Step 3: Execute each task as soon as its own dependencies have completed
         print(f"\n⚙️ Executing {len(plan['sub_tasks'])} sub-tasks...")
+        graph = compile_task_graph(plan["sub_tasks"])
+        ctx.plan_agents = graph.plan_agents
+        shared_data, schedule_metrics = self._run_task_graph(ctx, graph, shared_data)
         
-        # Group tasks by dependency level
-        task_map = {task["id"]: task for task in plan["sub_tasks"]}
-        completed_tasks = set()
-        
-        # Execute tasks in waves (parallel within wave, sequential between waves)
-        execution_waves = self._organize_execution_waves(plan["sub_tasks"])
-        
-        for wave_num, wave_tasks in enumerate(execution_waves, 1):
-            print(f"\n🌊 Wave {wave_num}: Executing {len(wave_tasks)} tasks in parallel...")
-            
-            # Execute tasks in this wave in parallel
-            with ThreadPoolExecutor(max_workers=len(wave_tasks)) as executor:
-                futures = {}
-                
-                for task in wave_tasks:
-                    task_id = task["id"]
-                    agents = task["agents"]
-                    
-                    # Prepare data with results from dependent tasks
-                    task_data = shared_data.copy()
-                    for dep_id in task.get("depends_on", []):
-                        if dep_id in all_results:
-                            task_data = self.merge_agent_results(task_data, all_results[dep_id])
-                    
-                    # Get data needs for this task
-                    data_needs = task.get("data_needs", [])
-                    
-                    # Execute all agents for this task
-                    for agent_name in agents:
-                        future = executor.submit(
-                            self.execute_agent, 
-                            agent_name, 
-                            task_data, 
-                            task_id,
-                            data_needs
-                        )
-                        futures[future] = (task_id, agent_name)
-                
-                # Collect results as they complete (with timeout)
-                try:
-                    for future in as_completed(futures, timeout=120):  # 2 minute total timeout per wave
-                        task_id, agent_name = futures[future]
-                        try:
-                            result = future.result()  # Get the result
-                            if task_id not in all_results:
-                                all_results[task_id] = {}
-                            all_results[task_id] = self.merge_agent_results(
-                                all_results.get(task_id, {}), result
-                            )
-                            # Update shared data
-                            shared_data = self.merge_agent_results(shared_data, result)
-                        except Exception as e:
-                            error_msg = f"Task {task_id} failed: {str(e)}"
-                            print(f"  ❌ {error_msg}")
-                            # Continue with other tasks even if one fails
-                            self.realtime_updates.append({
-                                "task_id": task_id,
-                                "status": "failed",
-                                "error": error_msg,
-                                "timestamp": time.time()
-                            })
-                except TimeoutError:
-                    print(f"  ⏱️ Wave {wave_num} timed out after 120 seconds")
-                    # Mark remaining tasks as timed out
-                    for future, (task_id, agent_name) in futures.items():
-                        if not future.done():
-                            self.realtime_updates.append({
-                                "task_id": task_id,
-                                "agent": agent_name,
-                                "status": "timeout",
-                                "error": "Task timed out",
-                                "timestamp": time.time()
-                            })
-            
-            # Mark tasks as completed
-            for task in wave_tasks:
-                completed_tasks.add(task["id"])
-        
-        # Step 4: Process any solutions shared via queue
-        print("\n📬 Processing shared solutions between agents...")
-        while not self.solution_queue.empty():
-            solution = self.solution_queue.get()
-            print(f"  📨 Solution from {solution['agent']} received")
-            shared_data = self.merge_agent_results(shared_data, solution["data"])
+        # Step 4: Report what agents shared on the blackboard while running
+        blackboard_events = ctx.blackboard.events()
+        print(f"\n📬 {len(blackboard_events)} results shared between agents:")
+        for event in blackboard_events:
+            print(f"  📨 {event['topic']} from {event['publisher']} at {event['elapsed_ms']:.0f} ms")
         
         # Step 5: Generate final summary if not already done
         if "summary" not in shared_data or not shared_data.get("summary"):
             print("\n📝 Generating final summary...")
             try:
                 if load_agent:
-                    summary_agent = load_agent("summary_agent")
+                    summary_agent = self._get_agent("summary_agent")
                     if summary_agent:
-                        shared_data = summary_agent.run(shared_data)
+                        shared_data = shared_data.with_layer(changes(summary_agent.run(shared_data.overlay()), shared_data))
                     else:
-                        shared_data["summary"] = "Summary agent not available. Data collected successfully."
+                        shared_data = shared_data.with_layer({"summary": "Summary agent not available. Data collected successfully."})
                 else:
-                    shared_data["summary"] = "Summary agent not available. Data collected successfully."
+                    shared_data = shared_data.with_layer({"summary": "Summary agent not available. Data collected successfully."})
             except Exception as e:
                 error_msg = f"Summary generation failed: {str(e)}"
                 print(f"⚠️ {error_msg}")
                 # Create a basic summary from available data
                 if "spacex" in shared_data or "weather" in shared_data:
-                    shared_data["summary"] = f"Space mission data collected. {error_msg}"
+                    shared_data = shared_data.with_layer({"summary": f"Space mission data collected. {error_msg}"})
                 else:
-                    shared_data["summary"] = f"Data collection completed with errors: {error_msg}"
+                    shared_data = shared_data.with_layer({"summary": f"Data collection completed with errors: {error_msg}"})
         
         # Step 6: Compile final result
+        agent_status, realtime_updates = ctx.snapshot()
         final_result = {
             **shared_data,
-            "realtime_updates": self.realtime_updates,
+            "realtime_updates": realtime_updates,
             "execution_plan": plan,
-            "agent_status": self.agent_status.copy()
+            "schedule_metrics": schedule_metrics,
+            "blackboard_events": blackboard_events,
+            "agent_status": agent_status
         }
         
         print("\n" + "=" * 60)
         print("✅ PROBLEM SOLVED IN REAL-TIME")
         print("=" * 60)
-        print(f"📊 Agents executed: {len(set(self.agent_status.keys()))}")
-        print(f"🔄 Real-time updates: {len(self.realtime_updates)}")
+        print(f"📊 Agents executed: {len(agent_status)}")
+        print(f"🔄 Real-time updates: {len(realtime_updates)}")
         print(f"⏱️ Total tasks: {len(plan['sub_tasks'])}")
         
         return final_result
     
-    def _organize_execution_waves(self, sub_tasks: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    def _run_task_graph(self, ctx: ExecutionContext, graph: TaskGraph,
+                        shared_data: SharedContext) -> Tuple[SharedContext, Dict[str, Any]]:
         """
-        Organize tasks into execution waves based on dependencies.
-        Tasks in the same wave can run in parallel.
+        Event-driven execution of the sub-task DAG in this run's lane of the shared
+        task pool (at most MAX_TASK_WORKERS agent calls at once).
+        A task is dispatched as soon as every task in its `depends_on` has finished,
+        so a slow task only delays its own dependents. Each task runs under its own
+        cancellation token with the plan's deadline; when it expires the token is
+        cancelled and the task's calls are abandoned without waiting for their
+        threads, which the pool replaces so other runs keep their capacity.
+        A task whose unfinished dependencies are covered by blackboard partials
+        (see TaskGraph.early_topics) starts as soon as those topics are published.
+        Returns (shared_data, schedule_metrics).
         """
-        task_map = {task["id"]: task for task in sub_tasks}
-        waves = []
-        completed = set()
-        
-        while len(completed) < len(sub_tasks):
-            # Find tasks that can run now (all dependencies completed)
-            ready_tasks = []
-            for task in sub_tasks:
-                if task["id"] in completed:
+        task_map = graph.task_map
+        dependencies = graph.dependencies
+        all_results = {}
+        pending = list(task_map)
+        finished = set()
+        running = {}
+        outstanding = {}
+        started_at = {}
+        durations = {}
+        tokens = {}
+        timed_out = []
+        early_started = {}
+        partial_inputs_by_task = {}
+        query_token = CancellationToken(QUERY_DEADLINE_SECONDS)
+        schedule_start = time.perf_counter()
+        
+        # Wake the scheduler whenever something is published, so tasks waiting
+        # on partial results start without waiting for another task to finish.
+        board = ctx.blackboard
+        wake = [Future()]
+        
+        def _on_publish(topic, value):
+            try:
+                wake[0].set_result(topic)
+            except InvalidStateError:
+                pass
+        
+        if any(graph.early_topics.values()):
+            board.subscribe(ALL_TOPICS, _on_publish)
+        
+        with self.pool.lane(min(MAX_TASK_WORKERS, max(1, len(graph.plan_agents)))) as lane:
+            while pending or running:
+                ready = [task_id for task_id in pending if dependencies[task_id] <= finished]
+                if not ready and not running:
+                    print(f"  ⚠️ Unresolvable dependencies for {', '.join(pending)}; running them anyway")
+                    ready = list(pending)
+                partial_inputs = {}
+                for task_id in pending:
+                    if task_id not in ready:
+                        inputs = self._partial_inputs(graph, task_id, finished, board)
+                        if inputs:
+                            partial_inputs[task_id] = inputs
+                            ready.append(task_id)
+                
+                for task_id in ready:
+                    pending.remove(task_id)
+                    task = task_map[task_id]
+                    
+                    # Prepare data with results from dependent tasks
+                    task_data = shared_data
+                    for dep_id in task.get("depends_on", []):
+                        if dep_id in all_results:
+                            task_data = self.merge_agent_results(task_data, all_results[dep_id])
+                    if task_id in partial_inputs:
+                        topics = sorted(set(partial_inputs[task_id].values()))
+                        print(f"  ⚡ [{task_id}] Starting early on partial result {', '.join(topics)}")
+                        early_started[task_id] = topics
+                        partial_inputs_by_task[task_id] = partial_inputs[task_id]
+                        task_data = task_data.with_layer({
+                            key: board.get(topic) for key, topic in partial_inputs[task_id].items() if key not in task_data
+                        })
+                    
+                    agents = task.get("agents", [])
+                    started_at[task_id] = time.perf_counter()
+                    if query_token.cancelled and agents:
+                        print(f"  ⏭️ [{task_id}] Skipped: execution deadline of {QUERY_DEADLINE_SECONDS}s exceeded")
+                        self._record_timeout(ctx, task_id, agents, "Skipped: execution deadline exceeded")
+                        timed_out.append(task_id)
+                        agents = []
+                    if not agents:
+                        durations[task_id] = 0.0
+                        finished.add(task_id)
+                        continue
+                    
+                    print(f"  ▶️ [{task_id}] Dispatching {', '.join(agents)}")
+                    outstanding[task_id] = len(agents)
+                    tokens[task_id] = CancellationToken(graph.timeouts[task_id], parent=query_token)
+                    for agent_name in agents:
+                        future = lane.submit(
+                            contextvars.copy_context().run,
+                            self._execute_with_token,
+                            tokens[task_id],
+                            ctx,
+                            agent_name,
+                            task_data,
+                            task_id,
+                            task.get("data_needs", [])
+                        )
+                        running[future] = (task_id, agent_name)
+                
+                if not running:
                     continue
                 
-                deps = task.get("depends_on", [])
-                if all(dep_id in completed for dep_id in deps):
-                    ready_tasks.append(task)
-            
-            if not ready_tasks:
-                # If no ready tasks, force remaining tasks (shouldn't happen)
-                remaining = [t for t in sub_tasks if t["id"] not in completed]
-                if remaining:
-                    waves.append(remaining)
-                    completed.update(t["id"] for t in remaining)
-                break
+                running_tasks = {task_id for task_id, _ in running.values()}
+                next_deadline = min(tokens[task_id].remaining() for task_id in running_tasks)
+                waiting_on_partials = any(graph.early_topics[task_id] for task_id in pending)
+                done, _ = wait(
+                    list(running) + ([wake[0]] if waiting_on_partials else []),
+                    timeout=next_deadline,
+                    return_when=FIRST_COMPLETED
+                )
+                if wake[0] in done:
+                    done.discard(wake[0])
+                    wake[0] = Future()
+                
+                for future in done:
+                    task_id, agent_name = running.pop(future)
+                    try:
+                        result = future.result()
+                        if task_id in early_started:
+                            # Don't let the partial inputs it was started with overwrite full results
+                            result = {key: value for key, value in result.items() if key not in partial_inputs_by_task[task_id]}
+                        all_results[task_id] = self.merge_agent_results(all_results.get(task_id, {}), result)
+                        # Update shared data
+                        shared_data = self.merge_agent_results(shared_data, result)
+                    except Exception as e:
+                        error_msg = f"Task {task_id} failed: {str(e)}"
+                        print(f"  ❌ {error_msg}")
+                        # Continue with other tasks even if one fails
+                        ctx.add_update({
+                            "task_id": task_id,
+                            "status": "failed",
+                            "error": error_msg,
+                            "timestamp": time.time()
+                        })
+                    outstanding[task_id] -= 1
+                    if outstanding[task_id] == 0:
+                        durations[task_id] = (time.perf_counter() - started_at[task_id]) * 1000
+                        finished.add(task_id)
+                
+                # Give up on tasks past their deadline; their threads stop at the next
+                # cancellation check or HTTP timeout, and late results are ignored.
+                for task_id in sorted({task_id for task_id, _ in running.values()}):
+                    token = tokens[task_id]
+                    if not token.cancelled:
+                        continue
+                    expired = [future for future, (owner, _) in running.items() if owner == task_id]
+                    print(f"  ⏱️ [{task_id}] Cancelled: {token.reason}")
+                    self._record_timeout(ctx, task_id, [running[future][1] for future in expired], f"Task cancelled: {token.reason}")
+                    for future in expired:
+                        running.pop(future)
+                        lane.abandon(future)
+                    durations[task_id] = (time.perf_counter() - started_at[task_id]) * 1000
+                    timed_out.append(task_id)
+                    finished.add(task_id)
             
-            waves.append(ready_tasks)
-            completed.update(t["id"] for t in ready_tasks)
+        wall_time_ms = (time.perf_counter() - schedule_start) * 1000
+        critical_path_ms, critical_path = self._critical_path(dependencies, durations)
+        schedule_metrics = {
+            "wall_time_ms": round(wall_time_ms, 1),
+            "critical_path_ms": round(critical_path_ms, 1),
+            "critical_path": critical_path,
+            "task_durations_ms": {task_id: round(ms, 1) for task_id, ms in durations.items()},
+            "timed_out": timed_out,
+            "early_started": early_started,
+        }
+        print(f"\n📈 Critical path {critical_path_ms:.0f} ms ({' → '.join(critical_path) or 'empty'}), "
+              f"wall time {wall_time_ms:.0f} ms")
+        return shared_data, schedule_metrics
+    
+    @staticmethod
+    def _partial_inputs(graph: TaskGraph, task_id: str, finished: set, board: Blackboard) -> Dict[str, str]:
+        """
+        {key: topic} to start `task_id` early from, if every unfinished dependency
+        is covered by blackboard topics that have already been published; else {}.
+        """
+        unfinished = graph.dependencies[task_id] - finished
+        early = graph.early_topics[task_id]
+        if not unfinished or not all(dep_id in early for dep_id in unfinished):
+            return {}
+        inputs = {}
+        for dep_id in unfinished:
+            for key, topic in early[dep_id].items():
+                if not board.has(topic):
+                    return {}
+                inputs[key] = topic
+        return inputs
+    
+    def _record_timeout(self, ctx: ExecutionContext, task_id: str, agents: List[str], error: str):
+        for agent_name in agents:
+            ctx.set_status(agent_name, "timeout")
+            emit_progress(AGENT_FAILED, agent=agent_name, task_id=task_id, error=error)
+            ctx.add_update({
+                "task_id": task_id,
+                "agent": agent_name,
+                "status": "timeout",
+                "error": error,
+                "timestamp": time.time()
+            })
+    
+    @staticmethod
+    def _critical_path(dependencies: Dict[str, set], durations: Dict[str, float]) -> Tuple[float, List[str]]:
+        """Longest duration-weighted chain through the dependency graph."""
+        longest = {}
+        
+        def visit(task_id: str, path: tuple) -> Tuple[float, List[str]]:
+            if task_id in longest:
+                return longest[task_id]
+            best = (0.0, [])
+            for dep in dependencies[task_id]:
+                if dep in path:
+                    continue  # ignore cycles in malformed plans
+                candidate = visit(dep, path + (task_id,))
+                if candidate[0] > best[0]:
+                    best = candidate
+            longest[task_id] = (best[0] + durations.get(task_id, 0.0), best[1] + [task_id])
+            return longest[task_id]
         
-        return waves
+        return max((visit(task_id, ()) for task_id in dependencies), default=(0.0, []), key=lambda item: item[0])
+
+_shared_coordinator = None
+_shared_coordinator_lock = threading.Lock()
+
+
+def get_shared_coordinator() -> RealTimeCoordinator:
+    """The process-wide coordinator, created on first use."""
+    global _shared_coordinator
+    with _shared_coordinator_lock:
+        if _shared_coordinator is None:
+            _shared_coordinator = RealTimeCoordinator()
+        return _shared_coordinator
 
 
-def solve_problem_realtime(problem: str) -> Dict[str, Any]:
+def solve_problem_realtime(problem: str, spacex_sections: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Convenience function to solve a problem in real-time.
     This is the main entry point for real-time problem solving.
+    All calls share one coordinator; per-request state lives in an ExecutionContext.
     """
-    coordinator = RealTimeCoordinator()
-    return coordinator.solve_problem_realtime(problem)
+    setup_start = time.perf_counter()
+    coordinator = get_shared_coordinator()
+    setup_ms = (time.perf_counter() - setup_start) * 1000
+    result = coordinator.solve_problem_realtime(problem, spacex_sections)
+    result["setup_ms"] = round(setup_ms, 3)
+    return result
 
 
 if __name__ == "__main__":
@@ -0,0 +1,143 @@
+"""
+Request Logs
+Per-request capture of the workflow's printed output.
+
+The agents report progress with print(). The web interface used to swap
+sys.stdout for one global buffer around each run, so concurrent requests
+overwrote each other's streams. Instead, `install()` replaces sys.stdout and
+sys.stderr once with streams that route each write to the log in the current
+context (see `capture()`), or to the real stream when there is none.
+
+Worker threads don't inherit context variables, so the coordinators submit
+work through `contextvars.copy_context().run` to keep agent output in the
+request that started it.
+
+Besides printed lines, coordinators `emit()` structured progress events
+(agent started/finished/failed). Events are not kept in the log; they only go
+to its subscribers, such as the web interface's streaming endpoint.
+"""
+
+import contextvars
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# Entries kept per request; older ones are dropped.
+MAX_LOG_ENTRIES = 100
+
+# Progress events emitted by the coordinators
+AGENT_STARTED = "agent_started"
+AGENT_FINISHED = "agent_finished"
+AGENT_FAILED = "agent_failed"
+
+Subscriber = Callable[[Dict[str, Any]], None]
+
+
+class RequestLog:
+    """Timestamped log lines written during one request (file-like, thread-safe)."""
+
+    def __init__(self, max_entries: int = MAX_LOG_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: List[Dict[str, str]] = []
+        self._subscribers: List[Subscriber] = []
+        self._lock = threading.Lock()
+
+    def write(self, text: str) -> int:
+        if text.strip():
+            entry = {
+                'timestamp': time.strftime('%H:%M:%S'),
+                'message': text.strip(),
+                'type': 'output'
+            }
+            with self._lock:
+                self._entries.append(entry)
+                if len(self._entries) > self.max_entries:
+                    del self._entries[:-self.max_entries]
+            self._notify(entry)
+        return len(text)
+
+    def emit(self, event_type: str, **fields):
+        """Send a structured event to subscribers (not kept in `logs`)."""
+        self._notify({'timestamp': time.strftime('%H:%M:%S'), 'type': event_type, **fields})
+
+    def subscribe(self, callback: Subscriber):
+        """Call `callback(entry)` for every later log line and event."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def _notify(self, entry: Dict[str, Any]):
+        with self._lock:
+            callbacks = list(self._subscribers)
+        for callback in callbacks:
+            try:
+                callback(entry)
+            except Exception:
+                pass
+
+    def flush(self):
+        pass
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def logs(self) -> List[Dict[str, str]]:
+        with self._lock:
+            return list(self._entries)
+
+
+_current_log: contextvars.ContextVar = contextvars.ContextVar("request_log", default=None)
+
+
+def current_log() -> Optional[RequestLog]:
+    return _current_log.get()
+
+
+@contextmanager
+def capture(log: RequestLog):
+    """Send everything printed in this context (and work submitted from it) to `log`."""
+    reset = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(reset)
+
+
+def emit(event_type: str, **fields) -> bool:
+    """Emit a progress event on the current request's log, if any."""
+    log = _current_log.get()
+    if log is None:
+        return False
+    log.emit(event_type, **fields)
+    return True
+
+
+class _RoutingStream:
+    """Stand-in for sys.stdout/sys.stderr that writes to the current request's log."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        log = _current_log.get()
+        if log is not None:
+            return log.write(text)
+        return self._stream.write(text)
+
+    def flush(self):
+        if _current_log.get() is None:
+            self._stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+def install():
+    """Route sys.stdout and sys.stderr through the per-request logs (idempotent)."""
+    if not isinstance(sys.stdout, _RoutingStream):
+        sys.stdout = _RoutingStream(sys.stdout)
+    if not isinstance(sys.stderr, _RoutingStream):
+        sys.stderr = _RoutingStream(sys.stderr)
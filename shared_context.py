@@ -0,0 +1,136 @@
+"""
+Shared Context
+Immutable, layered view of the data agents share, with structural sharing.
+
+Coordinators used to hand every agent its own `dict.copy()` of everything
+collected so far, and merged results by copying again. A `SharedContext` is
+instead a stack of read-only layers: adding an agent's results pushes one
+small layer and reuses all the others, so a snapshot is just the current
+context object.
+
+Agents still receive something that behaves like a mutable dict: `overlay()`
+returns a `ContextOverlay` (a ChainMap) whose writes land in a fresh top
+layer, leaving the shared layers untouched. `changes()` then tells a
+coordinator which keys an agent actually wrote.
+
+The trade-off is time for memory: a lookup walks the layers in Python where a
+copied dict answers in C, so a request spends a little longer in the context
+(roughly a third longer in `benchmarks/context_copies.py`) while keeping
+about a third of the memory.
+"""
+
+from collections import ChainMap
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Above this many layers, lookups walk too far; the layers are flattened into one.
+MAX_LAYERS = 16
+
+
+class SharedContext(Mapping):
+    """Read-only mapping made of stacked layers; newer layers shadow older ones."""
+
+    __slots__ = ("_layers", "_flat")
+
+    def __init__(self, data: Optional[Mapping] = None, _layers: Tuple[Mapping, ...] = None):
+        if _layers is None:
+            _layers = (MappingProxyType(dict(data or {})),)
+        self._layers = _layers
+        self._flat = _layers[0] if len(_layers) == 1 else None
+
+    def with_layer(self, updates: Mapping) -> "SharedContext":
+        """A new context with `updates` on top; this context is unchanged."""
+        if not updates:
+            return self
+        layers = (MappingProxyType(dict(updates)),) + self._layers
+        if len(layers) > MAX_LAYERS:
+            layers = (MappingProxyType(_flatten(layers)),)
+        return SharedContext(_layers=layers)
+
+    def overlay(self) -> "ContextOverlay":
+        """A mutable view for one agent: reads fall through, writes stay in the overlay."""
+        return ContextOverlay({}, *self._layers)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self._flat) if self._flat is not None else _flatten(self._layers)
+
+    @property
+    def depth(self) -> int:
+        return len(self._layers)
+
+    def _view(self) -> Mapping:
+        """
+        The layers merged into one read-only mapping for iteration, len() and
+        to_dict(), built on first use and kept for the life of this context.
+        """
+        if self._flat is None:
+            self._flat = MappingProxyType(_flatten(self._layers))
+        return self._flat
+
+    def __getitem__(self, key):
+        if self._flat is not None:
+            return self._flat[key]
+        for layer in self._layers:
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        if self._flat is not None:
+            return key in self._flat
+        return any(key in layer for layer in self._layers)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._view())
+
+    def __len__(self) -> int:
+        return len(self._view())
+
+    def __repr__(self) -> str:
+        return f"SharedContext(depth={len(self._layers)}, keys={list(self)})"
+
+
+def _flatten(layers: Tuple[Mapping, ...]) -> Dict[str, Any]:
+    merged = {}
+    for layer in reversed(layers):
+        merged.update(layer)
+    return merged
+
+
+class ContextOverlay(ChainMap):
+    """ChainMap handed to an agent; `writes` holds the keys the agent set."""
+
+    # ChainMap looks keys up with try/except per layer, raising a KeyError in
+    # every layer above the one that holds the key; membership tests are cheaper.
+    def __getitem__(self, key):
+        for mapping in self.maps:
+            if key in mapping:
+                return mapping[key]
+        return self.__missing__(key)
+
+    def get(self, key, default=None):
+        for mapping in self.maps:
+            if key in mapping:
+                return mapping[key]
+        return default
+
+    @property
+    def writes(self) -> Dict[str, Any]:
+        return self.maps[0]
+
+
+def as_context(data: Mapping) -> SharedContext:
+    return data if isinstance(data, SharedContext) else SharedContext(data)
+
+
+def changes(result: Mapping, base: Mapping) -> Dict[str, Any]:
+    """
+    Keys an agent wrote: the overlay's own layer, or, for agents that return
+    some other mapping, every key that is new or no longer the same object.
+    """
+    if isinstance(result, ContextOverlay):
+        return dict(result.writes)
+    if result is base or not isinstance(result, Mapping):
+        return {}
+    return {key: value for key, value in result.items() if key not in base or base[key] is not value}
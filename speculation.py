@@ -0,0 +1,161 @@
+"""
+Speculative Agent Prefetch
+Starts cheap, side-effect-free agents while the LLM plan is still in flight.
+
+The keyword planners (`agents/planner.plan`, `_create_fallback_plan`) predict
+likely agents instantly. Agents that declare `SPECULATIVE = True` and are
+predicted are started right away on the goal alone. Once the real plan
+arrives, a speculative result is adopted only if the plan contains the agent
+and no other agent in the plan writes a key it reads, so its input is the
+same as in the real run. Otherwise the result is discarded. Hit and waste
+rates are recorded in `speculation_stats`.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+from agent_utils import load_agent, get_agent_io, ALL_KEYS
+
+SPECULATION_ENABLED = os.getenv("SPECULATIVE_PREFETCH", "1") != "0"
+MAX_SPECULATIVE_WORKERS = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+class SpeculationStats:
+    """Thread-safe counters for speculative runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"started": 0, "adopted": 0, "wasted": 0, "failed": 0}
+        self._saved_ms = 0.0
+        self._wasted_ms = 0.0
+
+    def record(self, counter: str, elapsed_ms: float = 0.0):
+        with self._lock:
+            self._counters[counter] += 1
+            if counter == "adopted":
+                self._saved_ms += elapsed_ms
+            elif counter in ("wasted", "failed"):
+                self._wasted_ms += elapsed_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = dict(self._counters)
+            counters["saved_ms"] = round(self._saved_ms, 1)
+            counters["wasted_ms"] = round(self._wasted_ms, 1)
+        started = counters["started"]
+        counters["hit_rate"] = round(counters["adopted"] / started, 3) if started else 0.0
+        counters["waste_rate"] = round(counters["wasted"] / started, 3) if started else 0.0
+        return counters
+
+
+speculation_stats = SpeculationStats()
+
+
+def is_speculative(agent_name: str) -> bool:
+    try:
+        return bool(getattr(load_agent(agent_name), "SPECULATIVE", False))
+    except ValueError:
+        return False
+
+
+def can_adopt(agent_name: str, plan_agents: List[str]) -> bool:
+    """True if no other agent in the plan writes a key this agent reads."""
+    reads, _ = get_agent_io(agent_name)
+    if ALL_KEYS in reads:
+        return False
+    for other in plan_agents:
+        if other == agent_name:
+            continue
+        _, writes = get_agent_io(other)
+        if ALL_KEYS in writes or reads & writes:
+            return False
+    return True
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_SPECULATIVE_WORKERS, thread_name_prefix="speculative")
+        return _pool
+
+
+class SpeculativePrefetch:
+    """Speculative runs for one goal, started while the LLM plan is in flight."""
+
+    def __init__(self, goal: str, predicted_agents: List[str], stats: SpeculationStats = speculation_stats,
+                 data: Optional[Dict[str, Any]] = None):
+        self._stats = stats
+        # What the real run starts from: the goal plus any options such as spacex_sections
+        self._base_data = dict(data) if data else {"goal": goal}
+        self._runs = {}
+        self._lock = threading.Lock()
+        if not SPECULATION_ENABLED:
+            return
+
+        for agent_name in dict.fromkeys(predicted_agents or []):
+            if is_speculative(agent_name):
+                self._runs[agent_name] = _get_pool().submit(contextvars.copy_context().run, self._run, agent_name)
+                self._stats.record("started")
+        if self._runs:
+            print(f"🔮 Speculatively starting: {', '.join(self._runs)}")
+
+    def take(self, agent_name: str, plan_agents: List[str], timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Claim the speculative result for `agent_name` if it can be adopted.
+        Waits up to `timeout` seconds for the run to finish and returns the keys
+        the agent wrote, or None if there is nothing usable (the caller then runs
+        the agent itself).
+        """
+        with self._lock:
+            future = self._runs.get(agent_name)
+            if future is None or not can_adopt(agent_name, plan_agents):
+                return None
+            del self._runs[agent_name]
+
+        try:
+            written, elapsed_ms, error = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.add_done_callback(self._discard)
+            print(f"🔮 Speculative {agent_name} did not finish in time; running it normally")
+            return None
+        if error is not None:
+            self._stats.record("failed", elapsed_ms)
+            print(f"🔮 Speculative {agent_name} failed ({error}); running it normally")
+            return None
+        self._stats.record("adopted", elapsed_ms)
+        print(f"🔮 Adopted speculative result for {agent_name} ({elapsed_ms:.0f} ms saved from the critical path)")
+        return written
+
+    def close(self):
+        """Discard every speculative run that was not adopted, without waiting for it."""
+        with self._lock:
+            leftovers = list(self._runs.items())
+            self._runs.clear()
+        for agent_name, future in leftovers:
+            if future.cancel():
+                self._stats.record("wasted")
+                continue
+            future.add_done_callback(self._discard)
+            print(f"🔮 Discarding speculative result for {agent_name} (not in the final plan)")
+
+    def _discard(self, future):
+        _, elapsed_ms, _ = future.result()
+        self._stats.record("wasted", elapsed_ms)
+
+    def _run(self, agent_name: str):
+        started = time.perf_counter()
+        data = dict(self._base_data)
+        try:
+            result = load_agent(agent_name).run(data)
+            written = {key: value for key, value in result.items() if key not in self._base_data}
+            return written, (time.perf_counter() - started) * 1000, None
+        except Exception as exc:
+            return {}, (time.perf_counter() - started) * 1000, exc
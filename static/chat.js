@@ -210,7 +210,7 @@ class ChatInterface {
         });
     }
 
-    async sendMessage() {
+    sendMessage() {
         const input = document.getElementById('chat-input');
         const message = input.value.trim();
         
@@ -224,34 +224,58 @@ class ChatInterface {
         // Show typing indicator
         this.showTyping();
 
-        try {
-            // Send to backend
-            const response = await fetch('/api/chat', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    message: message,
-                    agent: this.currentAgent
-                })
-            });
-
-            const data = await response.json();
-            
-            // Hide typing indicator
+        // Stream the run from the backend instead of waiting for the whole goal
+        const params = new URLSearchParams({ goal: message });
+        const source = new EventSource(`/api/run_goal/stream?${params}`);
+        const finish = () => {
+            source.close();
             this.hideTyping();
+        };
+
+        source.addEventListener('agent_started', (event) => {
+            const update = JSON.parse(event.data);
+            this.updateAgentStatus(this.agentKey(update.agent), 'busy');
+        });
 
-            if (data.success) {
-                this.processAgentResponse(data);
-            } else {
-                this.addMessage(`Error: ${data.error}`, 'system');
+        source.addEventListener('agent_finished', (event) => {
+            const update = JSON.parse(event.data);
+            const agentKey = this.agentKey(update.agent);
+            this.updateAgentStatus(agentKey, 'online');
+            if (update.output) {
+                this.addMessage(update.output, 'agent', this.agents[agentKey] ? agentKey : null);
             }
-        } catch (error) {
-            this.hideTyping();
-            this.addMessage(`Network error: ${error.message}`, 'system');
-        }
-   }
+        });
+
+        source.addEventListener('agent_failed', (event) => {
+            const update = JSON.parse(event.data);
+            this.updateAgentStatus(this.agentKey(update.agent), 'online');
+            this.addMessage(`${update.agent} failed: ${update.error}`, 'system');
+        });
+
+        source.addEventListener('done', (event) => {
+            const data = JSON.parse(event.data);
+            finish();
+            this.processAgentResponse({
+                workflow_logs: data.workflow_logs,
+                result: {
+                    summary: data.result.summary,
+                    raw_data: data.result
+                }
+            });
+        });
+
+        source.addEventListener('error', (event) => {
+            // Server-sent `error` events carry data; connection errors don't
+            const data = event.data ? JSON.parse(event.data) : null;
+            finish();
+            this.addMessage(data ? `Error: ${data.error}` : 'Network error: connection to the server was lost', 'system');
+        });
+    }
+
+    agentKey(agentName) {
+        // Progress events name modules ("spacex_agent"); the sidebar uses "spacex"
+        return (agentName || '').replace(/_agent$/, '');
+    }
 
     sendQuickMessage(message) {
         document.getElementById('chat-input').value = message;
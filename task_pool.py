@@ -0,0 +1,198 @@
+"""
+Task Pool
+Worker threads for real-time task graphs, shared by every request.
+
+Each request runs its agents through its own `Lane`, which lets at most
+`limit` of its calls run at once and queues the rest, so one request's
+tasks never wait behind another's. The pool keeps threads for the limits of
+every open lane, and reuses idle ones across requests.
+
+When a task misses its deadline, the scheduler abandons its futures. A call
+that has not started is cancelled. A running call cannot be stopped: its
+thread stays busy until the call returns, at its next cancellation check
+or HTTP timeout. The pool counts such threads as abandoned and starts
+replacements, up to MAX_ABANDONED_WORKERS, so hung agents do not use up
+capacity other requests need. Past that cap, new calls wait for a thread to
+come back.
+"""
+
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict
+
+# Replacement threads started for calls that were abandoned but are still running
+MAX_ABANDONED_WORKERS = 32
+# Threads left idle this long exit; busy periods reuse the ones still waiting
+IDLE_WORKER_SECONDS = 60.0
+
+
+class TaskPool:
+    """Elastic thread pool sized by its open lanes plus its abandoned calls (thread-safe)."""
+
+    def __init__(self, max_abandoned: int = MAX_ABANDONED_WORKERS, idle_seconds: float = IDLE_WORKER_SECONDS,
+                 thread_name_prefix: str = "task-pool"):
+        self.max_abandoned = max_abandoned
+        self.idle_seconds = idle_seconds
+        self.thread_name_prefix = thread_name_prefix
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self._queued = 0
+        self._threads = 0
+        self._idle = 0
+        self._reserved = 0
+        self._abandoned = set()
+        self._started = 0
+
+    def lane(self, limit: int) -> "Lane":
+        """A lane running at most `limit` calls at once; the pool grows by `limit` threads until it is closed."""
+        limit = max(1, int(limit))
+        with self._lock:
+            self._reserved += limit
+        return Lane(self, limit)
+
+    def abandon(self, future: Future) -> bool:
+        """
+        Stop waiting for `future`: cancel it if it has not started, otherwise
+        count its thread as abandoned and start a replacement if work is
+        waiting. Returns True if the call was still running.
+        """
+        if future.cancel() or future.done():
+            return False
+        with self._lock:
+            if future.done():
+                return False
+            self._abandoned.add(future)
+            if len(self._abandoned) > self.max_abandoned:
+                print(f"⚠️ Task pool: {len(self._abandoned)} abandoned calls still running; "
+                      f"not replacing more than {self.max_abandoned}")
+            self._spawn()
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "threads": self._threads,
+                "idle": self._idle,
+                "queued": self._queued,
+                "abandoned": len(self._abandoned),
+                "capacity": self._capacity(),
+            }
+
+    def _capacity(self) -> int:
+        return self._reserved + min(len(self._abandoned), self.max_abandoned)
+
+    def _release(self, limit: int):
+        with self._lock:
+            self._reserved -= limit
+
+    def _submit(self, future: Future, fn: Callable, args: tuple):
+        with self._lock:
+            self._queue.put((future, fn, args))
+            self._queued += 1
+            self._spawn()
+
+    def _spawn(self):
+        # Lock held: start threads until every queued call has an idle one, within capacity
+        while self._queued > self._idle and self._threads < self._capacity():
+            self._threads += 1
+            self._idle += 1
+            self._started += 1
+            threading.Thread(target=self._work, name=f"{self.thread_name_prefix}-{self._started}", daemon=True).start()
+
+    def _work(self):
+        while True:
+            try:
+                future, fn, args = self._queue.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                with self._lock:
+                    # Stay if leaving would strand a call queued since the timeout
+                    if self._queued < self._idle:
+                        self._threads -= 1
+                        self._idle -= 1
+                        return
+                continue
+            with self._lock:
+                self._queued -= 1
+                self._idle -= 1
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self._lock:
+                abandoned = future in self._abandoned
+                self._abandoned.discard(future)
+                if abandoned and self._threads > self._capacity():
+                    # A replacement took this thread's place while it was abandoned
+                    self._threads -= 1
+                    return
+                self._idle += 1
+
+
+class Lane:
+    """One request's share of a TaskPool: at most `limit` of its calls run at once, the rest wait in order."""
+
+    def __init__(self, pool: TaskPool, limit: int):
+        self.pool = pool
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._running = set()
+        self._backlog = deque()
+        self._closed = False
+
+    def submit(self, fn: Callable, *args: Any) -> Future:
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Lane is closed")
+            if len(self._running) >= self.limit:
+                self._backlog.append((future, fn, args))
+                return future
+            self._running.add(future)
+        self._start(future, fn, args)
+        return future
+
+    def abandon(self, future: Future) -> bool:
+        """Give up on `future` (see TaskPool.abandon); its slot goes to the next waiting call."""
+        running = self.pool.abandon(future)
+        self._finished(future)
+        return running
+
+    def close(self):
+        """Cancel calls still waiting for a slot and return the lane's threads to the pool."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            backlog, self._backlog = self._backlog, deque()
+        for future, _, _ in backlog:
+            future.cancel()
+        self.pool._release(self.limit)
+
+    def __enter__(self) -> "Lane":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _start(self, future: Future, fn: Callable, args: tuple):
+        future.add_done_callback(self._finished)
+        self.pool._submit(future, fn, args)
+
+    def _finished(self, future: Future):
+        with self._lock:
+            if future not in self._running:
+                return
+            self._running.discard(future)
+            following = None
+            while self._backlog and following is None:
+                candidate = self._backlog.popleft()
+                if not candidate[0].cancelled():
+                    following = candidate
+                    self._running.add(candidate[0])
+        if following is not None:
+            self._start(*following)
@@ -0,0 +1,6 @@
+"""Shared test setup: run from the repository root so `agents` and `benchmarks` import."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,94 @@
+"""Conjunction screening against a brute-force comparison of every pair."""
+
+import math
+
+import numpy as np
+import pytest
+
+from agents.conjunction_screening import DIRECT_PRIMARIES, SCREENING_DISTANCE_KM, screen_conjunctions
+from agents.orbit_propagator import DECAYED_ERROR, EARTH_RADIUS_KM, UNIX_EPOCH_JD, Propagator
+from benchmarks.conjunction_screening import _mean_motion, brute_force, differences, encounter_keys
+
+NOW = 1_750_000_000.0
+HOURS = 1.0
+
+
+def _element(norad_id, perigee_km, apogee_km, rng, **overrides):
+    element = {
+        "name": f"OBJECT {norad_id}", "norad_id": norad_id, "epoch_jd": NOW / 86400.0 + UNIX_EPOCH_JD,
+        "ndot": 0.0, "nddot": 0.0, "bstar": 1e-5, "inclination": math.radians(rng.uniform(40, 100)),
+        "raan": rng.uniform(0, 2 * math.pi),
+        "eccentricity": (apogee_km - perigee_km) / (apogee_km + perigee_km + 2 * EARTH_RADIUS_KM),
+        "arg_perigee": rng.uniform(0, 2 * math.pi), "mean_anomaly": rng.uniform(0, 2 * math.pi),
+        "mean_motion": float(_mean_motion(np.array([perigee_km]), np.array([apogee_km]))[0]),
+    }
+    element.update(overrides)
+    return element
+
+
+def _dense_catalog(count: int, seed: int = 5) -> Propagator:
+    """Objects packed into a 4 km band around 550 km, so an hour holds a few dozen encounters."""
+    rng = np.random.default_rng(seed)
+    elements = []
+    for index in range(count):
+        perigee = rng.uniform(548, 552)
+        elements.append(_element(70000 + index, perigee, perigee + rng.uniform(0, 2), rng))
+    return Propagator(elements)
+
+
+@pytest.fixture(scope="module")
+def dense():
+    propagator = _dense_catalog(200)
+    return propagator, screen_conjunctions(propagator, NOW, hours=HOURS)
+
+
+def test_all_vs_all_matches_brute_force(dense):
+    propagator, events = dense
+    expected = brute_force(propagator, NOW, HOURS)
+    assert len(expected) >= 10
+    missed, extra = differences(expected, encounter_keys(events))
+    assert missed == [] and extra == []
+
+
+def test_events_are_closest_first_and_inside_the_window(dense):
+    _, events = dense
+    misses = [e["miss_distance_km"] for e in events]
+    assert misses == sorted(misses)
+    assert all(0.0 <= miss < SCREENING_DISTANCE_KM for miss in misses)
+    assert all(e["norad_id"] != e["other_norad_id"] for e in events)
+
+
+@pytest.mark.parametrize("primary_count", [1, DIRECT_PRIMARIES + 4], ids=["direct", "hashed"])
+def test_primaries_find_their_all_vs_all_encounters(dense, primary_count):
+    propagator, events = dense
+    # Primaries that have encounters, topped up with the first objects in the catalog
+    involved = [int(np.flatnonzero(propagator.norad_ids == e["norad_id"])[0]) for e in events]
+    primaries = list(dict.fromkeys(involved))[:primary_count]
+    primaries += [index for index in range(len(propagator)) if index not in primaries][:primary_count - len(primaries)]
+    primary_ids = set(propagator.norad_ids[primaries].tolist())
+
+    screened = screen_conjunctions(propagator, NOW, hours=HOURS, primaries=primaries)
+    assert screened
+    assert all(e["norad_id"] in primary_ids for e in screened)
+    expected = encounter_keys(e for e in events if {e["norad_id"], e["other_norad_id"]} & primary_ids)
+    missed, extra = differences(expected, encounter_keys(screened))
+    assert missed == [] and extra == []
+
+
+def test_decayed_objects_are_never_reported():
+    rng = np.random.default_rng(1)
+    shared = {"inclination": 0.9, "raan": 1.0, "arg_perigee": 0.0}
+    propagator = Propagator([
+        # Two circular orbits 50 km below the surface, about 3 km apart: decayed throughout
+        _element(1, -50, -50, rng, mean_anomaly=0.0, **shared),
+        _element(2, -50, -50, rng, mean_anomaly=5e-4, **shared),
+        # Two live objects on the same track, as a control
+        _element(3, 550, 550, rng, mean_anomaly=0.0, **shared),
+        _element(4, 550, 550, rng, mean_anomaly=5e-4, **shared),
+    ])
+    _, _, errors = propagator.propagate(NOW + np.arange(0.0, HOURS * 3600.0, 60.0))
+    assert (errors[:2] == DECAYED_ERROR).all() and (errors[2:] == 0).all()
+
+    events = screen_conjunctions(propagator, NOW, hours=HOURS)
+    assert {e["norad_id"] for e in events} | {e["other_norad_id"] for e in events} == {3, 4}
+    assert screen_conjunctions(propagator, NOW, hours=HOURS, primaries=[0]) == []
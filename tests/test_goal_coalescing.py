@@ -0,0 +1,60 @@
+"""Concurrent identical goals share one run; results handed to joiners are their own."""
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("langchain_google_genai")
+
+import main  # noqa: E402
+
+
+def test_requested_sections_reach_the_run_and_the_key():
+    calls = []
+
+    def execute(goal, sections):
+        calls.append((goal, sections))
+        return {"goal": goal, "spacex": {"sections": sections}}
+
+    assert main.normalize_sections(" Cores,capsules ,,") == ["capsules", "cores"]
+    assert main.normalize_sections([]) is None
+    assert main.initial_data("g", ["cores"]) == {"goal": "g", "spacex_sections": ["cores"]}
+    assert main.initial_data("g") == {"goal": "g"}
+
+    main._coalesce("test", "Next launch", execute, "cores,capsules")
+    main._coalesce("test", "Next launch", execute)
+    assert calls == [("Next launch", ["capsules", "cores"]), ("Next launch", None)]
+
+
+def test_identical_goals_share_one_run_with_separate_results():
+    started = threading.Event()
+    release = threading.Event()
+    runs = []
+
+    def execute(goal, sections):
+        runs.append(goal)
+        started.set()
+        release.wait(5)
+        return {"goal": goal, "spacex": {"mission": "Crew-9"}}
+
+    results = {}
+
+    def request(name, goal, sections=None):
+        results[name] = main._coalesce("test", goal, execute, sections)
+
+    leader = threading.Thread(target=request, args=("leader", "Next  LAUNCH"))
+    leader.start()
+    assert started.wait(5)
+    follower = threading.Thread(target=request, args=("follower", "next launch"))
+    other = threading.Thread(target=request, args=("other", "next launch", ["cores"]))
+    follower.start()
+    other.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in (leader, follower, other):
+        thread.join(5)
+
+    assert sorted(runs) == ["Next  LAUNCH", "next launch"]  # different sections are a different run
+    results["follower"]["spacex"]["mission"] = "changed"
+    assert results["leader"]["spacex"]["mission"] == "Crew-9"
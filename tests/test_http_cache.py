@@ -0,0 +1,110 @@
+"""ResponseCache: TTL hits, ETag revalidation, stale-while-revalidate and serving stale copies on errors."""
+
+import json
+import time
+
+import pytest
+import requests
+
+from agents.http_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self.text = json.dumps(body) if body is not None else ""
+        self.headers = {"ETag": etag} if etag else {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class Upstream:
+    """Records the headers of every fetch and answers with the queued responses in order."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def __call__(self, headers):
+        self.requests.append(dict(headers))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+def test_fresh_entries_are_served_without_a_request():
+    cache = ResponseCache("unused", persist=False)
+    upstream = Upstream(FakeResponse(200, {"v": 1}, etag='"a"'))
+    assert cache.get_json("k", upstream, policy=(60, 0)) == {"v": 1}
+    assert cache.get_json("k", upstream, policy=(60, 0)) == {"v": 1}
+    assert len(upstream.requests) == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["hits"], stats["upstream_requests"]) == (1, 1, 1)
+
+
+def test_expired_entry_is_revalidated_with_its_etag():
+    cache = ResponseCache("unused", persist=False)
+    upstream = Upstream(FakeResponse(200, {"v": 1}, etag='"a"'), FakeResponse(304))
+    cache.get_json("k", upstream, policy=(0, 0))
+    stored_at = cache._entries["k"]["stored_at"]
+
+    assert cache.get_json("k", upstream, policy=(0, 0)) == {"v": 1}
+    assert upstream.requests == [{}, {"If-None-Match": '"a"'}]
+    assert cache._entries["k"]["stored_at"] >= stored_at
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_changed_body_replaces_the_entry():
+    cache = ResponseCache("unused", persist=False)
+    upstream = Upstream(FakeResponse(200, {"v": 1}, etag='"a"'), FakeResponse(200, {"v": 2}, etag='"b"'))
+    cache.get_json("k", upstream, policy=(0, 0))
+    assert cache.get_json("k", upstream, policy=(0, 0)) == {"v": 2}
+    assert cache._entries["k"]["etag"] == '"b"'
+    assert cache.stats()["refreshed"] == 1
+
+
+def test_stale_entry_is_served_while_it_revalidates_in_the_background():
+    cache = ResponseCache("unused", persist=False)
+    upstream = Upstream(FakeResponse(200, {"v": 1}, etag='"a"'), FakeResponse(200, {"v": 2}, etag='"b"'))
+    cache.get_json("k", upstream, policy=(0, 60))
+
+    assert cache.get_json("k", upstream, policy=(0, 60)) == {"v": 1}
+    assert cache.stats()["stale_hits"] == 1
+    _wait_for(lambda: cache._entries["k"]["etag"] == '"b"')
+    assert upstream.requests[1] == {"If-None-Match": '"a"'}
+    assert cache.get_json("k", upstream, policy=(60, 0)) == {"v": 2}
+
+
+def test_cached_copy_is_served_when_upstream_fails():
+    cache = ResponseCache("unused", persist=False)
+    upstream = Upstream(FakeResponse(200, {"v": 1}), FakeResponse(503), requests.ConnectionError("down"))
+    cache.get_json("k", upstream, policy=(0, 0))
+    assert cache.get_json("k", upstream, policy=(0, 0)) == {"v": 1}
+    assert cache.get_json("k", upstream, policy=(0, 0)) == {"v": 1}
+    assert cache.stats()["stale_on_error"] == 2
+
+
+def test_errors_propagate_without_a_cached_copy():
+    cache = ResponseCache("unused", persist=False)
+    with pytest.raises(requests.HTTPError):
+        cache.get_json("k", Upstream(FakeResponse(404)), policy=(60, 0))
+
+
+def test_entries_survive_a_restart(tmp_path):
+    ResponseCache(str(tmp_path)).get_json("k", Upstream(FakeResponse(200, {"v": 1}, etag='"a"')), policy=(60, 0))
+    upstream = Upstream(FakeResponse(304))
+    restarted = ResponseCache(str(tmp_path))
+    assert restarted.get_json("k", upstream, policy=(60, 0)) == {"v": 1}
+    assert upstream.requests == []
+    assert restarted.get_json("k", upstream, policy=(0, 0)) == {"v": 1}
+    assert upstream.requests == [{"If-None-Match": '"a"'}]
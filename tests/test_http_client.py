@@ -0,0 +1,88 @@
+"""Shared HTTP client against a local server: coalescing, per-caller responses, retries and cancellation."""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from agents import http_client
+from agents.cancellation import CancellationToken, OperationCancelled, use_token
+
+
+class Upstream(BaseHTTPRequestHandler):
+    """`/slow` answers after 0.3 s; `/flaky` fails with 503 once per path suffix, then succeeds."""
+
+    hits = {}
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            count = self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        if self.path.startswith("/slow"):
+            time.sleep(0.3)
+        if self.path.startswith("/flaky") and count == 1:
+            self._send(503, {"error": "busy"})
+            return
+        self._send(200, {"path": self.path, "hit": count})
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    http_client.close()
+
+
+def test_identical_gets_share_one_request_but_not_the_response(upstream):
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        responses = list(pool.map(lambda _: http_client.get(f"{upstream}/slow/shared", params={"a": 1}), range(4)))
+    assert Upstream.hits["/slow/shared?a=1"] == 1
+    assert len({id(response) for response in responses}) == 4
+    assert len({id(response.headers) for response in responses}) == 4
+    for response in responses:
+        assert response.status_code == 200
+        assert response.headers["etag"] == '"v1"'
+        assert response.json() == {"path": "/slow/shared?a=1", "hit": 1}
+        assert b"".join(response.iter_content(chunk_size=4)) == response.content
+
+
+def test_different_timeouts_do_not_share_a_request(upstream):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        short = pool.submit(http_client.get, f"{upstream}/slow/timeouts", timeout=(1, 2))
+        long = pool.submit(http_client.get, f"{upstream}/slow/timeouts", timeout=(1, 20))
+        assert short.result(5).ok and long.result(5).ok
+    assert Upstream.hits["/slow/timeouts"] == 2
+
+
+def test_transient_errors_are_retried(upstream, monkeypatch):
+    monkeypatch.setattr(http_client, "_backoff_delay", lambda attempt: 0.0)
+    response = http_client.get(f"{upstream}/flaky/once")
+    assert response.status_code == 200
+    assert response.json()["hit"] == 2
+
+
+def test_no_request_starts_under_a_cancelled_token(upstream):
+    token = CancellationToken()
+    token.cancel("request abandoned")
+    with use_token(token):
+        with pytest.raises(OperationCancelled):
+            http_client.get(f"{upstream}/slow/cancelled")
+    assert "/slow/cancelled" not in Upstream.hits
@@ -0,0 +1,97 @@
+"""LazyPayload: deferred loading, copies, pickling and snapshots for serialization."""
+
+import copy
+import json
+import pickle
+import threading
+
+from agents.lazy_payload import DEFERRED_PLACEHOLDER, LazyPayload, snapshot
+
+
+class Loader:
+    """Section loader that records every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, keys):
+        self.calls.append(sorted(keys))
+        return {key: {"loaded": key} for key in keys}
+
+
+def _payload():
+    loader = Loader()
+    resources = LazyPayload({"rockets": ["Falcon 9"]}, deferred=["capsules", "cores"], loader=loader)
+    payload = LazyPayload({"mission": "Crew-9", "resources": resources}, deferred=["company"], loader=loader)
+    return payload, loader
+
+
+def test_deferred_sections_load_on_access():
+    payload, loader = _payload()
+    assert dict.__getitem__(payload, "company") == DEFERRED_PLACEHOLDER
+    assert payload.deferred_keys() == ["company"]
+    assert payload["company"] == {"loaded": "company"}
+    assert payload.get("company") == {"loaded": "company"}
+    assert loader.calls == [["company"]]
+    assert payload.deferred_keys() == []
+
+    payload["resources"]["capsules"] = ["C206"]  # writing a deferred key replaces it without loading
+    assert payload["resources"]["capsules"] == ["C206"]
+    assert payload["resources"].materialize().deferred_keys() == []
+    assert loader.calls == [["company"], ["cores"]]
+
+
+def test_concurrent_readers_load_once():
+    payload, loader = _payload()
+    barrier = threading.Barrier(8)
+
+    def read():
+        barrier.wait()
+        return payload["company"]
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loader.calls == [["company"]]
+
+
+def test_snapshot_serializes_without_loading():
+    payload, loader = _payload()
+    result = {"spacex": payload, "runs": [payload["resources"]]}
+    plain = snapshot(result)
+    assert loader.calls == []
+    assert type(plain["spacex"]) is dict and type(plain["spacex"]["resources"]) is dict
+    assert plain["spacex"]["company"] == DEFERRED_PLACEHOLDER
+    assert plain["runs"][0]["cores"] == DEFERRED_PLACEHOLDER
+    assert json.loads(json.dumps(plain))["spacex"]["mission"] == "Crew-9"
+
+    payload["company"]
+    assert snapshot(result)["spacex"]["company"] == {"loaded": "company"}
+    assert plain["spacex"]["company"] == DEFERRED_PLACEHOLDER  # earlier snapshots are unaffected
+
+
+def test_copies_stay_lazy_and_independent():
+    payload, loader = _payload()
+    for clone in (copy.copy(payload), copy.deepcopy(payload)):
+        assert isinstance(clone, LazyPayload)
+        assert clone.deferred_keys() == ["company"]
+        clone["mission"] = "changed"
+        assert payload["mission"] == "Crew-9"
+        assert clone["company"] == {"loaded": "company"}
+    assert payload.deferred_keys() == ["company"]
+
+    deep = copy.deepcopy(payload)
+    assert deep["resources"] is not payload["resources"]
+    assert deep["resources"].deferred_keys() == ["capsules", "cores"]
+    assert loader.calls == [["company"], ["company"]]
+
+
+def test_pickle_gives_a_plain_snapshot():
+    payload, loader = _payload()
+    restored = pickle.loads(pickle.dumps(payload))
+    assert type(restored) is dict and type(restored["resources"]) is dict
+    assert restored["company"] == DEFERRED_PLACEHOLDER
+    assert restored["resources"]["rockets"] == ["Falcon 9"]
+    assert loader.calls == []
@@ -0,0 +1,138 @@
+"""Vectorized SGP4/SDP4 against the published verification vectors."""
+
+import math
+
+import numpy as np
+import pytest
+
+from agents.orbit_propagator import (
+    DECAYED_ERROR, EARTH_RADIUS_KM, UNIX_EPOCH_JD, Propagator, parse_tle, teme_to_geodetic,
+)
+from benchmarks.sgp4_propagation import (
+    POSITION_TOLERANCE_KM, REFERENCE_VECTORS, VELOCITY_TOLERANCE_KM_S,
+    _read_verification_tles, _verification_files, verification_errors,
+)
+
+
+def _elements(**overrides):
+    element = {
+        "name": "TEST", "norad_id": 1, "epoch_jd": 2460000.5, "ndot": 0.0, "nddot": 0.0, "bstar": 1e-4,
+        "inclination": math.radians(51.6), "raan": 1.0, "eccentricity": 5e-4, "arg_perigee": 0.0,
+        "mean_anomaly": 0.0, "mean_motion": 15.5 * 2 * math.pi / 1440.0,
+    }
+    element.update(overrides)
+    return element
+
+
+@pytest.mark.parametrize("line1, line2, tsince, r_ref, v_ref", REFERENCE_VECTORS,
+                         ids=[f"{vector[0][2:7]}@{vector[2]:g}min" for vector in REFERENCE_VECTORS])
+def test_reference_vectors(line1, line2, tsince, r_ref, v_ref):
+    r, v, error = Propagator.from_tles([(line1, line2)]).propagate_minutes([tsince])
+    assert error[0, 0] == 0
+    np.testing.assert_allclose(r[0, 0], r_ref, rtol=0, atol=POSITION_TOLERANCE_KM)
+    np.testing.assert_allclose(v[0, 0], v_ref, rtol=0, atol=VELOCITY_TOLERANCE_KM_S)
+
+
+def test_full_verification_suite():
+    pytest.importorskip("sgp4")
+    errors = verification_errors()
+    if errors is None:
+        pytest.skip("sgp4 package ships without its verification files")
+    satellites, rows, worst_r, worst_v = errors
+    assert satellites > 30 and rows > 500
+    assert worst_r < POSITION_TOLERANCE_KM
+    assert worst_v < VELOCITY_TOLERANCE_KM_S
+
+
+def test_error_codes_and_states_match_the_reference_library():
+    sgp4_api = pytest.importorskip("sgp4.api")
+    files = _verification_files()
+    if files is None:
+        pytest.skip("sgp4 package ships without its verification files")
+    tles = list(_read_verification_tles(files[0]).values())
+    minutes = np.arange(-1440.0, 4321.0, 180.0)
+    r, _, error = Propagator.from_tles(tles).propagate_minutes(minutes)
+    for index, (line1, line2) in enumerate(tles):
+        satellite = sgp4_api.Satrec.twoline2rv(line1, line2)
+        for column, tsince in enumerate(minutes):
+            expected_error, expected_r, _ = satellite.sgp4_tsince(tsince)
+            assert error[index, column] == expected_error, (line1[2:7], tsince)
+            if expected_error == 0:
+                np.testing.assert_allclose(r[index, column], expected_r, rtol=0, atol=1e-6)
+
+
+def test_batch_matches_one_satellite_at_a_time():
+    tles = [(line1, line2) for line1, line2, *_ in REFERENCE_VECTORS]
+    tles = list(dict.fromkeys(tles))  # near-earth and deep-space sets, each once
+    minutes = np.array([-120.0, 0.0, 90.0, 720.0, 1440.0])
+    r, v, error = Propagator.from_tles(tles).propagate_minutes(minutes)
+    assert r.shape == v.shape == (len(tles), len(minutes), 3)
+    for index, tle in enumerate(tles):
+        for column, tsince in enumerate(minutes):
+            r_one, v_one, error_one = Propagator.from_tles([tle]).propagate_minutes([tsince])
+            assert error[index, column] == error_one[0, 0]
+            np.testing.assert_allclose(r[index, column], r_one[0, 0], rtol=0, atol=1e-9)
+            np.testing.assert_allclose(v[index, column], v_one[0, 0], rtol=0, atol=1e-12)
+
+
+def test_take_matches_a_fresh_propagator():
+    tles = [(line1, line2) for line1, line2, *_ in REFERENCE_VECTORS]
+    full = Propagator.from_tles(tles)
+    subset = full.take([3, 0, 0])
+    fresh = Propagator.from_tles([tles[3], tles[0], tles[0]])
+    np.testing.assert_array_equal(subset.norad_ids, fresh.norad_ids)
+    r_subset, _, _ = subset.propagate_minutes([0.0, 600.0])
+    r_fresh, _, _ = fresh.propagate_minutes([0.0, 600.0])
+    np.testing.assert_allclose(r_subset, r_fresh, rtol=0, atol=1e-9)
+
+
+def test_unix_times_match_minutes_since_epoch():
+    propagator = Propagator([_elements()])
+    epoch_unix = (2460000.5 - UNIX_EPOCH_JD) * 86400.0
+    r_unix, _, _ = propagator.propagate(epoch_unix + np.array([0.0, 3600.0]))
+    r_minutes, _, _ = propagator.propagate_minutes([0.0, 60.0])
+    np.testing.assert_allclose(r_unix, r_minutes, rtol=0, atol=1e-6)
+
+
+def test_circular_leo_altitude():
+    propagator = Propagator([_elements()])
+    times = (2460000.5 - UNIX_EPOCH_JD) * 86400.0 + np.arange(0.0, 5400.0, 300.0)
+    r, _, error = propagator.propagate(times)
+    assert not error.any()
+    _, _, altitude = teme_to_geodetic(r[0], times)
+    expected = propagator.semi_major_axis_km[0] - EARTH_RADIUS_KM
+    # Earth's flattening and short-period terms keep a near-circular orbit within ~30 km of a - R
+    assert np.all(np.abs(altitude - expected) < 30.0)
+
+
+def test_error_codes():
+    propagator = Propagator([
+        _elements(norad_id=1),
+        _elements(norad_id=2, eccentricity=0.08),  # perigee below the surface
+        _elements(norad_id=3, eccentricity=1.2),
+    ])
+    r, _, error = propagator.propagate_minutes([0.0])
+    assert error[:, 0].tolist() == [0, DECAYED_ERROR, 1]
+    # Like the reference, a decayed satellite still gets a (below-surface) position; failures get NaN
+    assert np.linalg.norm(r[1, 0]) < EARTH_RADIUS_KM
+    assert np.isnan(r[2, 0]).all()
+
+
+@pytest.mark.parametrize("overrides", [
+    {"eccentricity": 1.0}, {"eccentricity": 1.2}, {"eccentricity": -0.1},
+    {"mean_motion": -0.01}, {"mean_motion": 0.0}, {"mean_motion": 1e-9},
+])
+def test_unusable_element_sets_never_report_success(overrides):
+    r, v, error = Propagator([_elements(**overrides)]).propagate_minutes([0.0, 60.0])
+    assert (error != 0).all()
+    assert np.isnan(r).all() and np.isnan(v).all()
+
+
+def test_parse_tle_round_trip_fields():
+    line1, line2 = REFERENCE_VECTORS[0][:2]
+    element = parse_tle(line1, line2, "VANGUARD 1")
+    assert element["norad_id"] == 5
+    assert element["name"] == "VANGUARD 1"
+    assert element["eccentricity"] == pytest.approx(0.1859667)
+    assert math.degrees(element["inclination"]) == pytest.approx(34.2682)
+    assert element["mean_motion"] * 1440.0 / (2 * math.pi) == pytest.approx(10.82419157)
@@ -0,0 +1,54 @@
+"""Pass prediction against brute-force 1 s sampling, plus look angles of failed propagations."""
+
+import math
+
+import numpy as np
+
+from agents.orbit_propagator import DECAYED_ERROR, UNIX_EPOCH_JD, Propagator
+from agents.pass_prediction import DEFAULT_MIN_ELEVATION, Observer, look_angles, predict_passes
+from benchmarks.pass_prediction import KSC, _satellites, sampling_errors
+
+START = 1_750_000_000.0
+HOURS = 12.0
+
+
+def test_passes_match_one_second_sampling():
+    propagator = _satellites(3, START)
+    observer = Observer(*KSC)
+    passes = predict_passes(propagator, observer, START, hours=HOURS)
+    assert passes, "synthetic LEO satellites should pass over KSC within 12 h"
+    mismatched, worst_time, worst_elevation = sampling_errors(propagator, observer, passes, START, HOURS, 3)
+    assert mismatched == 0
+    assert worst_time <= 2.0
+    assert worst_elevation <= 0.1
+
+
+def test_passes_are_ordered_and_inside_the_window():
+    passes = predict_passes(_satellites(10, START), Observer(*KSC), START, hours=HOURS)
+    starts = [p["start_time"] for p in passes]
+    assert starts == sorted(starts)
+    for p in passes:
+        assert p["max_elevation"] >= DEFAULT_MIN_ELEVATION - 0.1
+        assert 0.0 < p["duration_minutes"] <= HOURS * 60.0
+
+
+def test_failed_propagations_have_no_look_angles():
+    base = {
+        "name": "TEST", "epoch_jd": START / 86400.0 + UNIX_EPOCH_JD, "ndot": 0.0, "nddot": 0.0, "bstar": 1e-4,
+        "inclination": math.radians(51.6), "raan": 1.0, "arg_perigee": 0.0, "mean_anomaly": 0.0,
+        "mean_motion": 15.5 * 2 * math.pi / 1440.0,
+    }
+    propagator = Propagator([
+        dict(base, norad_id=1, eccentricity=5e-4),
+        dict(base, norad_id=2, eccentricity=0.08),  # perigee below the surface: decays
+        dict(base, norad_id=3, eccentricity=1.2),
+    ])
+    times = START + np.arange(0.0, 6000.0, 60.0)
+    _, _, errors = propagator.propagate(times)
+    assert (errors[1] == DECAYED_ERROR).any() and (errors[2] != 0).all()
+
+    elevation, azimuth, distance = look_angles(propagator, Observer(*KSC), times)
+    failed = errors != 0
+    for angles in (elevation, azimuth, distance):
+        assert np.isnan(angles[failed]).all()
+        assert np.isfinite(angles[~failed]).all()
@@ -0,0 +1,86 @@
+"""PlanCache: TTL expiry, LRU eviction, validation and persistence; goal fingerprints."""
+
+import json
+
+from plan_cache import PlanCache, fingerprint_goal
+
+
+def _is_plan(value):
+    return isinstance(value, list) and all(isinstance(name, str) for name in value)
+
+
+def test_entries_expire_after_their_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("plan_cache.time.time", lambda: now[0])
+    cache = PlanCache(ttl_seconds=60)
+    cache.put("k", ["WeatherAgent"])
+    now[0] += 59
+    assert cache.get("k") == ["WeatherAgent"]
+    now[0] += 2
+    assert cache.get("k") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expired"], stats["entries"]) == (1, 1, 1, 0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PlanCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_invalid_values_are_not_stored():
+    cache = PlanCache(validator=_is_plan)
+    cache.put("k", "not a plan")
+    assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_persisted_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "plans.json")
+    PlanCache(path=path, validator=_is_plan).put("k", ["WeatherAgent", "NASAAgent"])
+    assert PlanCache(path=path, validator=_is_plan).get("k") == ["WeatherAgent", "NASAAgent"]
+
+
+def test_invalid_persisted_entries_are_rejected(tmp_path):
+    path = tmp_path / "plans.json"
+    path.write_text(json.dumps({"entries": [
+        ["good", {"value": ["WeatherAgent"], "stored_at": 9e12}],
+        ["bad", {"value": {"agents": "RemovedAgent"}, "stored_at": 9e12}],
+    ]}))
+    cache = PlanCache(path=str(path), validator=_is_plan)
+    assert cache.get("bad") is None
+    assert cache.get("good") == ["WeatherAgent"]
+    assert cache.stats()["invalid"] == 1
+
+
+def test_expired_and_unreadable_cache_files_are_ignored(tmp_path):
+    path = tmp_path / "plans.json"
+    path.write_text(json.dumps({"entries": [["old", {"value": ["WeatherAgent"], "stored_at": 0}]]}))
+    assert PlanCache(path=str(path)).stats()["entries"] == 0
+    path.write_text("{not json")
+    assert PlanCache(path=str(path)).stats()["entries"] == 0
+
+
+def test_equivalent_phrasings_share_a_fingerprint():
+    assert fingerprint_goal("What's the next SpaceX launch?") == fingerprint_goal("next  spacex LAUNCH")
+    assert fingerprint_goal("next launch", namespace="a") != fingerprint_goal("next launch", namespace="b")
+
+
+def test_goals_that_differ_in_order_or_repeats_do_not_collide():
+    goals = [
+        "weather then satellites",
+        "satellites then weather",
+        "weather before satellites",
+        "weather for satellites",
+        "weather and satellites",
+        "weather satellites",
+        "weather weather satellites",
+        "launches to mars",
+        "launches from mars",
+    ]
+    assert len({fingerprint_goal(goal) for goal in goals}) == len(goals)
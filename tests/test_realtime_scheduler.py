@@ -0,0 +1,150 @@
+"""The real-time coordinator's task-graph scheduler, run with stand-in agents."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("langchain_google_genai")
+
+import realtime_coordinator  # noqa: E402
+from agents.cancellation import check, current_token  # noqa: E402
+from realtime_coordinator import ExecutionContext, RealTimeCoordinator, TaskGraph  # noqa: E402
+from shared_context import SharedContext  # noqa: E402
+from task_pool import TaskPool  # noqa: E402
+
+
+def _coordinator(pool: TaskPool, agents: dict) -> RealTimeCoordinator:
+    """A coordinator without an LLM: the scheduler only needs the pool and the agent modules."""
+    coordinator = RealTimeCoordinator.__new__(RealTimeCoordinator)
+    coordinator.pool = pool
+    coordinator._agents = {name: SimpleNamespace(run=run) for name, run in agents.items()}
+    coordinator._agents_lock = threading.Lock()
+    return coordinator
+
+
+def _graph(*tasks) -> TaskGraph:
+    return TaskGraph([dict(task) for task in tasks])
+
+
+def _run(coordinator: RealTimeCoordinator, graph: TaskGraph, goal: str = "test"):
+    ctx = ExecutionContext(goal)
+    started = time.perf_counter()
+    shared, metrics = coordinator._run_task_graph(ctx, graph, SharedContext({"goal": goal}))
+    return shared, metrics, ctx, time.perf_counter() - started
+
+
+def test_a_stuck_run_does_not_starve_another(monkeypatch):
+    monkeypatch.setattr(realtime_coordinator, "MAX_TASK_WORKERS", 2)
+    release = threading.Event()
+
+    def stuck(data):
+        release.wait(10)  # ignores cancellation, like an agent blocked in a library call
+        return data
+
+    def quick(data):
+        data["quick"] = True
+        return data
+
+    coordinator = _coordinator(TaskPool(), {"stuck_agent": stuck, "quick_agent": quick})
+    hung = _graph({"id": "t1", "agents": ["stuck_agent", "stuck_agent"], "timeout_seconds": 1})
+    healthy = _graph(
+        {"id": "t1", "agents": ["quick_agent", "quick_agent"]},
+        {"id": "t2", "agents": ["quick_agent"], "depends_on": ["t1"]},
+    )
+    try:
+        with ThreadPoolExecutor(max_workers=2) as runner:
+            hung_run = runner.submit(_run, coordinator, hung)
+            time.sleep(0.2)  # both stuck calls now hold every slot a shared 2-thread pool would have
+            shared, metrics, _, elapsed = runner.submit(_run, coordinator, healthy).result(timeout=5)
+            assert shared["quick"] is True
+            assert metrics["timed_out"] == []
+            assert elapsed < 0.5
+            assert not hung_run.done()
+
+            _, metrics, ctx, elapsed = hung_run.result(timeout=5)
+            assert metrics["timed_out"] == ["t1"]
+            assert ctx.agent_status["stuck_agent"] == "timeout"
+            assert 1.0 <= elapsed < 2.0
+
+        # The abandoned calls still hold their threads; a new run gets replacements
+        assert coordinator.pool.stats()["abandoned"] == 2
+        shared, metrics, _, elapsed = _run(coordinator, healthy)
+        assert shared["quick"] is True and elapsed < 0.5
+    finally:
+        release.set()
+    deadline = time.monotonic() + 5
+    while coordinator.pool.stats()["abandoned"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert coordinator.pool.stats()["abandoned"] == 0
+
+
+def test_a_run_is_limited_to_its_lane(monkeypatch):
+    monkeypatch.setattr(realtime_coordinator, "MAX_TASK_WORKERS", 2)
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def counted(data):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        return data
+
+    coordinator = _coordinator(TaskPool(), {"counted_agent": counted})
+    _, metrics, _, _ = _run(coordinator, _graph({"id": "t1", "agents": ["counted_agent"] * 6}))
+    assert metrics["timed_out"] == []
+    assert max(peak) == 2
+
+
+def test_agents_run_under_the_task_deadline():
+    seen = []
+
+    def observe(data):
+        token = current_token()
+        seen.append((token.remaining(), token.cap_timeout((5, 15))))
+        return data
+
+    coordinator = _coordinator(TaskPool(), {"observe_agent": observe})
+    _, metrics, ctx, _ = _run(coordinator, _graph({"id": "t1", "agents": ["observe_agent"], "timeout_seconds": 2}))
+    remaining, timeout = seen[0]
+    assert 1.5 < remaining <= 2.0
+    assert all(part <= 2.0 for part in timeout)
+    assert ctx.agent_status["observe_agent"] == "completed"
+
+
+def test_the_query_deadline_bounds_every_task(monkeypatch):
+    stopped = []
+
+    def cooperative(data):
+        token = current_token()
+        stopped.append(token.remaining())
+        while True:
+            check()  # raises OperationCancelled once the query deadline passes
+            time.sleep(0.01)
+
+    def never_called(data):
+        raise AssertionError("dispatched after the query deadline")
+
+    coordinator = _coordinator(TaskPool(), {"cooperative_agent": cooperative, "later_agent": never_called})
+    graph = _graph(
+        {"id": "t1", "agents": ["cooperative_agent"], "timeout_seconds": 30},
+        {"id": "t2", "agents": ["later_agent"], "depends_on": ["t1"]},
+    )
+    monkeypatch.setattr(realtime_coordinator, "QUERY_DEADLINE_SECONDS", 0.5)
+    _, metrics, ctx, elapsed = _run(coordinator, graph)
+
+    assert stopped[0] <= 0.5  # the task's own 30 s deadline is capped by the query's
+    assert 0.5 <= elapsed < 1.5
+    assert metrics["timed_out"] == ["t1", "t2"]
+    assert ctx.agent_status["cooperative_agent"] == "timeout"
+    assert ctx.agent_status["later_agent"] == "timeout"
+    deadline = time.monotonic() + 1
+    while coordinator.pool.stats()["abandoned"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert coordinator.pool.stats()["abandoned"] == 0  # the cancelled agent gave its thread back
@@ -0,0 +1,78 @@
+"""SatelliteBatch columns against per-satellite results, JSON round trips and validity masks."""
+
+import math
+
+import numpy as np
+import pytest
+
+from agents.orbit_propagator import DECAYED_ERROR, UNIX_EPOCH_JD, Propagator
+from agents.satellite_batch import COLUMNS, SatelliteBatch
+from benchmarks.batch_tracking import _catalog, per_satellite_dicts
+
+NOW = 1_750_000_000.0
+
+
+def _mixed_batch() -> SatelliteBatch:
+    base = {
+        "name": "TEST", "epoch_jd": NOW / 86400.0 + UNIX_EPOCH_JD, "ndot": 0.0, "nddot": 0.0, "bstar": 1e-4,
+        "inclination": math.radians(51.6), "raan": 1.0, "arg_perigee": 0.0, "mean_anomaly": 0.0,
+        "mean_motion": 15.5 * 2 * math.pi / 1440.0,
+    }
+    return SatelliteBatch.from_propagator(Propagator([
+        dict(base, norad_id=1, name="GOOD", eccentricity=5e-4),
+        dict(base, norad_id=2, name="REENTERED", eccentricity=0.08),  # perigee below the surface
+        dict(base, norad_id=3, name="BROKEN", eccentricity=1.2),
+    ]), NOW)
+
+
+def test_batch_matches_per_satellite_results():
+    records = _catalog(50, NOW)
+    data = SatelliteBatch.from_propagator(Propagator(records), NOW).to_dict()
+    for index, expected in enumerate(per_satellite_dicts(records, NOW)):
+        assert data["name"][index] == expected["satellite_name"]
+        assert data["norad_id"][index] == expected["norad_id"]
+        assert data["error"][index] == expected["error"] == 0
+        assert data["tle_age_days"][index] == pytest.approx(expected["tle_age_days"], abs=0.01)
+        for group in ("orbital_parameters", "current_position"):
+            for key, value in expected[group].items():
+                assert data[key][index] == pytest.approx(value, abs=10.0 ** -COLUMNS[key]), (index, key)
+
+
+def test_to_dict_round_trip():
+    batch = _mixed_batch()
+    data = batch.to_dict()
+    assert data["altitude_km"][1] is None and data["latitude"][2] is None
+    restored = SatelliteBatch.from_dict(data)
+    assert restored.timestamp == NOW
+    assert restored.names.tolist() == ["GOOD", "REENTERED", "BROKEN"]
+    assert restored.to_dict() == data
+    assert np.isnan(restored["altitude_km"][[1, 2]]).all()
+
+
+def test_validity_masks_and_summary():
+    batch = _mixed_batch()
+    assert batch["error"].tolist() == [0, DECAYED_ERROR, 1]
+    assert batch.valid.tolist() == [True, False, False]
+    assert batch.decayed.tolist() == [False, True, False]
+    summary = batch.summary()
+    assert (summary["count"], summary["propagated"], summary["failed"], summary["decayed"]) == (3, 1, 2, 1)
+    assert summary["altitude_km"]["min"] == summary["altitude_km"]["max"] == round(float(batch["altitude_km"][0]), 1)
+    assert summary["regimes"] == {"LEO": 1}
+
+
+def test_take_and_row():
+    batch = _mixed_batch()
+    subset = batch.take(batch.valid)
+    assert len(subset) == 1 and subset.timestamp == batch.timestamp
+    assert subset.row(0) == batch.row(0)
+    assert batch.row(2)["name"] == "BROKEN" and batch.row(2)["error"] == 1
+    assert batch.take([2, 0])["norad_id"].tolist() == [3, 1]
+
+
+def test_columns_are_checked():
+    with pytest.raises(ValueError, match="Missing batch columns"):
+        SatelliteBatch({"norad_id": [1]})
+    columns = {column: [0.0] for column in COLUMNS}
+    columns["latitude"] = [0.0, 1.0]
+    with pytest.raises(ValueError, match="same length"):
+        SatelliteBatch(columns)
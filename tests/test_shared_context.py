@@ -0,0 +1,71 @@
+"""SharedContext: immutable layers, isolated agent overlays and change detection."""
+
+import pytest
+
+import shared_context
+from shared_context import ContextOverlay, SharedContext, as_context, changes
+
+
+def test_with_layer_leaves_the_original_unchanged():
+    base = SharedContext({"goal": "g", "weather": "sunny"})
+    newer = base.with_layer({"weather": "rain", "nasa": {"apod": 1}})
+    assert dict(base) == {"goal": "g", "weather": "sunny"}
+    assert dict(newer) == {"goal": "g", "weather": "rain", "nasa": {"apod": 1}}
+    assert (base.depth, newer.depth) == (1, 2)
+    assert base.with_layer({}) is base
+    with pytest.raises(TypeError):
+        base["weather"] = "hail"
+
+
+def test_source_dict_changes_do_not_leak_in():
+    data = {"goal": "g"}
+    context = SharedContext(data)
+    layered = context.with_layer(data)
+    data["goal"] = "changed"
+    assert context["goal"] == layered["goal"] == "g"
+
+
+def test_overlay_writes_stay_in_the_overlay():
+    context = SharedContext({"goal": "g", "weather": "sunny"})
+    first, second = context.overlay(), context.overlay()
+    first["weather"] = "rain"
+    first["iss"] = {"lat": 1}
+    del first["weather"]
+    first["weather"] = "storm"
+
+    assert isinstance(first, ContextOverlay)
+    assert first["weather"] == "storm" and first.get("goal") == "g"
+    assert second["weather"] == "sunny" and "iss" not in second
+    assert dict(context) == {"goal": "g", "weather": "sunny"}
+    assert first.writes == {"weather": "storm", "iss": {"lat": 1}}
+    with pytest.raises(KeyError):
+        first["missing"]
+    assert first.get("missing", "default") == "default"
+
+
+def test_changes_reports_only_what_an_agent_wrote():
+    context = SharedContext({"goal": "g", "weather": {"t": 20}})
+    overlay = context.overlay()
+    overlay["iss"] = 1
+    assert changes(overlay, context) == {"iss": 1}
+
+    # Agents that return a dict copy: new keys and replaced objects count, equal copies of old values do not
+    copied = dict(context)
+    copied["iss"] = 1
+    copied["goal"] = "g"
+    replaced = {"t": 21}
+    copied["weather"] = replaced
+    assert changes(copied, context) == {"iss": 1, "weather": replaced}
+    assert changes(context, context) == {}
+    assert changes(None, context) == {}
+
+
+def test_deep_stacks_are_flattened(monkeypatch):
+    monkeypatch.setattr(shared_context, "MAX_LAYERS", 4)
+    context = SharedContext({"n": 0})
+    for n in range(1, 6):
+        context = context.with_layer({"n": n, f"k{n}": n})
+    assert context.depth <= 4
+    assert context["n"] == 5 and len(context) == 6
+    assert as_context(context) is context
+    assert isinstance(as_context({"a": 1}), SharedContext)
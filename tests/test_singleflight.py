@@ -0,0 +1,133 @@
+"""SingleFlight: coalescing identical concurrent calls, errors and cancellation of waiters."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from agents.cancellation import CancellationToken, OperationCancelled, use_token
+from agents.singleflight import SingleFlight
+
+
+def _leader(flight: SingleFlight, key, started: threading.Event, release: threading.Event, result="value"):
+    def fn():
+        started.set()
+        release.wait(5)
+        return result
+    return threading.Thread(target=flight.do, args=(key, fn))
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    executions = []
+
+    def fn():
+        executions.append(1)
+        started.set()
+        release.wait(5)
+        return {"value": 1}
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        leader = pool.submit(flight.do, "key", fn)
+        assert started.wait(5)
+        followers = [pool.submit(flight.do, "key", fn) for _ in range(5)]
+        while flight.stats()["coalesced"] < 5:
+            time.sleep(0.005)
+        release.set()
+        results = [leader.result(5)] + [future.result(5) for future in followers]
+
+    assert len(executions) == 1
+    assert [shared for _, shared in results] == [False] + [True] * 5
+    assert all(result is results[0][0] for result, _ in results)
+    stats = flight.stats()
+    assert (stats["executions"], stats["coalesced"], stats["in_flight"]) == (1, 5, 0)
+
+    # Nothing is cached: the next call runs again
+    release.set()
+    flight.do("key", fn)
+    assert len(executions) == 2
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def fn():
+        started.set()
+        time.sleep(0.1)
+        raise ValueError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", fn)
+        assert started.wait(5)
+        follower = pool.submit(flight.do, "key", fn)
+        for future in (leader, follower):
+            with pytest.raises(ValueError, match="upstream down"):
+                future.result(5)
+    assert flight.stats()["errors"] == 1
+
+
+@pytest.mark.parametrize("deadline", [None, 30.0], ids=["no-deadline", "deadline"])
+def test_cancel_wakes_a_waiting_follower(deadline):
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    leader = _leader(flight, "key", started, release)
+    leader.start()
+    assert started.wait(5)
+
+    token = CancellationToken(deadline)
+    outcome = []
+
+    def follow():
+        with use_token(token):
+            try:
+                flight.do("key", lambda: "unused")
+            except OperationCancelled as e:
+                outcome.append(e)
+
+    follower = threading.Thread(target=follow)
+    follower.start()
+    time.sleep(0.05)
+    cancelled_at = time.monotonic()
+    token.cancel("client went away")
+    follower.join(2)
+    assert not follower.is_alive()
+    assert time.monotonic() - cancelled_at < 0.5
+    assert str(outcome[0]) == "client went away"
+    release.set()
+    leader.join(5)
+
+
+def test_follower_stops_at_its_own_deadline():
+    flight = SingleFlight("test")
+    started, release = threading.Event(), threading.Event()
+    leader = _leader(flight, "key", started, release)
+    leader.start()
+    assert started.wait(5)
+    began = time.monotonic()
+    with use_token(CancellationToken(0.2)):
+        with pytest.raises(OperationCancelled):
+            flight.do("key", lambda: "unused")
+    assert 0.15 <= time.monotonic() - began < 1.0
+    release.set()
+    leader.join(5)
+
+
+def test_live_follower_retries_when_the_leader_was_cancelled():
+    flight = SingleFlight("test")
+    started = threading.Event()
+
+    def cancelled_leader():
+        started.set()
+        time.sleep(0.1)
+        raise OperationCancelled("leader's deadline")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", cancelled_leader)
+        assert started.wait(5)
+        follower = pool.submit(flight.do, "key", lambda: "fresh")
+        with pytest.raises(OperationCancelled):
+            leader.result(5)
+        assert follower.result(5) == ("fresh", False)
@@ -0,0 +1,109 @@
+"""TLE catalog: parsing, incremental updates, persistence, lookups and staleness."""
+
+import math
+
+import numpy as np
+import pytest
+
+from agents.orbit_propagator import UNIX_EPOCH_JD
+from agents.tle_catalog import TLECatalog, parse_tle_text
+from benchmarks.sgp4_propagation import REFERENCE_VECTORS
+
+VANGUARD = REFERENCE_VECTORS[0][:2]
+SES_1 = REFERENCE_VECTORS[4][:2]
+NOW = 1_750_000_000.0
+NOW_JD = NOW / 86400.0 + UNIX_EPOCH_JD
+
+
+def _elements(norad_id, name=None, age_days=1.0, **overrides):
+    element = {
+        "name": name or f"OBJECT {norad_id}", "norad_id": norad_id, "epoch_jd": NOW_JD - age_days,
+        "ndot": 0.0, "nddot": 0.0, "bstar": 1e-4, "inclination": math.radians(53.0), "raan": 0.5,
+        "eccentricity": 1e-4, "arg_perigee": 0.0, "mean_anomaly": 0.1 * norad_id,
+        "mean_motion": 15.06 * 2 * math.pi / 1440.0,
+    }
+    element.update(overrides)
+    return element
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return TLECatalog(str(tmp_path / "catalog.npy"))
+
+
+def test_parse_tle_text_names_and_malformed_sets():
+    text = "\n".join([
+        "VANGUARD 1", *VANGUARD,
+        "0 SES-1", *SES_1,
+        *VANGUARD,
+        "BROKEN", "1 99999U", "2 99999",
+        "",
+    ])
+    elements = parse_tle_text(text)
+    assert [e["norad_id"] for e in elements] == [5, 28626, 5]
+    assert [e["name"] for e in elements] == ["VANGUARD 1", "SES-1", None]
+
+
+def test_update_keeps_the_newest_epoch(catalog):
+    counts = catalog.update([_elements(1, age_days=3), _elements(1, age_days=1), _elements(2)], fetched_at=NOW)
+    assert counts == {"added": 2, "updated": 0, "unchanged": 0}
+    assert len(catalog) == 2
+    assert catalog.get(1)["epoch_jd"] == pytest.approx(NOW_JD - 1)
+
+    counts = catalog.update([_elements(1, age_days=0.5), _elements(2, age_days=5)], fetched_at=NOW + 60)
+    assert counts == {"added": 0, "updated": 1, "unchanged": 1}
+    assert catalog.get(1)["epoch_jd"] == pytest.approx(NOW_JD - 0.5)
+    assert catalog.get(2)["epoch_jd"] == pytest.approx(NOW_JD - 1)
+    assert catalog.get(2)["fetched_at"] == NOW + 60
+
+
+def test_catalog_persists_memory_mapped(catalog):
+    catalog.update([_elements(25544, "ISS (ZARYA)"), _elements(5)], fetched_at=NOW)
+    catalog.update([_elements(5, age_days=0.25)], fetched_at=NOW)  # written in place through the map
+
+    reopened = TLECatalog(catalog.path)
+    assert reopened.stats(NOW)["memory_mapped"]
+    assert len(reopened) == 2
+    assert reopened.get(25544)["name"] == "ISS (ZARYA)"
+    assert reopened.get(5)["epoch_jd"] == pytest.approx(NOW_JD - 0.25)
+
+
+def test_lookups_by_id(catalog):
+    catalog.update([_elements(norad_id) for norad_id in (7, 3, 11)], fetched_at=NOW)
+    assert 3 in catalog and 4 not in catalog and -1 not in catalog and 10**6 not in catalog
+    assert catalog.get(4) is None
+    rows = catalog.rows([11, 4, 7, -5, 10**6])
+    assert rows[[1, 3, 4]].tolist() == [-1, -1, -1]
+    assert catalog.records()[rows[[0, 2]]]["norad_id"].tolist() == [11, 7]
+    assert catalog.records([11, 4, 7])["norad_id"].tolist() == [11, 7]
+
+
+def test_propagator_follows_the_requested_ids(catalog):
+    catalog.update([_elements(norad_id) for norad_id in (7, 3, 11)], fetched_at=NOW)
+    propagator = catalog.propagator([11, 3])
+    assert propagator.norad_ids.tolist() == [11, 3]
+    r, _, error = propagator.propagate(np.array([NOW]))
+    assert (error == 0).all()
+    assert np.isfinite(r).all()
+
+
+def test_search_and_find(catalog):
+    catalog.update([
+        _elements(1, "STARLINK-1007", age_days=2), _elements(2, "STARLINK", age_days=5),
+        _elements(3, "STARLINK-1008", age_days=1), _elements(4, "ISS (ZARYA)"),
+    ], fetched_at=NOW)
+    assert [match["norad_id"] for match in catalog.search("starlink")] == [2, 3, 1]
+    assert catalog.search("starlink", limit=1) == [{"norad_id": 2, "name": "STARLINK"}]
+    assert catalog.search("  ") == []
+    assert catalog.find("zarya").tolist() == [4]
+    assert catalog.find("STARLINK").tolist() == [1, 2, 3]
+    assert catalog.find("hubble").tolist() == []
+
+
+def test_staleness_and_refresh(catalog):
+    catalog.update([_elements(1, age_days=10), _elements(2, age_days=1)], fetched_at=NOW - 86400)
+    catalog.update([_elements(3, age_days=10)], fetched_at=NOW - 60)
+    assert catalog.stale(max_age_days=7, now=NOW).tolist() == [1, 3]
+    # Object 3 was just fetched; its element set is old but refetching would not help yet
+    assert catalog.due_for_refresh(max_age_days=7, min_refetch_seconds=3600, now=NOW).tolist() == [1]
+    assert catalog.stats(NOW)["stale"] == 2
@@ -1,50 +1,71 @@
 # web_interface.py
 # Interactive Web UI for Multi-Agent AI System
 
-from flask import Flask, render_template, request, jsonify, stream_template, send_file
+from flask import Flask, Response, render_template, request, jsonify, stream_template, send_file
 import json
+import queue
+import threading
 import time
-from main import run_goal, run_goal_realtime, REALTIME_AVAILABLE
+from main import run_goal, run_goal_realtime, extract_agent_output, goal_flights, normalize_sections, REALTIME_AVAILABLE, planner_cache, realtime_plan_cache
 import sys
 import os
 from automated_evaluation import AgentSystemEvaluator
 import io
-from contextlib import redirect_stdout, redirect_stderr
 from scheduler import start_scheduler_from_config
 from notifications import notification_center
+from agents import http_client, get_satellite_data_agent
+from agents.lazy_payload import snapshot
+from speculation import speculation_stats
+from jobs import JobManager, JobQueueFull
+from request_logs import RequestLog, capture, install as install_request_logs, AGENT_FINISHED
 
 app = Flask(__name__)
 
-# Global variable to store terminal logs
-terminal_logs = []
+# Route printed output to the log of the request that produced it
+install_request_logs()
 
-class TerminalCapture:
-    """Capture terminal output for web display"""
-    def __init__(self):
-        self.logs = []
-    
-    def write(self, text):
-        if text.strip():
-            timestamp = time.strftime('%H:%M:%S')
-            self.logs.append({
-                'timestamp': timestamp,
-                'message': text.strip(),
-                'type': 'output'
-            })
-            # Keep only last 100 log entries
-            if len(self.logs) > 100:
-                self.logs = self.logs[-100:]
-        return len(text)
-    
-    def flush(self):
-        pass
-
-# Global terminal capture instance
-terminal_capture = TerminalCapture()
+# Logs of the most recently started request, served by /api/logs
+latest_log = RequestLog()
 latest_result = None
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_HEARTBEAT_SECONDS = 15
 scheduler_instance = start_scheduler_from_config()
 
 
+def run_job_goal(goal, use_realtime, spacex_sections=None):
+    """
+    Run a queued goal; its output goes to the job's own log.
+    Results are stored as plain snapshots (see `snapshot`): SpaceX sections the
+    agents deferred stay as `{"deferred": true}` rather than being fetched for
+    the response. Callers who want them name them in `spacex_sections`.
+    """
+    global latest_result
+    print(f"🚀 Starting execution for goal: {goal}")
+    print("=" * 60)
+    if use_realtime and REALTIME_AVAILABLE:
+        print("🚀 Real-time mode enabled - breaking problem into sub-tasks...")
+        result = run_goal_realtime(goal, spacex_sections)
+    else:
+        result = run_goal(goal, spacex_sections)
+    result = snapshot(result)
+    latest_result = result
+    print("=" * 60)
+    print("✅ Goal execution completed successfully!")
+    return result
+
+
+# Bounded worker pool for goals submitted through /api/jobs
+job_manager = JobManager(run_job_goal)
+
+
+def start_request_log():
+    """Create the log for a new request and make it the one /api/logs shows"""
+    global latest_log
+    latest_log = RequestLog()
+    return latest_log
+
+
 def build_workflow_logs(log_entries):
     workflow_logs = []
     for log in log_entries:
@@ -80,6 +101,7 @@ def chat():
 @app.route('/api/chat', methods=['POST'])
 def api_chat():
     """API endpoint for chat interface"""
+    log = RequestLog()
     try:
         global latest_result
         data = request.json
@@ -89,45 +111,33 @@ def api_chat():
         if not message:
             return jsonify({'error': 'Message is required'}), 400
         
-        # Clear previous logs and add start message
-        terminal_capture.logs.clear()
-        terminal_capture.write(f"💬 Chat: {message}")
+        # Start this request's log with a start message
+        log = start_request_log()
+        log.write(f"💬 Chat: {message}")
         
         if agent:
-            terminal_capture.write(f"🎯 Focusing on agent: {agent}")
+            log.write(f"🎯 Focusing on agent: {agent}")
         
-        terminal_capture.write("=" * 60)
+        log.write("=" * 60)
         
-        global latest_result
-
-        # Capture stdout/stderr while running the goal
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        
-        try:
-            # Redirect output to our capture
-            sys.stdout = terminal_capture
-            sys.stderr = terminal_capture
-            
+        # Capture everything printed while running the goal into this request's log
+        with capture(log):
             # Check if real-time mode is requested
             use_realtime = data.get('realtime', False) and REALTIME_AVAILABLE
+            spacex_sections = normalize_sections(data.get('spacex_sections'))
             if use_realtime:
-                terminal_capture.write("🚀 Real-time mode enabled - breaking problem into sub-tasks...")
-                result = run_goal_realtime(message)
+                log.write("🚀 Real-time mode enabled - breaking problem into sub-tasks...")
+                result = run_goal_realtime(message, spacex_sections)
             else:
-                result = run_goal(message)
+                result = run_goal(message, spacex_sections)
+            result = snapshot(result)
             latest_result = result
             
-            terminal_capture.write("=" * 60)
-            terminal_capture.write("✅ Task completed successfully!")
-            
-        finally:
-            # Restore original stdout/stderr
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+            log.write("=" * 60)
+            log.write("✅ Task completed successfully!")
         
         # Process logs to extract agent-specific information
-        workflow_logs = build_workflow_logs(terminal_capture.logs)
+        workflow_logs = build_workflow_logs(log.logs)
         
         return jsonify({
             'success': True,
@@ -140,7 +150,7 @@ def api_chat():
         })
         
     except Exception as e:
-        terminal_capture.write(f"❌ Error: {str(e)}")
+        log.write(f"❌ Error: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e),
@@ -150,6 +160,7 @@ def api_chat():
 @app.route('/api/run_goal', methods=['POST'])
 def api_run_goal():
     """API endpoint to run a goal"""
+    log = RequestLog()
     try:
         data = request.json
         goal = data.get('goal', '')
@@ -157,109 +168,212 @@ def api_run_goal():
         if not goal:
             return jsonify({'error': 'Goal is required'}), 400
         
-        # Clear previous logs and add start message
-        terminal_capture.logs.clear()
-        terminal_capture.write(f"🚀 Starting execution for goal: {goal}")
-        terminal_capture.write("=" * 60)
+        # Start this request's log with a start message
+        log = start_request_log()
+        log.write(f"🚀 Starting execution for goal: {goal}")
+        log.write("=" * 60)
         
-        # Capture stdout/stderr while running the goal
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        
-        try:
-            # Redirect output to our capture
-            sys.stdout = terminal_capture
-            sys.stderr = terminal_capture
-            
+        # Capture everything printed while running the goal into this request's log
+        with capture(log):
             # Check if real-time mode is requested
             use_realtime = data.get('realtime', False) and REALTIME_AVAILABLE
+            spacex_sections = normalize_sections(data.get('spacex_sections'))
             if use_realtime:
-                terminal_capture.write("🚀 Real-time mode enabled - breaking problem into sub-tasks...")
-                result = run_goal_realtime(goal)
+                log.write("🚀 Real-time mode enabled - breaking problem into sub-tasks...")
+                result = run_goal_realtime(goal, spacex_sections)
             else:
-                result = run_goal(goal)
+                result = run_goal(goal, spacex_sections)
+            result = snapshot(result)
             latest_result = result
             
-            terminal_capture.write("=" * 60)
-            terminal_capture.write("✅ Goal execution completed successfully!")
-            
-        finally:
-            # Restore original stdout/stderr
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+            log.write("=" * 60)
+            log.write("✅ Goal execution completed successfully!")
         
-        workflow_logs = build_workflow_logs(terminal_capture.logs)
+        workflow_logs = build_workflow_logs(log.logs)
         
         return jsonify({
             'success': True,
             'result': result,
-            'logs': terminal_capture.logs,
+            'logs': log.logs,
             'workflow_logs': workflow_logs,
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
         })
         
     except Exception as e:
-        terminal_capture.write(f"❌ Error: {str(e)}")
+        log.write(f"❌ Error: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e),
-            'logs': terminal_capture.logs
+            'logs': log.logs
         }), 500
 
+def sse_event(event, data):
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.route('/api/run_goal/stream')
+def api_run_goal_stream():
+    """
+    Stream a goal's progress as Server-Sent Events while it runs:
+    `log` for each printed line, `agent_started` / `agent_finished` (with the
+    agent's output text) / `agent_failed` per agent, `summary`, and finally
+    `done` with the same payload /api/run_goal returns (or `error`).
+    Query parameters: goal, realtime=true, spacex_sections=capsules,cores.
+    """
+    goal = request.args.get('goal', '')
+    if not goal:
+        return jsonify({'error': 'Goal is required'}), 400
+    use_realtime = request.args.get('realtime', '').lower() in ('1', 'true', 'yes') and REALTIME_AVAILABLE
+    spacex_sections = normalize_sections(request.args.get('spacex_sections'))
+    
+    log = start_request_log()
+    events = queue.Queue()
+    log.subscribe(events.put)
+    
+    def run():
+        global latest_result
+        with capture(log):
+            try:
+                log.write(f"🚀 Starting execution for goal: {goal}")
+                log.write("=" * 60)
+                if use_realtime:
+                    log.write("🚀 Real-time mode enabled - breaking problem into sub-tasks...")
+                    result = run_goal_realtime(goal, spacex_sections)
+                else:
+                    result = run_goal(goal, spacex_sections)
+                result = snapshot(result)
+                latest_result = result
+                log.write("=" * 60)
+                log.write("✅ Goal execution completed successfully!")
+                events.put({'type': 'done', 'result': result})
+            except Exception as e:
+                log.write(f"❌ Error: {str(e)}")
+                events.put({'type': 'error', 'error': str(e)})
+    
+    def stream():
+        yield sse_event('started', {'goal': goal, 'realtime': use_realtime, 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')})
+        while True:
+            try:
+                event = events.get(timeout=STREAM_HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ": keep-alive\n\n"
+                continue
+            event = dict(event)  # log lines are shared with the request's log
+            event_type = event.pop('type')
+            if event_type == 'output':
+                yield sse_event('log', event)
+            elif event_type == 'done':
+                result = event['result']
+                yield sse_event('summary', {'summary': result.get('summary', '')})
+                yield sse_event('done', {
+                    'success': True,
+                    'result': result,
+                    'logs': log.logs,
+                    'workflow_logs': build_workflow_logs(log.logs),
+                    'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
+                })
+                return
+            elif event_type == 'error':
+                yield sse_event('error', {'success': False, 'error': event['error'], 'logs': log.logs})
+                return
+            else:
+                if event_type == AGENT_FINISHED and 'output' not in event:
+                    # Real-time agents report the keys they wrote
+                    event['output'] = extract_agent_output(event['agent'], event.pop('writes', {}), {})
+                event.pop('writes', None)
+                yield sse_event(event_type, event)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/api/jobs', methods=['POST'])
+def api_submit_job():
+    """Queue a goal and return its job id without waiting for it to run"""
+    data = request.json or {}
+    goal = data.get('goal', '')
+    if not goal:
+        return jsonify({'error': 'Goal is required'}), 400
+    
+    try:
+        job = job_manager.submit(goal, realtime=bool(data.get('realtime', False)),
+                                 spacex_sections=normalize_sections(data.get('spacex_sections')))
+    except JobQueueFull as e:
+        response = jsonify({'success': False, 'error': str(e), 'jobs': job_manager.metrics()})
+        response.headers['Retry-After'] = '10'
+        return response, 503
+    
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'queue_position': job_manager.queue_position(job),
+        'status_url': f"/api/jobs/{job.id}"
+    }), 202
+
+@app.route('/api/jobs/<job_id>')
+def api_get_job(job_id):
+    """Poll a job's status; includes logs, and the result once completed"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    payload = job.to_dict()
+    payload['queue_position'] = job_manager.queue_position(job)
+    return jsonify(payload)
+
+@app.route('/api/jobs')
+def api_job_metrics():
+    """Queue depth, wait times and outcomes for the job pool"""
+    return jsonify(job_manager.metrics())
+
 @app.route('/api/evaluate', methods=['POST'])
 def api_evaluate():
     """API endpoint to run full evaluation"""
+    # Start this request's log
+    log = start_request_log()
     try:
-        # Clear logs and start evaluation
-        terminal_capture.logs.clear()
-        terminal_capture.write("🧪 Starting comprehensive system evaluation...")
-        terminal_capture.write("=" * 60)
+        log.write("🧪 Starting comprehensive system evaluation...")
+        log.write("=" * 60)
         
         # Capture output during evaluation
-        old_stdout = sys.stdout
-        old_stderr = sys.stderr
-        
-        try:
-            sys.stdout = terminal_capture
-            sys.stderr = terminal_capture
-            
+        with capture(log):
             evaluator = AgentSystemEvaluator()
             results = evaluator.run_full_evaluation()
             
-            terminal_capture.write("=" * 60)
-            terminal_capture.write("✅ Evaluation completed successfully!")
-            
-        finally:
-            sys.stdout = old_stdout
-            sys.stderr = old_stderr
+            log.write("=" * 60)
+            log.write("✅ Evaluation completed successfully!")
         
         return jsonify({
             'success': True,
             'evaluation': results,
-            'logs': terminal_capture.logs
+            'logs': log.logs
         })
         
     except Exception as e:
-        terminal_capture.write(f"❌ Evaluation error: {str(e)}")
+        log.write(f"❌ Evaluation error: {str(e)}")
         return jsonify({
             'success': False,
             'error': str(e),
-            'logs': terminal_capture.logs
+            'logs': log.logs
         }), 500
 
 @app.route('/api/logs')
 def api_logs():
-    """Get current terminal logs"""
+    """Get the logs of the most recently started request"""
+    logs = latest_log.logs
     return jsonify({
-        'logs': terminal_capture.logs,
-        'count': len(terminal_capture.logs)
+        'logs': logs,
+        'count': len(logs)
     })
 
 @app.route('/api/clear_logs', methods=['POST'])
 def api_clear_logs():
     """Clear terminal logs"""
-    terminal_capture.logs.clear()
-    terminal_capture.write("🔄 Logs cleared")
+    latest_log.clear()
+    latest_log.write("🔄 Logs cleared")
     return jsonify({'success': True})
 
 @app.route('/api/agent_status')
@@ -291,7 +405,17 @@ def agent_status():
                 'google_adk_agent'
             ],
             'scheduler_enabled': scheduler_instance is not None,
-            'realtime_available': REALTIME_AVAILABLE
+            'realtime_available': REALTIME_AVAILABLE,
+            'http_pool': http_client.stats(),
+            'coalescing': {
+                'goals': goal_flights.stats(),
+                'http_get': http_client.coalescing_stats()
+            },
+            'planner_cache': planner_cache.stats(),
+            'realtime_plan_cache': realtime_plan_cache.stats() if realtime_plan_cache else None,
+            'speculation': speculation_stats.snapshot(),
+            'jobs': job_manager.metrics(),
+            'tle_catalog': get_satellite_data_agent().get_catalog_stats()
         })
         
     except Exception as e:
@@ -336,4 +460,5 @@ def serve_system_diagram():
     return jsonify({'error': 'Diagram not found'}), 404
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # Each request captures its own logs, so goals can run in parallel threads
+    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)